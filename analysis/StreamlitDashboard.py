@@ -147,12 +147,20 @@ def get_available_months():
     finally:
         conn.close()
 
-def get_monthly_analysis(selected_month):
+# Yeniden yayın olarak işaretlenen ilanları (job_listings.duplicate_of) sayımlardan çıkarır
+DUPLICATE_FILTER = """
+    AND NOT EXISTS (
+        SELECT 1 FROM job_listings l
+        WHERE l.id = job_analysis.job_id AND l.duplicate_of IS NOT NULL
+    )
+"""
+
+def get_monthly_analysis(selected_month, collapse_duplicates=True):
     conn = get_db_connection()
     if not conn: return []
     try:
         with conn.cursor() as cur:
-            cur.execute("""
+            cur.execute(f"""
                 SELECT 
                     sector, 
                     work_type, 
@@ -163,6 +171,7 @@ def get_monthly_analysis(selected_month):
                     analyzed_at 
                 FROM job_analysis 
                 WHERE DATE_TRUNC('month', analyzed_at) = %s
+                {DUPLICATE_FILTER if collapse_duplicates else ""}
             """, (selected_month,))
             return cur.fetchall()
     except Exception as e:
@@ -171,28 +180,54 @@ def get_monthly_analysis(selected_month):
     finally:
         conn.close()
 
-def get_skill_distribution(month, skill_type):
+# Beceri sütunu -> kanonik beceri id dizisi ve skills tablosundaki türü
+SKILL_ID_COLUMNS = {
+    "hard_skills": ("hard_skill_ids", "hard"),
+    "soft_skills": ("soft_skill_ids", "soft")
+}
+
+def get_skill_distribution(month, skill_type, collapse_duplicates=True):
     conn = get_db_connection()
     if not conn: return []
     try:
         with conn.cursor() as cur:
-            cur.execute(f"""
-                SELECT skill, COUNT(*) as count
-                FROM (
-                    SELECT jsonb_array_elements_text(
-                        CASE 
-                            WHEN jsonb_typeof({skill_type}) = 'array' THEN {skill_type}
-                            ELSE jsonb_build_array({skill_type})
-                        END
-                    ) as skill
-                    FROM job_analysis
-                    WHERE DATE_TRUNC('month', analyzed_at) = %s
-                    AND {skill_type} IS NOT NULL
-                ) subq
-                GROUP BY skill
-                ORDER BY count DESC
-                LIMIT 15
-            """, (month,))
+            if skill_type in SKILL_ID_COLUMNS:
+                id_column, kind = SKILL_ID_COLUMNS[skill_type]
+                # Önce tamsayı id'ler üzerinde gruplanır, yalnızca ilk 15 beceri için ad eşlenir
+                cur.execute(f"""
+                    SELECT s.name as skill, top.count
+                    FROM (
+                        SELECT skill_id, COUNT(*) as count
+                        FROM job_analysis, unnest({id_column}) as skill_id
+                        WHERE DATE_TRUNC('month', analyzed_at) = %s
+                        {DUPLICATE_FILTER if collapse_duplicates else ""}
+                        GROUP BY skill_id
+                        ORDER BY count DESC
+                        LIMIT 15
+                    ) top
+                    JOIN skills s ON s.id = top.skill_id AND s.kind = %s
+                    ORDER BY top.count DESC
+                """, (month, kind))
+            else:
+                # Kataloğu olmayan listeler (sorumluluklar) JSON üzerinden sayılır
+                cur.execute(f"""
+                    SELECT skill, COUNT(*) as count
+                    FROM (
+                        SELECT jsonb_array_elements_text(
+                            CASE 
+                                WHEN jsonb_typeof({skill_type}) = 'array' THEN {skill_type}
+                                ELSE jsonb_build_array({skill_type})
+                            END
+                        ) as skill
+                        FROM job_analysis
+                        WHERE DATE_TRUNC('month', analyzed_at) = %s
+                        AND {skill_type} IS NOT NULL
+                        {DUPLICATE_FILTER if collapse_duplicates else ""}
+                    ) subq
+                    GROUP BY skill
+                    ORDER BY count DESC
+                    LIMIT 15
+                """, (month,))
             return cur.fetchall()
     except Exception as e:
         st.error(f"🔴 {skill_type} becerileri alınırken hata: {str(e)}")
@@ -200,16 +235,17 @@ def get_skill_distribution(month, skill_type):
     finally:
         conn.close()
 
-def get_top_sectors(month):
+def get_top_sectors(month, collapse_duplicates=True):
     conn = get_db_connection()
     if not conn:
         return []
     try:
         with conn.cursor() as cur:
-            cur.execute("""
+            cur.execute(f"""
                 SELECT sector, COUNT(*) as job_count
                 FROM job_analysis
                 WHERE DATE_TRUNC('month', analyzed_at) = %s
+                {DUPLICATE_FILTER if collapse_duplicates else ""}
                 GROUP BY sector
                 ORDER BY job_count DESC
                 LIMIT 5
@@ -380,8 +416,13 @@ if page == "Analiz Paneli":
             options=available_months,
             format_func=lambda x: x.strftime("%B %Y")
         )
+        collapse_duplicates = st.checkbox(
+            "🔁 Yeniden yayınları tek ilan say",
+            value=True,
+            help="Küçük değişikliklerle tekrar yayınlanan ilanlar sayımlara yalnızca bir kez girer"
+        )
 
-    analysis_data = get_monthly_analysis(selected_month)
+    analysis_data = get_monthly_analysis(selected_month, collapse_duplicates)
     if not analysis_data:
         st.warning("Seçilen ay için veri bulunamadı.")
         st.stop()
@@ -424,7 +465,7 @@ if page == "Analiz Paneli":
     if work_type_filter: df = df[df['work_type'].isin(work_type_filter)]
     if location_filter: df = df[df['location'].isin(location_filter)]
 
-    top_sectors = get_top_sectors(selected_month)
+    top_sectors = get_top_sectors(selected_month, collapse_duplicates)
 
     st.header(f"📈 {selected_month.strftime('%B %Y')} Ayı Analiz Sonuçları")
 
@@ -470,7 +511,7 @@ if page == "Analiz Paneli":
             st.warning("Şehir verisi bulunamadı.")
 
         st.markdown("### 💻 Teknik Beceriler")
-        hard_skills = get_skill_distribution(selected_month, 'hard_skills')
+        hard_skills = get_skill_distribution(selected_month, 'hard_skills', collapse_duplicates)
         if hard_skills:
             hard_skills_df = pd.DataFrame(hard_skills).sort_values(by='count', ascending=False)
             st.plotly_chart(create_bar_chart(hard_skills_df, 'count', 'skill', "En Çok Geçen Teknik Beceriler", px.colors.sequential.Blues), use_container_width=True)
@@ -478,7 +519,7 @@ if page == "Analiz Paneli":
             st.warning("Teknik beceri verisi bulunamadı.")
 
         st.markdown("### 🧠 Kişisel Beceriler")
-        soft_skills = get_skill_distribution(selected_month, 'soft_skills')
+        soft_skills = get_skill_distribution(selected_month, 'soft_skills', collapse_duplicates)
         if soft_skills:
             soft_skills_df = pd.DataFrame(soft_skills).sort_values(by='count', ascending=False)
             st.plotly_chart(create_bar_chart(soft_skills_df, 'count', 'skill', "En Çok Geçen Kişisel Beceriler", px.colors.sequential.Greens), use_container_width=True)
@@ -486,7 +527,7 @@ if page == "Analiz Paneli":
             st.warning("Kişisel beceri verisi bulunamadı.")
 
         st.markdown("### 📋 Sorumluluklar")
-        responsibilities = get_skill_distribution(selected_month, 'responsibilities')
+        responsibilities = get_skill_distribution(selected_month, 'responsibilities', collapse_duplicates)
         if responsibilities:
             responsibilities_df = pd.DataFrame(responsibilities).sort_values(by='count', ascending=False)
             st.plotly_chart(create_bar_chart(responsibilities_df, 'count', 'skill', "En Çok Geçen Sorumluluklar", px.colors.sequential.Oranges), use_container_width=True)
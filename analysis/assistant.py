@@ -1,10 +1,28 @@
 import requests
 import json
-from typing import List, Dict, Optional
+import asyncio
+import argparse
+import signal
+import socket
+import time
+import threading
+import aiohttp
+from typing import List, Dict, Iterator, Optional
+from itertools import islice
 import psycopg2
 from psycopg2.extras import RealDictCursor
 import os
 from dotenv import load_dotenv
+from description_archive import attach_full_descriptions
+from db_pool import ConnectionPool
+from result_sink import AnalysisSink, ensure_sink_schema
+from skill_catalog import ensure_skill_schema, backfill_skill_ids
+from near_duplicates import ensure_near_duplicate_schema
+from llm_cache import LLMCache
+from rate_governor import RateGovernor, ConcurrencyGate
+from job_notifications import JobNotificationListener, ensure_notify_trigger
+from text_compaction import STATS as COMPACTION_STATS, compact_description, count_tokens
+from skill_extractor import refine_analysis, local_analysis, listing_work_type, skill_names
 
 # 🔧 Ortam değişkenlerini yükle
 load_dotenv()
@@ -23,6 +41,49 @@ print("📦 Veritabanı yapılandırması yüklendi")
 # 🔐 OpenRouter API Ayarları
 API_KEY = os.getenv("API_KEY")
 MODEL = "mistralai/mistral-small-3.1-24b-instruct:free"
+API_URL = "https://openrouter.ai/api/v1/chat/completions"
+
+# ⚡ Eşzamanlı analiz ayarları (aynı anda uçuşta olabilecek istek sayısı ve istek başına zaman aşımı)
+CONCURRENCY = int(os.getenv("ANALYZER_CONCURRENCY", "8"))
+# Tek istekte gönderilecek en fazla ilan (1 = toplu istem kapalı) ve toplu istemin token bütçesi
+PROMPT_BATCH = int(os.getenv("ANALYZER_PROMPT_BATCH", "1"))
+PROMPT_TOKEN_BUDGET = int(os.getenv("ANALYZER_PROMPT_TOKEN_BUDGET", "6000"))
+# İstemde açıklamaya ayrılan token bütçesi (kalıp metin ayıklandıktan sonra)
+DESCRIPTION_TOKEN_BUDGET = int(os.getenv("ANALYZER_DESCRIPTION_TOKENS", "750"))
+SINK_BATCH_SIZE = int(os.getenv("ANALYZER_BATCH_SIZE", "50"))
+SINK_FLUSH_INTERVAL = float(os.getenv("ANALYZER_FLUSH_INTERVAL", "5"))
+
+# 🗃️ AI yanıt önbelleği (aynı açıklama farklı ilan id'siyle tekrar yayınlandığında istek atılmaz)
+CACHE_ENABLED = os.getenv("ANALYZER_CACHE", "1") == "1"
+CACHE_PATH = os.getenv("ANALYZER_CACHE_PATH", "llm_cache.sqlite")
+CACHE_TTL_DAYS = float(os.getenv("ANALYZER_CACHE_TTL_DAYS", "30"))
+CACHE_MAX_ENTRIES = int(os.getenv("ANALYZER_CACHE_MAX_ENTRIES", "50000"))
+REQUEST_TIMEOUT = float(os.getenv("ANALYZER_REQUEST_TIMEOUT", "60"))
+
+# 🚦 Sağlayıcı kotası: aynı makinedeki tüm analiz süreçleri bu bütçeyi paylaşır
+RATE_STATE_PATH = os.getenv("ANALYZER_RATE_STATE", "rate_governor.sqlite")
+REQUESTS_PER_MINUTE = float(os.getenv("ANALYZER_RPM", "20"))
+TOKENS_PER_MINUTE = float(os.getenv("ANALYZER_TPM", "200000"))
+MAX_RETRIES = int(os.getenv("ANALYZER_MAX_RETRIES", "4"))
+LATENCY_TARGET = float(os.getenv("ANALYZER_LATENCY_TARGET", "30"))
+# Yanıt için ayrılan tahmini token (gerçek kullanım yanıt gelince düzeltilir)
+RESPONSE_TOKEN_ESTIMATE = 400
+RETRY_STATUSES = {500, 502, 503, 504}
+
+# 🔒 Birden fazla analiz sürecinin aynı ilanı almaması için kiralama ayarları
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+LEASE_SECONDS = int(os.getenv("ANALYZER_LEASE_SECONDS", "900"))
+# Servis kipinde birikimin yeniden tarama aralığı: başarısız analizler, çöken süreçlerin
+# kiraladığı ve bildirimi kaçan ilanlar bu aralıkla tekrar alınır
+SWEEP_INTERVAL = float(os.getenv("ANALYZER_SWEEP_INTERVAL", str(LEASE_SECONDS / 3)))
+
+# 🧩 Yerel beceri sözlüğünün kullanımı:
+#   llm      -> yalnızca AI analizi
+#   prepass  -> AI becerileri sözlükle kanonikleştirilir, belirsiz olmayan eşleşmelerle tamamlanır
+#   fallback -> prepass + AI yanıt vermezse sözlük analizi kaydedilir
+#   local    -> API'ye hiç gidilmez, analiz tamamen sözlükle üretilir
+SKILL_MODES = ("llm", "prepass", "fallback", "local")
+SKILL_MODE = os.getenv("ANALYZER_SKILL_MODE", "prepass")
 
 def get_db_connection():
     """PostgreSQL veritabanı bağlantısı kurar"""
@@ -35,117 +96,329 @@ def get_db_connection():
         print(f"🔴 Veritabanı bağlantı hatası: {str(e)}")
         return None
 
-def fetch_unanalyzed_jobs(limit: int = 100) -> List[Dict]:
-    """Analiz edilmemiş iş ilanlarını çeker"""
-    print("📥 Analiz edilmemiş iş ilanları çekiliyor...")
-    conn = get_db_connection()
-    if not conn:
-        return []
-    
+_pool: Optional[ConnectionPool] = None
+
+def get_pool(size: Optional[int] = None) -> ConnectionPool:
+    """Süreç genelindeki bağlantı havuzunu döndürür; ilk çağrıda eşzamanlılığa göre boyutlanır"""
+    global _pool
+    if _pool is None:
+        # Analiz istekleri kadar kayıt + ilan çekimi için bir bağlantı
+        _pool = ConnectionPool(DB_CONFIG, maxconn=(size or CONCURRENCY) + 1, cursor_factory=RealDictCursor)
+        print(f"🏊 Bağlantı havuzu oluşturuldu ({_pool.maxconn} bağlantı)")
+    return _pool
+
+def close_pool():
+    global _pool
+    if _pool is not None:
+        print(f"📈 Havuz istatistikleri: {_pool.stats()}")
+        _pool.close()
+        _pool = None
+
+JOB_COLUMNS = "id, title, company_name, location, description, sector, remote_type, scraped_at, duplicate_of"
+
+def ensure_analysis_schema(conn):
+    """Analiz kuyruğu için durum ve kiralama sütunlarını, indeksleri oluşturur
+
+    job_listings.analyzed, job_analysis'e yazılan her satırda tetikleyiciyle işaretlenir;
+    kısmi indeks yalnızca analiz bekleyen satırları tuttuğundan tablo büyüdükçe yavaşlamaz.
+    job_analysis.job_id tekildir; aynı ilan iki kez kaydedilemez. Beceriler ayrıca
+    kanonik beceri id dizileri olarak tutulur (bkz. skill_catalog).
+    """
+    with conn.cursor() as cur:
+        cur.execute("""
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'job_listings' AND column_name = 'analyzed'
+        """)
+        backfill = cur.fetchone() is None
+        cur.execute("""
+            ALTER TABLE job_listings ADD COLUMN IF NOT EXISTS analyzed BOOLEAN NOT NULL DEFAULT FALSE;
+            ALTER TABLE job_listings ADD COLUMN IF NOT EXISTS analysis_claimed_by TEXT;
+            ALTER TABLE job_listings ADD COLUMN IF NOT EXISTS analysis_lease_until TIMESTAMP;
+
+            CREATE OR REPLACE FUNCTION mark_job_listing_analyzed() RETURNS trigger AS $$
+            BEGIN
+                UPDATE job_listings SET analyzed = TRUE WHERE id = NEW.job_id AND NOT analyzed;
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS job_analysis_mark_analyzed ON job_analysis;
+            CREATE TRIGGER job_analysis_mark_analyzed
+                AFTER INSERT ON job_analysis
+                FOR EACH ROW EXECUTE PROCEDURE mark_job_listing_analyzed();
+        """)
+        if backfill:
+            # Sütun yeni eklendiyse mevcut analizler bir kereliğine işlenir
+            print("🧮 Mevcut analizler için 'analyzed' sütunu dolduruluyor...")
+            cur.execute("""
+                UPDATE job_listings SET analyzed = TRUE
+                WHERE EXISTS (SELECT 1 FROM job_analysis WHERE job_id = job_listings.id)
+            """)
+        cur.execute("""
+            SELECT 1 FROM pg_indexes WHERE indexname = 'job_analysis_job_id_key'
+        """)
+        if cur.fetchone() is None:
+            # Tekil indeksten önce eş zamanlı çalışmalardan kalan mükerrer analizler temizlenir
+            # (en son analiz edilen kalır; ctid yalnızca aynı zamanlı kayıtları ayırmak için)
+            cur.execute("""
+                DELETE FROM job_analysis a USING job_analysis b
+                WHERE a.job_id = b.job_id
+                  AND (COALESCE(a.analyzed_at, '-infinity'), a.ctid) < (COALESCE(b.analyzed_at, '-infinity'), b.ctid)
+            """)
+            if cur.rowcount:
+                print(f"🧹 {cur.rowcount} mükerrer analiz silindi")
+        cur.execute("""
+            CREATE UNIQUE INDEX IF NOT EXISTS job_analysis_job_id_key ON job_analysis (job_id);
+            DROP INDEX IF EXISTS job_analysis_job_id_idx;
+            CREATE INDEX IF NOT EXISTS job_listings_unanalyzed_idx
+                ON job_listings (scraped_at DESC, id DESC) WHERE NOT analyzed
+        """)
+    conn.commit()
+    # Kiralama sorgusu dead-letter'a düşmüş ilanları hariç tutar
+    ensure_sink_schema(conn)
+    ensure_skill_schema(conn)
+    # Kiralama sorgusu job_listings.duplicate_of sütununu döndürür
+    ensure_near_duplicate_schema(conn)
+    # Kanonik id'leri olmayan (eski sürümle yazılmış) analizler çevrilir; hepsi çevrildiyse iş yapmaz
+    backfill_skill_ids(conn)
+
+# Kiralaması boşta ya da süresi dolmuş (çöken sürecin bıraktığı) ilanları bu sürece kiralar.
+# SKIP LOCKED sayesinde aynı anda çalışan süreçler birbirini beklemeden farklı satırlar alır.
+# Analizi kaydedilemeyip dead-letter'a düşen ilanlar her kiralama süresinde yeniden denenmez.
+CLAIM_SQL = f"""
+    UPDATE job_listings
+    SET analysis_claimed_by = %(worker)s,
+        analysis_lease_until = NOW() + %(lease)s * INTERVAL '1 second'
+    WHERE id IN (
+        SELECT id FROM job_listings
+        WHERE NOT analyzed
+          AND (analysis_lease_until IS NULL OR analysis_lease_until < NOW())
+          AND NOT EXISTS (SELECT 1 FROM job_analysis_dead_letter d WHERE d.job_id = job_listings.id)
+          AND {{condition}}
+        ORDER BY scraped_at DESC, id DESC
+        LIMIT %(limit)s
+        FOR UPDATE SKIP LOCKED
+    )
+    RETURNING {JOB_COLUMNS}
+"""
+
+def claim_jobs(condition: str, params: Dict, limit: int) -> List[Dict]:
+    """Koşula uyan en fazla limit ilanı kiralar; kiralama hemen commit edilir"""
     try:
-        with conn.cursor() as cur:
-            cur.execute(""" 
-                SELECT id, title, company_name, location, description, 
-                       sector, remote_type, scraped_at
-                FROM job_listings
-                WHERE NOT EXISTS (
-                    SELECT 1 FROM job_analysis WHERE job_id = job_listings.id
-                )
-                ORDER BY scraped_at DESC
-                LIMIT %s
-            """, (limit,))
+        with get_pool().connection() as conn, conn.cursor() as cur:
+            cur.execute(CLAIM_SQL.format(condition=condition),
+                        {**params, "worker": WORKER_ID, "lease": LEASE_SECONDS, "limit": limit})
             jobs = cur.fetchall()
-            print(f"📊 {len(jobs)} analiz edilmemiş ilan bulundu")
-            return jobs
+            conn.commit()
+            # job_listings yalnızca önizleme tutar; tam açıklama arşivden açılır
+            return attach_full_descriptions(conn, sorted(jobs, key=lambda job: (job['scraped_at'], job['id']), reverse=True))
     except psycopg2.Error as e:
-        print(f"🔴 Veritabanı sorgu hatası: {str(e)}")
+        print(f"🔴 İlan kiralama hatası: {str(e)}")
         return []
-    finally:
-        conn.close()
-        print("🔌 Veritabanı bağlantısı kapatıldı")
 
-def chat_with_ai(prompt: str) -> Optional[str]:
-    """OpenRouter API ile sohbet tamamlama"""
-    print("🤖 AI'den analiz isteniyor...")
-    url = "https://openrouter.ai/api/v1/chat/completions"
-    headers = {
+def claim_page(after: Optional[tuple], limit: int) -> List[Dict]:
+    """(scraped_at, id) anahtarı after'dan eski (None ise en yeni) en fazla limit ilanı kiralar"""
+    if after is None:
+        return claim_jobs("TRUE", {}, limit)
+    return claim_jobs("(scraped_at, id) < (%(scraped_at)s, %(id)s)",
+                      {"scraped_at": after[0], "id": after[1]}, limit)
+
+def iter_unanalyzed_jobs(page_size: int = 100) -> Iterator[Dict]:
+    """Analiz edilmemiş ilanları en yeniden eskiye sayfa sayfa kiralayıp tembel olarak üretir
+
+    (scraped_at, id) üzerinde keyset sayfalama yapılır; her sayfa kısmi indeksten okunur ve
+    bağlantı sayfalar arasında havuza geri verilir. Bellek kullanımı birikimden bağımsızdır.
+    Başarısız olan ilanların kiralaması süresi dolunca (ANALYZER_LEASE_SECONDS) başka bir
+    taramada tekrar denenir.
+    """
+    cursor_key = None
+    while True:
+        page = claim_page(cursor_key, page_size)
+        if not page:
+            return
+        cursor_key = (page[-1]['scraped_at'], page[-1]['id'])
+        yield from page
+        if len(page) < page_size:
+            return
+
+def extend_leases(job_ids: List[int]):
+    """Bu sürecin hâlâ işlediği ilanların kiralamasını uzatır"""
+    try:
+        with get_pool().connection() as conn, conn.cursor() as cur:
+            cur.execute("""
+                UPDATE job_listings
+                SET analysis_lease_until = NOW() + %(lease)s * INTERVAL '1 second'
+                WHERE id = ANY(%(ids)s) AND analysis_claimed_by = %(worker)s AND NOT analyzed
+            """, {"ids": list(job_ids), "lease": LEASE_SECONDS, "worker": WORKER_ID})
+            conn.commit()
+    except psycopg2.Error as e:
+        print(f"🔴 Kiralama uzatılamadı: {str(e)}")
+
+async def renew_leases(job_ids: List[int]):
+    """Parti sürdükçe kiralamayı süresinin üçte birinde bir yeniler (iptal edilene kadar)"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(LEASE_SECONDS / 3)
+        await loop.run_in_executor(None, extend_leases, job_ids)
+
+def fetch_jobs_by_ids(job_ids: List[int]) -> List[Dict]:
+    """Bildirimle gelen ilanlardan henüz analiz edilmemiş olanları kiralar
+
+    Bildirim tüm servislere gider; ilanı yalnızca kiralamayı kazanan süreç analiz eder.
+    """
+    return claim_jobs("id = ANY(%(ids)s)", {"ids": list(job_ids)}, len(job_ids))
+
+def api_headers() -> Dict:
+    return {
         "Authorization": f"Bearer {API_KEY}",
         "X-Title": "Job Parser",
         "Content-Type": "application/json"
     }
-    data = {
+
+def chat_payload(prompt: str) -> Dict:
+    return {
         "model": MODEL,
         "messages": [{"role": "user", "content": prompt}],
         "response_format": {"type": "json_object"}
     }
 
-    try:
-        response = requests.post(url, headers=headers, json=data, timeout=60)
-        response.raise_for_status()
-        result = response.json()
+def completion_content(result: Dict) -> Optional[str]:
+    """API yanıtından model çıktısını alır, hata varsa None döner"""
+    if "error" in result:
+        print(f"🔴 API Hatası: {result['error'].get('message', 'Bilinmeyen API hatası')}")
+        return None
 
-        if "error" in result:
-            print(f"🔴 API Hatası: {result['error'].get('message', 'Bilinmeyen API hatası')}")
-            return None
+    if not result.get("choices"):
+        print("🔴 Geçersiz yanıt formatı (choices boş)")
+        return None
+
+    content = result["choices"][0]["message"].get("content")
+    print("✅ AI'den yanıt alındı")
+    return content
+
+_governor: Optional[RateGovernor] = None
+_gate: Optional[ConcurrencyGate] = None
 
-        if not result.get("choices"):
-            print("🔴 Geçersiz yanıt formatı (choices boş)")
+def get_governor() -> RateGovernor:
+    global _governor
+    if _governor is None:
+        _governor = RateGovernor(
+            RATE_STATE_PATH, REQUESTS_PER_MINUTE, TOKENS_PER_MINUTE,
+            max_concurrency=CONCURRENCY, latency_target=LATENCY_TARGET
+        )
+    return _governor
+
+def get_gate() -> ConcurrencyGate:
+    global _gate
+    if _gate is None:
+        _gate = ConcurrencyGate(get_governor())
+    return _gate
+
+def close_governor():
+    global _governor, _gate
+    if _governor is not None:
+        print(f"🚦 Hız yöneticisi istatistikleri: {_governor.stats()}")
+        _governor.db.close()
+        _governor = _gate = None
+
+def request_tokens(prompt: str) -> int:
+    return count_tokens(prompt) + RESPONSE_TOKEN_ESTIMATE
+
+def finish_request(governor: RateGovernor, estimated: int, started: float, result: Dict) -> Optional[str]:
+    governor.on_success(time.monotonic() - started)
+    usage = result.get("usage") if isinstance(result, dict) else None
+    governor.settle(estimated, (usage or {}).get("total_tokens"))
+    return completion_content(result)
+
+def chat_with_ai(prompt: str) -> Optional[str]:
+    """OpenRouter API ile sohbet tamamlama
+
+    İstekler hız yöneticisinden geçer; 429'da Retry-After kadar, 5xx ve ağ hatalarında
+    jitter'lı geri çekilmeyle MAX_RETRIES kez yeniden denenir.
+    """
+    print("🤖 AI'den analiz isteniyor...")
+    governor = get_governor()
+    estimated = request_tokens(prompt)
+    for attempt in range(MAX_RETRIES + 1):
+        governor.acquire(estimated)
+        started = time.monotonic()
+        try:
+            response = requests.post(API_URL, headers=api_headers(), json=chat_payload(prompt), timeout=REQUEST_TIMEOUT)
+            if response.status_code == 429:
+                wait = governor.on_throttled(governor.parse_retry_after(response.headers.get("Retry-After")), attempt)
+                print(f"⏳ Hız sınırına takıldı (429), {wait:.1f} sn sonra tekrar denenecek")
+                time.sleep(wait)
+                continue
+            if response.status_code in RETRY_STATUSES:
+                raise requests.exceptions.ConnectionError(f"HTTP {response.status_code}")
+            response.raise_for_status()
+            return finish_request(governor, estimated, started, response.json())
+
+        except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            wait = governor.backoff(attempt)
+            governor.on_retry()
+            print(f"🔁 Geçici hata ({str(e)}), {wait:.1f} sn sonra tekrar denenecek")
+            time.sleep(wait)
+        except requests.exceptions.RequestException as e:
+            print(f"🔴 İstek hatası: {str(e)}")
+            return None
+        except json.JSONDecodeError:
+            print("🔴 Geçersiz JSON yanıtı")
             return None
 
-        content = result["choices"][0]["message"].get("content")
-        print("✅ AI'den yanıt alındı")
-        return content
+    print("🔴 Deneme hakkı tükendi")
+    return None
 
-    except requests.exceptions.RequestException as e:
-        print(f"🔴 İstek hatası: {str(e)}")
-        return None
-    except json.JSONDecodeError:
-        print("🔴 Geçersiz JSON yanıtı")
-        return None
+async def chat_with_ai_async(session: aiohttp.ClientSession, prompt: str) -> Optional[str]:
+    """chat_with_ai'nin aiohttp ile bloklamayan karşılığı; zaman aşımı oturumdan gelir
 
-def save_analysis_results(job_id: int, ai_results: Dict, scraped_at: str) -> bool:
-    """Analiz sonuçlarını veritabanına kaydeder"""
-    print(f"💾 Analiz sonuçları kaydediliyor... (Job ID: {job_id})")
-    conn = get_db_connection()
-    if not conn:
-        return False
-    
-    try:
-        with conn.cursor() as cur:
-            cur.execute("""
-                INSERT INTO job_analysis (
-                    job_id, hard_skills, soft_skills, location, 
-                    sector, responsibilities, work_type, scraped_at, title_skills
-                )
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                job_id,
-                json.dumps(ai_results.get("hard_skills", [])),
-                json.dumps(ai_results.get("soft_skills", [])),
-                ai_results.get("location", "Belirtilmemiş"),
-                ai_results.get("sector", "Belirtilmemiş"),
-                json.dumps(ai_results.get("responsibilities", [])),
-                ai_results.get("work_type", "Belirtilmemiş"),
-                scraped_at,
-                json.dumps(ai_results.get("title_skills", []))  # 👈 Yeni eklenen alan
-            ))
-            conn.commit()
-            print("✅ Analiz sonuçları başarıyla kaydedildi")
-            return True
-    except psycopg2.Error as e:
-        print(f"🔴 Analiz kayıt hatası: {str(e)}")
-        conn.rollback()
-        return False
-    finally:
-        conn.close()
-        print("🔌 Veritabanı bağlantısı kapatıldı")
+    Uçuştaki istek sayısı ayrıca yöneticinin AIMD sınırıyla kısıtlanır; bekleme kapı dışında yapılır.
+    """
+    print("🤖 AI'den analiz isteniyor...")
+    loop = asyncio.get_running_loop()
+    governor = get_governor()
+    estimated = request_tokens(prompt)
+    for attempt in range(MAX_RETRIES + 1):
+        await governor.acquire_async(estimated)
+        started = time.monotonic()
+        try:
+            async with get_gate():
+                async with session.post(API_URL, json=chat_payload(prompt)) as response:
+                    if response.status == 429:
+                        # Yöneticinin SQLite işlemleri olay döngüsünü bloklamasın
+                        wait = await loop.run_in_executor(
+                            None, governor.on_throttled,
+                            governor.parse_retry_after(response.headers.get("Retry-After")), attempt
+                        )
+                        print(f"⏳ Hız sınırına takıldı (429), {wait:.1f} sn sonra tekrar denenecek")
+                    elif response.status in RETRY_STATUSES:
+                        wait = governor.backoff(attempt)
+                        governor.on_retry()
+                        print(f"🔁 Sunucu hatası (HTTP {response.status}), {wait:.1f} sn sonra tekrar denenecek")
+                    else:
+                        response.raise_for_status()
+                        result = await response.json(content_type=None)
+                        return await loop.run_in_executor(None, finish_request, governor, estimated, started, result)
 
-def analyze_job(job: Dict) -> Optional[Dict]:
-    """Bir iş ilanını analiz eder"""
-    print(f"🧠 İş ilanı analiz ediliyor: {job.get('company_name')} - {job.get('title')}")
-    prompt = f"""
-Aşağıdaki iş ilanını analiz ederek STRICT JSON FORMATINDA cevapla. SADECE JSON formatında cevap ver, başka hiçbir açıklama veya işaret içerme:
-{{
+        except aiohttp.ClientResponseError as e:
+            print(f"🔴 İstek hatası: {str(e)}")
+            return None
+        except (asyncio.TimeoutError, aiohttp.ClientConnectionError) as e:
+            wait = governor.backoff(attempt)
+            governor.on_retry()
+            print(f"🔁 Geçici hata ({type(e).__name__}), {wait:.1f} sn sonra tekrar denenecek")
+        except aiohttp.ClientError as e:
+            print(f"🔴 İstek hatası: {str(e)}")
+            return None
+        except json.JSONDecodeError:
+            print("🔴 Geçersiz JSON yanıtı")
+            return None
+        await asyncio.sleep(wait)
+
+    print("🔴 Deneme hakkı tükendi")
+    return None
+
+ANALYSIS_SCHEMA = """{
     "hard_skills": ["Teknik beceriler listesi"],
     "soft_skills": ["Kişisel beceriler listesi"],
     "location": "Şehir, Ülke",
@@ -153,18 +426,73 @@ Aşağıdaki iş ilanını analiz ederek STRICT JSON FORMATINDA cevapla. SADECE
     "responsibilities": ["Sorumluluklar listesi"],
     "work_type": "remote / hybrid / on-site şeklinde açık şekilde belirt. Açıklama içinde doğrudan geçmiyorsa tahmin et ama kesinlikle 'bilinmiyor', 'belirtilmemiş' gibi ifadeler kullanma.",
     "title_skills": ["Pozisyon başlığına bakarak ilan başlığı yazdır. en uygun pozisyon başlığını yazdır."]
-}}
-
-    İlan Detayları:
-    Şirket: {job.get('company_name', '')}
-    Pozisyon Başlığı: {job.get('title', '')}
-    Konum: {job.get('location', '')}
-    Sektör: {job.get('sector', '')}
-    Çalışma Tipi: {job.get('remote_type', '')}
-    Açıklama: {job.get('description', '')[:3000]}...
-    """
-    
-    response = chat_with_ai(prompt)
+}"""
+ANALYSIS_FIELDS = ("hard_skills", "soft_skills", "location", "sector", "responsibilities", "work_type", "title_skills")
+
+LISTING_TEMPLATE = """
+    Şirket: {company_name}
+    Pozisyon Başlığı: {title}
+    Konum: {location}
+    Sektör: {sector}
+    Çalışma Tipi: {remote_type}
+    Açıklama: {description}
+"""
+
+PROMPT_TEMPLATE = """
+Aşağıdaki iş ilanını analiz ederek STRICT JSON FORMATINDA cevapla. SADECE JSON formatında cevap ver, başka hiçbir açıklama veya işaret içerme:
+{schema}
+
+    İlan Detayları:{listing}    """
+
+# Tek istekte birden fazla ilan: talimatlar bir kez gönderilir, yanıt job_id ile eşleştirilir
+BATCH_PROMPT_TEMPLATE = """
+Aşağıdaki {count} iş ilanının her birini ayrı ayrı analiz ederek STRICT JSON FORMATINDA cevapla. SADECE JSON formatında cevap ver, başka hiçbir açıklama veya işaret içerme.
+Yanıt {{"results": [...]}} biçiminde olmalı. Dizide her ilan için bir öğe bulunmalı; her öğe ilanın "job_id" değerini ve şu alanları içermeli:
+{schema}
+{listings}"""
+
+def prompt_description(job: Dict) -> str:
+    """Açıklamanın token bütçesine sığdırılmış halini ilan başına bir kez üretir"""
+    if 'prompt_description' not in job:
+        job['prompt_description'] = compact_description(job.get('description', ''), DESCRIPTION_TOKEN_BUDGET)
+    return job['prompt_description']
+
+def listing_text(job: Dict) -> str:
+    return LISTING_TEMPLATE.format(
+        company_name=job.get('company_name', ''),
+        title=job.get('title', ''),
+        location=job.get('location', ''),
+        sector=job.get('sector', ''),
+        remote_type=job.get('remote_type', ''),
+        description=prompt_description(job)
+    )
+
+def build_prompt(job: Dict) -> str:
+    """İlan için analiz istemini oluşturur"""
+    return PROMPT_TEMPLATE.format(schema=ANALYSIS_SCHEMA, listing=listing_text(job))
+
+def build_batch_prompt(jobs: List[Dict]) -> str:
+    """Birden fazla ilan için tek analiz istemi oluşturur"""
+    listings = "".join(f"\n    --- İlan ID: {job['id']} ---{listing_text(job)}" for job in jobs)
+    return BATCH_PROMPT_TEMPLATE.format(count=len(jobs), schema=ANALYSIS_SCHEMA, listings=listings)
+
+def pack_batches(jobs: List[Dict], max_listings: int, token_budget: int) -> List[List[Dict]]:
+    """İlanları, istem token bütçesini ve ilan sınırını aşmayacak gruplara ayırır"""
+    overhead = count_tokens(BATCH_PROMPT_TEMPLATE + ANALYSIS_SCHEMA)
+    batches, current, used = [], [], overhead
+    for job in jobs:
+        cost = count_tokens(listing_text(job)) + 10
+        if current and (len(current) >= max_listings or used + cost > token_budget):
+            batches.append(current)
+            current, used = [], overhead
+        current.append(job)
+        used += cost
+    if current:
+        batches.append(current)
+    return batches
+
+def decode_response(response: Optional[str]):
+    """Model yanıtındaki kod bloğu işaretlerini temizleyip JSON'a çevirir"""
     if not response:
         print("⚠️ AI'den geçerli bir yanıt alınamadı")
         return None
@@ -180,36 +508,466 @@ Aşağıdaki iş ilanını analiz ederek STRICT JSON FORMATINDA cevapla. SADECE
         cleaned = cleaned.strip()
         
         print("🔍 Temizlenmiş yanıt:", cleaned[:200] + "...")
-        analysis = json.loads(cleaned)
+        decoded = json.loads(cleaned)
         print("✅ JSON başarıyla ayrıştırıldı")
-        return analysis
+        return decoded
     except json.JSONDecodeError as e:
         print(f"🔴 JSON parse hatası: {str(e)}")
         print("🔴 Ham AI yanıtı:", response)
         return None
 
-def process_jobs():
-    """Analiz edilmemiş tüm iş ilanlarını işler"""
-    print("🚀 Analiz işlemi başlatılıyor...")
-    jobs = fetch_unanalyzed_jobs()
-    if not jobs:
-        print("✅ Analiz edilecek yeni iş ilanı bulunamadı")
+# Model bu alanları bazen liste yerine tek metin olarak döndürür
+SKILL_FIELDS = ("hard_skills", "soft_skills", "title_skills")
+
+def parse_analysis(response: Optional[str]) -> Optional[Dict]:
+    analysis = decode_response(response)
+    if analysis is not None and not isinstance(analysis, dict):
+        print("🔴 AI yanıtı JSON nesnesi değil")
+        return None
+    if analysis is not None:
+        # Metin değerli beceri alanları harf harf "beceri"ye dönüşmesin
+        for field in SKILL_FIELDS:
+            if field in analysis:
+                analysis[field] = skill_names(analysis[field])
+        if isinstance(analysis.get("responsibilities"), str):
+            analysis["responsibilities"] = [analysis["responsibilities"]]
+    return analysis
+
+def valid_item(item) -> bool:
+    """Toplu yanıttaki bir öğenin tek ilan analizi yerine geçebilir olup olmadığı"""
+    return (
+        isinstance(item, dict)
+        and all(field in item for field in ANALYSIS_FIELDS)
+        and all(isinstance(item[field], list) for field in ("hard_skills", "soft_skills", "responsibilities", "title_skills"))
+    )
+
+def parse_batch_analysis(response: Optional[str], jobs: List[Dict]) -> Dict[int, Dict]:
+    """Toplu yanıtı {job_id: analiz} sözlüğüne çevirir; geçersiz veya yabancı öğeler atlanır"""
+    decoded = decode_response(response)
+    items = decoded.get("results") if isinstance(decoded, dict) else decoded
+    if not isinstance(items, list):
+        return {}
+    expected = {job['id'] for job in jobs}
+    results = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        try:
+            job_id = int(item.pop("job_id", None))
+        except (TypeError, ValueError):
+            continue
+        if job_id in expected and valid_item(item):
+            results[job_id] = item
+    return results
+
+_cache: Optional[LLMCache] = None
+# Önbellek executor iş parçacıklarından da ilk kez açılabilir
+_cache_lock = threading.Lock()
+
+def get_cache() -> Optional[LLMCache]:
+    """Önbellek açıksa süreç genelindeki önbelleği döndürür"""
+    global _cache
+    with _cache_lock:
+        if _cache is None and CACHE_ENABLED:
+            _cache = LLMCache(CACHE_PATH, MODEL, PROMPT_TEMPLATE + ANALYSIS_SCHEMA + LISTING_TEMPLATE,
+                              ttl_seconds=CACHE_TTL_DAYS * 24 * 3600, max_entries=CACHE_MAX_ENTRIES)
+    return _cache
+
+def close_cache():
+    global _cache
+    if _cache is not None:
+        print(f"🗃️ Önbellek istatistikleri: {_cache.stats()}")
+        _cache.close()
+        _cache = None
+
+def cached_analysis(prompt: str) -> Optional[Dict]:
+    cache = get_cache()
+    response = cache.get(prompt) if cache else None
+    if response is None:
+        return None
+    print("🗃️ Yanıt önbellekten alındı")
+    return parse_analysis(response)
+
+def store_analysis(prompt: str, response: Optional[str]) -> Optional[Dict]:
+    """Yanıtı ayrıştırır; yalnızca geçerli analizler önbelleğe yazılır"""
+    analysis = parse_analysis(response)
+    cache = get_cache()
+    if analysis and cache:
+        cache.put(prompt, response)
+    return analysis
+
+def finish_analysis(job: Dict, analysis: Optional[Dict]) -> Optional[Dict]:
+    """AI analizini beceri kipine göre sözlükle tamamlar ya da yerine sözlük analizini koyar"""
+    if SKILL_MODE == "llm":
+        return analysis
+    if analysis:
+        return refine_analysis(job, analysis)
+    if SKILL_MODE == "fallback":
+        print(f"🧩 AI yanıtı yok, sözlük analizi kullanılıyor: ID {job['id']}")
+        return local_analysis(job)
+    return None
+
+def analyze_job(job: Dict) -> Optional[Dict]:
+    """Bir iş ilanını analiz eder"""
+    if SKILL_MODE == "local":
+        return local_analysis(job)
+    print(f"🧠 İş ilanı analiz ediliyor: {job.get('company_name')} - {job.get('title')}")
+    prompt = build_prompt(job)
+    return cached_analysis(prompt) or store_analysis(prompt, chat_with_ai(prompt))
+
+async def request_analysis(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, job: Dict, prompt: str):
+    async with semaphore:
+        print(f"🧠 İş ilanı analiz ediliyor: {job.get('company_name')} - {job.get('title')}")
+        response = await chat_with_ai_async(session, prompt)
+    # Önbellek yazımı (SQLite) olay döngüsünü bloklamasın
+    return await asyncio.get_running_loop().run_in_executor(None, store_analysis, prompt, response)
+
+async def analyze_job_async(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, job: Dict,
+                            inflight: Optional[Dict] = None):
+    """Semafor izin verdiğinde ilanı analiz eder; (ilan, analiz) döndürür
+
+    Aynı istem zaten uçuştaysa yeni istek atılmaz, o isteğin sonucu beklenir.
+    """
+    prompt = build_prompt(job)
+    cached = await asyncio.get_running_loop().run_in_executor(None, cached_analysis, prompt)
+    if cached:
+        return job, cached
+    if inflight is None:
+        return job, await request_analysis(session, semaphore, job, prompt)
+    key = LLMCache.normalize(prompt)
+    if key not in inflight:
+        inflight[key] = asyncio.ensure_future(request_analysis(session, semaphore, job, prompt))
+    return job, await inflight[key]
+
+def cache_batch_results(jobs: List[Dict], results: Dict[int, Dict]):
+    """Toplu yanıttaki geçerli sonuçları tek ilan istemi anahtarıyla önbelleğe yazar
+
+    Böylece sonraki çalışmalar kip fark etmeksizin yararlanır.
+    """
+    cache = get_cache()
+    if not cache:
         return
-    
-    success_count = 0
     for job in jobs:
-        analysis = analyze_job(job)
+        if job['id'] in results:
+            cache.put(build_prompt(job), json.dumps(results[job['id']], ensure_ascii=False))
+
+async def analyze_batch_async(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, jobs: List[Dict]):
+    """İlanları tek istekte analiz eder; yanıtta geçerli sonucu olmayanlar tek tek yeniden denenir"""
+    async with semaphore:
+        print(f"🧠 {len(jobs)} iş ilanı tek istekte analiz ediliyor...")
+        results = parse_batch_analysis(await chat_with_ai_async(session, build_batch_prompt(jobs)), jobs)
+
+    await asyncio.get_running_loop().run_in_executor(None, cache_batch_results, jobs, results)
+
+    missing = [job for job in jobs if job['id'] not in results]
+    if missing:
+        print(f"↩️ {len(missing)}/{len(jobs)} ilan toplu yanıtta geçersiz, tek tek analiz edilecek")
+        fallback = await asyncio.gather(*(
+            request_analysis(session, semaphore, job, build_prompt(job)) for job in missing
+        ))
+        results.update({job['id']: analysis for job, analysis in zip(missing, fallback)})
+    return [(job, results.get(job['id'])) for job in jobs]
+
+def fetch_analyses(job_ids: List[int]) -> Dict[int, Dict]:
+    """Kayıtlı analizleri {job_id: analiz} olarak döndürür"""
+    try:
+        with get_pool().connection() as conn, conn.cursor() as cur:
+            cur.execute(f"""
+                SELECT job_id, {", ".join(ANALYSIS_FIELDS)} FROM job_analysis WHERE job_id = ANY(%s)
+            """, (list(job_ids),))
+            return {row['job_id']: {field: row[field] for field in ANALYSIS_FIELDS} for row in cur.fetchall()}
+    except psycopg2.Error as e:
+        print(f"🔴 Kayıtlı analizler alınamadı: {str(e)}")
+        return {}
+
+def copied_analysis(job: Dict, analysis: Dict) -> Dict:
+    """Kökün analizini ilana uyarlar: konum, sektör ve çalışma tipi ilanın kendi satırından alınır"""
+    analysis = dict(analysis)
+    if job.get('location'):
+        analysis['location'] = job['location']
+    if job.get('sector'):
+        analysis['sector'] = job['sector']
+    analysis['work_type'] = listing_work_type(job) or analysis.get('work_type')
+    return analysis
+
+def reuse_duplicate_analyses(jobs: List[Dict], sink: AnalysisSink):
+    """Neredeyse aynı bir ilanın (duplicate_of) yeniden yayını olan ilanlara onun analizini kopyalar
+
+    Kökü zaten analiz edilmiş ilanlar AI'a gönderilmeden kaydedilir. Kökü aynı partide olanlar
+    ertelenir ve kök analiz edilince kopyalanır. (AI'a gidecek ilanlar, ertelenenler) döndürür.
+    """
+    roots = {job['duplicate_of'] for job in jobs if job.get('duplicate_of')}
+    if not roots:
+        return jobs, []
+    analyses = fetch_analyses(list(roots))
+    batch_ids = {job['id'] for job in jobs}
+    pending, deferred = [], []
+    for job in jobs:
+        root = job.get('duplicate_of')
+        if root in analyses:
+            sink.add(job['id'], copied_analysis(job, analyses[root]), job.get('scraped_at'))
+            print(f"🔁 Yeniden yayın, ID {root} analizi kopyalandı: ID {job['id']}")
+        elif root in batch_ids:
+            deferred.append(job)
+        else:
+            pending.append(job)
+    return pending, deferred
+
+def copy_deferred_analyses(deferred: List[Dict], analyses: Dict[int, Dict], sink: AnalysisSink):
+    """Kökü bu partide analiz edilen ertelenmiş tekrarları kaydeder"""
+    for job in deferred:
+        analysis = analyses.get(job['duplicate_of'])
+        if analysis:
+            sink.add(job['id'], copied_analysis(job, analysis), job.get('scraped_at'))
+            print(f"🔁 Yeniden yayın, ID {job['duplicate_of']} analizi kopyalandı: ID {job['id']}")
+        else:
+            print(f"⚠️ Kök ilan analiz edilemediği için tekrar ilan atlandı: ID {job['id']}")
+
+def record_cached_analyses(jobs: List[Dict], analyses: Dict[int, Dict], sink: AnalysisSink) -> List[Dict]:
+    """Önbellekte yanıtı olan ilanları kaydeder; AI'a gönderilmesi gerekenleri döndürür"""
+    pending = []
+    for job in jobs:
+        analysis = cached_analysis(build_prompt(job))
         if analysis:
-            saved = save_analysis_results(job['id'], analysis, job.get('scraped_at'))
-            if saved:
-                success_count += 1
-                print(f"✅ Başarıyla işlendi: ID {job['id']}")
+            analyses[job['id']] = finish_analysis(job, analysis)
+            sink.add(job['id'], analyses[job['id']], job.get('scraped_at'))
+        else:
+            pending.append(job)
+    return pending
+
+def add_local_analyses(jobs: List[Dict], sink: AnalysisSink):
+    for job in jobs:
+        sink.add(job['id'], local_analysis(job), job.get('scraped_at'))
+
+def make_sink() -> AnalysisSink:
+    return AnalysisSink(get_pool(), batch_size=SINK_BATCH_SIZE, flush_interval=SINK_FLUSH_INTERVAL)
+
+def report_sink(sink: AnalysisSink, total: int):
+    print(f"\n🎉 Toplam {sink.written}/{total} ilan başarıyla analiz edildi ve kaydedildi")
+    print(f"✂️ Açıklama sıkıştırma: {COMPACTION_STATS.summary()}")
+    if sink.dead_lettered:
+        print(f"🪦 {sink.dead_lettered} analiz job_analysis_dead_letter tablosuna yazıldı")
+    if sink.buffer:
+        print(f"⚠️ {len(sink.buffer)} analiz veritabanı hatası nedeniyle kaydedilemedi")
+
+def process_jobs(limit: int = 100):
+    """Analiz edilmemiş iş ilanlarını sırayla işler
+
+    Her ilan işlenmeden hemen önce tek tek kiralanır; kiralama yavaş bir partide dolmaz.
+    """
+    print("🚀 Analiz işlemi başlatılıyor...")
+    total = 0
+    with make_sink() as sink:
+        for job in islice(iter_unanalyzed_jobs(page_size=1), limit):
+            total += 1
+            pending, _ = reuse_duplicate_analyses([job], sink)
+            if not pending:
+                continue
+            analysis = finish_analysis(job, analyze_job(job))
+            if analysis:
+                sink.add(job['id'], analysis, job.get('scraped_at'))
+                print(f"✅ Analiz edildi: ID {job['id']}")
             else:
-                print(f"⚠️ Kayıt hatası: ID {job['id']}")
+                print(f"⚠️ Analiz hatası: ID {job['id']}")
+
+    if not total:
+        print("✅ Analiz edilecek yeni iş ilanı bulunamadı")
+        return
+    report_sink(sink, total)
+
+async def single_async(session: aiohttp.ClientSession, semaphore: asyncio.Semaphore, job: Dict, inflight: Dict):
+    return [await analyze_job_async(session, semaphore, job, inflight)]
+
+async def analyze_jobs_async(jobs: List[Dict], concurrency: int = CONCURRENCY,
+                             request_timeout: float = REQUEST_TIMEOUT, prompt_batch: int = PROMPT_BATCH,
+                             token_budget: int = PROMPT_TOKEN_BUDGET) -> AnalysisSink:
+    """Verilen ilanları eşzamanlı analiz eder; biten analizler beklemeden kaydedilir
+
+    prompt_batch > 1 ise önbellekte olmayan ilanlar token bütçesine göre gruplanıp tek istekte gönderilir.
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    timeout = aiohttp.ClientTimeout(total=request_timeout)
+    sink = await loop.run_in_executor(None, make_sink)
+    if SKILL_MODE == "local":
+        # API'ye gidilmez; sözlük eşleştirmesi binlerce ilanı saniyeler içinde işler
+        try:
+            # Tampon dolunca yapılan toplu yazımlar olay döngüsünü bloklamasın
+            await loop.run_in_executor(None, add_local_analyses, jobs, sink)
+        finally:
+            await loop.run_in_executor(None, sink.close)
+        print(f"🧩 {len(jobs)} ilan yerel sözlükle analiz edildi")
+        return sink
+    claimed = [job['id'] for job in jobs]
+    # Yeniden yayınlanan ilanlar kökün analizini alır, AI'a gitmez
+    jobs, deferred = await loop.run_in_executor(None, reuse_duplicate_analyses, jobs, sink)
+    analyses = {}
+    async with aiohttp.ClientSession(headers=api_headers(), timeout=timeout) as session:
+        inflight = {}
+        if prompt_batch > 1:
+            # Önbellek okuması (SQLite) ve sink'in toplu yazımı olay döngüsü dışında yapılır
+            pending = await loop.run_in_executor(None, record_cached_analyses, jobs, analyses, sink)
+            batches = pack_batches(pending, prompt_batch, token_budget)
+            print(f"📦 {len(pending)} ilan {len(batches)} toplu isteğe bölündü")
+            coros = [analyze_batch_async(session, semaphore, batch) for batch in batches]
         else:
-            print(f"⚠️ Analiz hatası: ID {job['id']}")
-    
-    print(f"\n🎉 Toplam {success_count}/{len(jobs)} ilan başarıyla analiz edildi ve kaydedildi")
+            coros = [single_async(session, semaphore, job, inflight) for job in jobs]
+        tasks = [asyncio.ensure_future(coro) for coro in coros]
+        # Yavaş istekler sürerken kiralama dolup ilanlar başka bir sürece geçmesin
+        heartbeat = asyncio.ensure_future(renew_leases(claimed))
+        try:
+            for finished in asyncio.as_completed(tasks):
+                for job, analysis in await finished:
+                    analysis = finish_analysis(job, analysis)
+                    if not analysis:
+                        print(f"⚠️ Analiz hatası: ID {job['id']}")
+                        continue
+                    # Tampon dolunca yapılan toplu yazım olay döngüsünü bloklamasın
+                    await loop.run_in_executor(None, sink.add, job['id'], analysis, job.get('scraped_at'))
+                    analyses[job['id']] = analysis
+                    print(f"✅ Analiz edildi: ID {job['id']}")
+            await loop.run_in_executor(None, copy_deferred_analyses, deferred, analyses, sink)
+        finally:
+            # İptal veya hata durumunda uçuştaki istekler de iptal edilir
+            for task in tasks + list(inflight.values()) + [heartbeat]:
+                task.cancel()
+            await asyncio.gather(*tasks, *inflight.values(), heartbeat, return_exceptions=True)
+            # Tamamlanmış analizler iptalde de kaydedilir
+            await loop.run_in_executor(None, sink.close)
+    return sink
+
+async def sweep_backlog(batch_limit: int, stop: Optional[asyncio.Event] = None, drain: bool = True, **options):
+    """Analiz edilmemiş ilanları akıştan küçük parçalarla kiralayıp işler
+
+    Her parça eşzamanlılık kadar istek dolduracak büyüklüktedir ve işlenmeden hemen önce
+    kiralanır; böylece büyük bir --limit kiralama süresi içinde bitmese de ilanlar başka
+    süreçlere geçmez. drain=False ise en fazla batch_limit ilan işlenir. Akış keyset ile
+    ilerlediği için başarısız ilanlar aynı taramada tekrar gelmez. Her parça tam işlenecek
+    kadar kiralanır; son parça küçülür, işlenmeyecek ilan kiralanmaz.
+    """
+    loop = asyncio.get_running_loop()
+    claim_size = max(1, options.get("concurrency", CONCURRENCY) * options.get("prompt_batch", PROMPT_BATCH))
+    cursor_key = None
+    total = 0
+    while stop is None or not stop.is_set():
+        count = claim_size if drain else min(claim_size, batch_limit - total)
+        if count <= 0:
+            break
+        jobs = await loop.run_in_executor(None, claim_page, cursor_key, count)
+        if not jobs:
+            break
+        cursor_key = (jobs[-1]['scraped_at'], jobs[-1]['id'])
+        total += len(jobs)
+        print(f"📊 {len(jobs)} analiz edilmemiş ilan alındı (bu taramada toplam {total})")
+        sink = await analyze_jobs_async(jobs, **options)
+        report_sink(sink, len(jobs))
+    if not total:
+        print("✅ Analiz edilecek yeni iş ilanı bulunamadı")
+
+async def process_jobs_async(limit: int = 100, concurrency: int = CONCURRENCY,
+                             request_timeout: float = REQUEST_TIMEOUT, prompt_batch: int = PROMPT_BATCH,
+                             token_budget: int = PROMPT_TOKEN_BUDGET, drain: bool = False):
+    """Analiz edilmemiş ilanları eşzamanlı işler; drain ile tüm birikim sabit bellekle boşaltılır"""
+    print(f"🚀 Eşzamanlı analiz başlatılıyor ({concurrency} istek)...")
+    await sweep_backlog(limit, drain=drain, concurrency=concurrency, request_timeout=request_timeout,
+                        prompt_batch=prompt_batch, token_budget=token_budget)
+
+async def run_daemon(batch_limit: int = 100, debounce: float = 1.0, **options):
+    """Yeni ilan bildirimlerini dinleyerek sürekli çalışır
+
+    Önce LISTEN başlatılır, sonra birikmiş ilanlar taranır; böylece arada eklenen ilan kaçmaz.
+    Bildirim gelmese de birikim SWEEP_INTERVAL'de bir yeniden taranır. SIGTERM/SIGINT'te yeni
+    iş alınmaz, uçuştaki analizler bitirilip kaydedildikten sonra çıkılır.
+    """
+    loop = asyncio.get_running_loop()
+    stop = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:
+            # Windows'ta olay döngüsü sinyal dinleyemez; işleyici ana iş parçacığından döngüyü uyarır
+            signal.signal(sig, lambda *_: loop.call_soon_threadsafe(stop.set))
+
+    with get_pool().connection() as conn:
+        ensure_notify_trigger(conn)
+    listener = JobNotificationListener(DB_CONFIG)
+    print("😈 Analiz servisi başlatıldı")
+    next_sweep = loop.time()
+    try:
+        while not stop.is_set():
+            if listener.conn is None:
+                try:
+                    listener.connect()
+                except psycopg2.Error as e:
+                    print(f"🔴 Dinleme bağlantısı kurulamadı, tekrar denenecek: {str(e)}")
+                    await asyncio.wait([asyncio.ensure_future(stop.wait())], timeout=5)
+                    continue
+                # Bağlantı yokken gelen bildirimler kaybolduğu için tablo taranır
+                next_sweep = loop.time()
+            if loop.time() >= next_sweep:
+                await sweep_backlog(batch_limit, stop, **options)
+                next_sweep = loop.time() + SWEEP_INTERVAL
+
+            job_ids = await listener.next_batch(stop, debounce, batch_limit,
+                                                timeout=max(0.0, next_sweep - loop.time()))
+            if not job_ids:
+                continue
+            jobs = await loop.run_in_executor(None, fetch_jobs_by_ids, job_ids)
+            if jobs:
+                print(f"🔔 {len(jobs)} yeni ilan bildirildi")
+                sink = await analyze_jobs_async(jobs, **options)
+                report_sink(sink, len(jobs))
+    finally:
+        listener.close()
+        print("👋 Analiz servisi durduruldu")
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="İş ilanlarını yapay zeka ile analiz eder")
+    parser.add_argument("--limit", type=int, default=100, help="Bu çalışmada işlenecek en fazla ilan")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="Aynı anda yapılacak en fazla AI isteği")
+    parser.add_argument("--timeout", type=float, default=REQUEST_TIMEOUT, help="İstek başına zaman aşımı (sn)")
+    parser.add_argument("--serial", action="store_true", help="Eski sıralı akışı kullan")
+    parser.add_argument("--daemon", action="store_true", help="Yeni ilan bildirimlerini dinleyerek sürekli çalış")
+    parser.add_argument("--all", action="store_true", help="Tüm birikimi boşalt (--limit yok sayılır; parçalar --concurrency x --prompt-batch ilanlık)")
+    parser.add_argument("--batch-size", type=int, default=SINK_BATCH_SIZE, help="Toplu kayıttaki en fazla analiz")
+    parser.add_argument("--no-cache", action="store_true", help="AI yanıt önbelleğini kullanma")
+    parser.add_argument("--prompt-batch", type=int, default=PROMPT_BATCH, help="Tek istekte gönderilecek en fazla ilan")
+    parser.add_argument("--description-tokens", type=int, default=DESCRIPTION_TOKEN_BUDGET, help="Açıklama için token bütçesi")
+    parser.add_argument("--prompt-token-budget", type=int, default=PROMPT_TOKEN_BUDGET, help="Toplu istemin token bütçesi")
+    parser.add_argument("--skills", choices=SKILL_MODES, default=SKILL_MODE,
+                        help="Yerel beceri sözlüğü kipi (local: API kullanmadan analiz)")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    process_jobs()
+    args = parse_args()
+    SINK_BATCH_SIZE = args.batch_size
+    CONCURRENCY = args.concurrency
+    DESCRIPTION_TOKEN_BUDGET = args.description_tokens
+    CACHE_ENABLED = CACHE_ENABLED and not args.no_cache
+    SKILL_MODE = args.skills
+    try:
+        with get_pool(1 if args.serial else args.concurrency).connection() as conn:
+            ensure_analysis_schema(conn)
+    except psycopg2.Error as e:
+        print(f"🔴 Veritabanı bağlantı hatası: {str(e)}")
+        raise SystemExit(1)
+    try:
+        if args.serial:
+            process_jobs(args.limit)
+        elif args.daemon:
+            asyncio.run(run_daemon(
+                args.limit,
+                concurrency=args.concurrency,
+                request_timeout=args.timeout,
+                prompt_batch=args.prompt_batch,
+                token_budget=args.prompt_token_budget
+            ))
+        else:
+            asyncio.run(process_jobs_async(args.limit, args.concurrency, args.timeout,
+                                           args.prompt_batch, args.prompt_token_budget, args.all))
+    except KeyboardInterrupt:
+        print("\n⛔ Analiz kullanıcı tarafından durduruldu")
+    finally:
+        close_governor()
+        close_cache()
+        close_pool()
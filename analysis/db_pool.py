@@ -0,0 +1,115 @@
+import threading
+from contextlib import contextmanager
+from time import monotonic
+from typing import Dict
+import psycopg2
+from psycopg2.pool import ThreadedConnectionPool
+
+# Bu süreden uzun boşta kalan bağlantı, verilmeden önce SELECT 1 ile denetlenir
+HEALTH_CHECK_INTERVAL = 30.0
+
+class ConnectionPool:
+    """ Analiz tarafının paylaştığı, bekleyen istemcileri sıraya alan bağlantı havuzu
+
+    ThreadedConnectionPool dolunca hata fırlatır; semafor sayesinde istemci bunun yerine
+    bir bağlantı boşalana kadar bekler. Kopan bağlantılar atılıp yenisi açılır.
+    """
+
+    def __init__(self, db_config: Dict, maxconn: int, **connect_kwargs):
+        self.maxconn = maxconn
+        # psycopg2 havuzu minconn üstündeki bağlantıları geri verildiğinde kapatır;
+        # yeniden kullanım için tüm bağlantılar açık tutulur
+        self.pool = ThreadedConnectionPool(maxconn, maxconn, **db_config, **connect_kwargs)
+        self.slots = threading.BoundedSemaphore(maxconn)
+        self.last_used = {}
+        self.lock = threading.Lock()
+        self.checkouts = 0
+        self.in_use = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.dropped = 0
+        self.failed_checks = 0
+
+    def _healthy(self, conn) -> bool:
+        if conn.closed:
+            return False
+        if monotonic() - self.last_used.get(id(conn), 0) < HEALTH_CHECK_INTERVAL:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _checkout(self):
+        conn = self.pool.getconn()
+        if self._healthy(conn):
+            return conn
+        # Bozuk bağlantıyı havuzdan at ve yerine yenisini iste
+        with self.lock:
+            self.failed_checks += 1
+            self.dropped += 1
+        self.last_used.pop(id(conn), None)
+        self.pool.putconn(conn, close=True)
+        return self.pool.getconn()
+
+    @contextmanager
+    def connection(self):
+        """ Havuzdan bağlantı verir; blok sonunda bağlantı geri bırakılır
+
+        Blokta hata olursa işlem geri alınır, bağlantı kopmuşsa havuza geri konmaz.
+        """
+        start = monotonic()
+        self.slots.acquire()
+        waited = monotonic() - start
+        try:
+            conn = self._checkout()
+        except Exception:
+            self.slots.release()
+            raise
+        with self.lock:
+            self.checkouts += 1
+            self.in_use += 1
+            self.wait_total += waited
+            self.wait_max = max(self.wait_max, waited)
+
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        except Exception:
+            if not conn.closed:
+                conn.rollback()
+            raise
+        finally:
+            broken = broken or bool(conn.closed)
+            if broken:
+                self.last_used.pop(id(conn), None)
+                with self.lock:
+                    self.dropped += 1
+            else:
+                self.last_used[id(conn)] = monotonic()
+            self.pool.putconn(conn, close=broken)
+            with self.lock:
+                self.in_use -= 1
+            self.slots.release()
+
+    def stats(self) -> Dict:
+        """ İzleme için havuz sayaçları """
+        with self.lock:
+            return {
+                "size": self.maxconn,
+                "in_use": self.in_use,
+                "checkouts": self.checkouts,
+                "wait_avg_ms": round(self.wait_total / self.checkouts * 1000, 2) if self.checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 2),
+                "dropped": self.dropped,
+                "failed_health_checks": self.failed_checks
+            }
+
+    def close(self):
+        self.pool.closeall()
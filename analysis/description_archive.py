@@ -0,0 +1,187 @@
+import sys
+import threading
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import execute_values
+import zstandard as zstd
+
+# job_listings tablosunda tutulan kısa önizleme uzunluğu; tam metin arşivde
+PREVIEW_LENGTH = 500
+
+COMPRESSION_LEVEL = 9
+DICTIONARY_SIZE = 112 * 1024
+
+# dict_id -> sözlük; kayıtlı sözlükler değişmediği için süreç boyunca bir kez okunur
+_DICTIONARIES = {}
+_DICTIONARIES_LOCK = threading.Lock()
+
+def plain_cursor(connection):
+    """ Bağlantının cursor_factory ayarından bağımsız, tuple döndüren imleç """
+    return connection.cursor(cursor_factory=psycopg2.extensions.cursor)
+
+def ensure_archive_schema(connection):
+    """ Sıkıştırılmış açıklama arşivi ve zstd sözlük tablolarını oluşturur """
+    with plain_cursor(connection) as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS description_dictionaries (
+                id SERIAL PRIMARY KEY,
+                dictionary BYTEA NOT NULL,
+                sample_count INTEGER,
+                created_at TIMESTAMP DEFAULT NOW()
+            );
+            CREATE TABLE IF NOT EXISTS job_descriptions (
+                job_id INTEGER PRIMARY KEY REFERENCES job_listings(id) ON DELETE CASCADE,
+                dict_id INTEGER REFERENCES description_dictionaries(id),
+                description BYTEA NOT NULL,
+                raw_html BYTEA,
+                original_length INTEGER,
+                archived_at TIMESTAMP DEFAULT NOW()
+            );
+            ALTER TABLE job_descriptions ALTER COLUMN description SET STORAGE EXTERNAL;
+            ALTER TABLE job_descriptions ALTER COLUMN raw_html SET STORAGE EXTERNAL;
+        """)
+    connection.commit()
+
+class DescriptionArchive:
+    """ Tam ilan açıklamalarını (ve isteğe bağlı ham HTML'i) zstd ile sıkıştırıp saklar
+
+    En son eğitilmiş sözlük sıkıştırmada kullanılır; her kayıt hangi sözlükle
+    sıkıştırıldığını tuttuğu için eski kayıtlar yeni sözlük eğitildikten sonra da açılır.
+    Sözlükler süreç genelinde dict_id ile önbelleklenir; yalnızca okuma yapan örnekler
+    (ör. her kiralamada attach_full_descriptions) en son sözlüğü hiç sorgulamaz.
+    """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.decompressors = {}
+        self.dict_id = None
+        self.compressor = None
+        # Ham HTML sözlüksüz sıkıştırılır (sözlük açıklama metni için eğitilir)
+        self.html_compressor = zstd.ZstdCompressor(level=COMPRESSION_LEVEL)
+
+    def _latest_compressor(self):
+        """ İlk yazımda en son sözlüğü bulur ve sıkıştırıcıyı kurar """
+        if self.compressor is None:
+            with plain_cursor(self.connection) as cur:
+                cur.execute("SELECT id FROM description_dictionaries ORDER BY id DESC LIMIT 1")
+                row = cur.fetchone()
+            self.dict_id = row[0] if row else None
+            self.compressor = zstd.ZstdCompressor(
+                level=COMPRESSION_LEVEL,
+                dict_data=self._dictionary(self.dict_id) if self.dict_id is not None else None
+            )
+        return self.compressor
+
+    def _dictionary(self, dict_id):
+        with _DICTIONARIES_LOCK:
+            dictionary = _DICTIONARIES.get(dict_id)
+        if dictionary is None:
+            with plain_cursor(self.connection) as cur:
+                cur.execute("SELECT dictionary FROM description_dictionaries WHERE id = %s", (dict_id,))
+                dictionary = zstd.ZstdCompressionDict(bytes(cur.fetchone()[0]))
+            with _DICTIONARIES_LOCK:
+                dictionary = _DICTIONARIES.setdefault(dict_id, dictionary)
+        return dictionary
+
+    def _decompressor(self, dict_id):
+        if dict_id not in self.decompressors:
+            dict_data = self._dictionary(dict_id) if dict_id is not None else None
+            self.decompressors[dict_id] = zstd.ZstdDecompressor(dict_data=dict_data)
+        return self.decompressors[dict_id]
+
+    def compress(self, text):
+        return self._latest_compressor().compress(text.encode("utf-8"))
+
+    def decompress(self, dict_id, blob):
+        return self._decompressor(dict_id).decompress(bytes(blob)).decode("utf-8")
+
+    def store_many(self, cursor, entries):
+        """ (job_id, açıklama, ham_html) kayıtlarını tek sorguda arşive yazar; commit çağırana aittir """
+        # dict_id sıkıştırıcı kurulurken belirlenir
+        self._latest_compressor()
+        rows = [
+            (
+                job_id,
+                self.dict_id,
+                psycopg2.Binary(self.compress(description or "")),
+                psycopg2.Binary(self.html_compressor.compress(raw_html.encode("utf-8"))) if raw_html else None,
+                len(description or "")
+            )
+            for job_id, description, raw_html in entries
+        ]
+        if not rows:
+            return
+        execute_values(cursor, """
+            INSERT INTO job_descriptions (job_id, dict_id, description, raw_html, original_length)
+            VALUES %s
+            ON CONFLICT (job_id) DO NOTHING
+        """, rows, page_size=len(rows))
+
+    def load(self, job_ids):
+        """ Verilen ilanların tam açıklamalarını {job_id: metin} olarak döndürür """
+        if not job_ids:
+            return {}
+        with plain_cursor(self.connection) as cur:
+            cur.execute(
+                "SELECT job_id, dict_id, description FROM job_descriptions WHERE job_id = ANY(%s)",
+                (list(job_ids),)
+            )
+            return {job_id: self.decompress(dict_id, blob) for job_id, dict_id, blob in cur.fetchall()}
+
+    def load_html(self, job_id):
+        with plain_cursor(self.connection) as cur:
+            cur.execute("SELECT raw_html FROM job_descriptions WHERE job_id = %s", (job_id,))
+            row = cur.fetchone()
+        if not row or row[0] is None:
+            return None
+        return zstd.ZstdDecompressor().decompress(bytes(row[0])).decode("utf-8")
+
+def attach_full_descriptions(connection, jobs):
+    """ İlan sözlüklerindeki önizleme açıklamasını arşivdeki tam metinle değiştirir """
+    full = DescriptionArchive(connection).load([job["id"] for job in jobs])
+    for job in jobs:
+        if job["id"] in full:
+            job["description"] = full[job["id"]]
+    return jobs
+
+def train_dictionary(connection, sample_limit=5000):
+    """ Mevcut açıklamalardan yeni bir zstd sözlüğü eğitir ve kaydeder; yeni kayıtlar bunu kullanır """
+    archive = DescriptionArchive(connection)
+    with plain_cursor(connection) as cur:
+        cur.execute("""
+            SELECT dict_id, description FROM job_descriptions
+            ORDER BY archived_at DESC LIMIT %s
+        """, (sample_limit,))
+        samples = [archive.decompress(dict_id, blob).encode("utf-8") for dict_id, blob in cur.fetchall()]
+    if len(samples) < 100:
+        print(f"⚠️ Sözlük eğitimi için yeterli örnek yok ({len(samples)})")
+        return None
+
+    dictionary = zstd.train_dictionary(DICTIONARY_SIZE, samples)
+    with plain_cursor(connection) as cur:
+        cur.execute(
+            "INSERT INTO description_dictionaries (dictionary, sample_count) VALUES (%s, %s) RETURNING id",
+            (psycopg2.Binary(dictionary.as_bytes()), len(samples))
+        )
+        dict_id = cur.fetchone()[0]
+    connection.commit()
+
+    raw = sum(len(sample) for sample in samples)
+    trained = zstd.ZstdCompressor(level=COMPRESSION_LEVEL, dict_data=dictionary)
+    compressed = sum(len(trained.compress(sample)) for sample in samples)
+    print(f"📚 Sözlük #{dict_id} eğitildi: {len(samples)} örnek, sıkıştırma oranı {raw / max(compressed, 1):.1f}x")
+    return dict_id
+
+if __name__ == "__main__":
+    # Kullanım: python analysis/description_archive.py train
+    from assistant import get_db_connection
+    if sys.argv[1:] != ["train"]:
+        print("Kullanım: python analysis/description_archive.py train")
+        sys.exit(1)
+    conn = get_db_connection()
+    if conn:
+        try:
+            ensure_archive_schema(conn)
+            train_dictionary(conn)
+        finally:
+            conn.close()
@@ -0,0 +1,122 @@
+import asyncio
+from typing import Dict, List, Optional
+import psycopg2
+
+# job_listings'e eklenen her satırın id'si bu kanala yayınlanır
+CHANNEL = "job_listings_inserted"
+# add_reader desteklemeyen olay döngülerinde (Windows Proactor) bağlantının yoklanma aralığı (sn)
+POLL_INTERVAL = 0.5
+
+def ensure_notify_trigger(conn):
+    """job_listings INSERT'lerinde NOTIFY gönderen tetikleyiciyi kurar (bildirim commit'te iletilir)"""
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            CREATE OR REPLACE FUNCTION notify_job_listing_inserted() RETURNS trigger AS $$
+            BEGIN
+                PERFORM pg_notify('{CHANNEL}', NEW.id::text);
+                RETURN NEW;
+            END;
+            $$ LANGUAGE plpgsql;
+
+            DROP TRIGGER IF EXISTS job_listings_notify_insert ON job_listings;
+            CREATE TRIGGER job_listings_notify_insert
+                AFTER INSERT ON job_listings
+                FOR EACH ROW EXECUTE PROCEDURE notify_job_listing_inserted();
+        """)
+    conn.commit()
+
+class JobNotificationListener:
+    """Ayrı bir autocommit bağlantısıyla kanalı dinler, gelen ilan id'lerini olay döngüsüne aktarır
+
+    Bağlantı koparsa `lost` işaretlenir; bu arada kaçan bildirimler için çağıran taraf
+    yeniden bağlandıktan sonra birikmiş işleri taramalıdır. Olay döngüsü soket izlemeyi
+    desteklemiyorsa (Windows'taki varsayılan Proactor döngüsü) bağlantı POLL_INTERVAL'de bir yoklanır.
+    """
+
+    def __init__(self, db_config: Dict, channel: str = CHANNEL):
+        self.db_config = db_config
+        self.channel = channel
+        self.conn = None
+        self.queue: asyncio.Queue = asyncio.Queue()
+        self.lost = False
+        self.poller: Optional[asyncio.Future] = None
+
+    def connect(self):
+        self.conn = psycopg2.connect(**self.db_config)
+        self.conn.autocommit = True
+        with self.conn.cursor() as cur:
+            cur.execute(f"LISTEN {self.channel}")
+        try:
+            asyncio.get_running_loop().add_reader(self.conn.fileno(), self._on_readable)
+        except NotImplementedError:
+            self.poller = asyncio.ensure_future(self._poll())
+        self.lost = False
+        print(f"👂 '{self.channel}' kanalı dinleniyor")
+
+    def _on_readable(self):
+        try:
+            self.conn.poll()
+        except psycopg2.Error as e:
+            print(f"🔴 Dinleme bağlantısı koptu: {str(e)}")
+            self._drop()
+            return
+        while self.conn.notifies:
+            notify = self.conn.notifies.pop(0)
+            try:
+                self.queue.put_nowait(int(notify.payload))
+            except ValueError:
+                continue
+
+    async def _poll(self):
+        while self.conn is not None:
+            self._on_readable()
+            await asyncio.sleep(POLL_INTERVAL)
+
+    def _unwatch(self):
+        if self.poller is not None:
+            self.poller.cancel()
+            self.poller = None
+            return
+        try:
+            asyncio.get_running_loop().remove_reader(self.conn.fileno())
+        except (ValueError, OSError):
+            pass
+
+    def _drop(self):
+        if self.conn is not None:
+            self._unwatch()
+            self.conn.close()
+            self.conn = None
+        self.lost = True
+        # Bekleyen next_batch çağrısı uyansın
+        self.queue.put_nowait(None)
+
+    async def next_batch(self, stop: asyncio.Event, debounce: float = 1.0, max_ids: int = 100,
+                         timeout: Optional[float] = None) -> List[int]:
+        """İlk bildirimi (ya da durma isteğini, en fazla timeout sn) bekler, ardından kısa süre gelenleri de toplar"""
+        getter = asyncio.ensure_future(self.queue.get())
+        stopper = asyncio.ensure_future(stop.wait())
+        await asyncio.wait({getter, stopper}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+        stopper.cancel()
+        if not getter.done():
+            getter.cancel()
+            return []
+
+        ids = [getter.result()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + debounce
+        while len(ids) < max_ids and not stop.is_set():
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                ids.append(await asyncio.wait_for(self.queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return list(dict.fromkeys(job_id for job_id in ids if job_id is not None))
+
+    def close(self):
+        if self.conn is not None:
+            self._unwatch()
+            self.conn.close()
+            self.conn = None
@@ -0,0 +1,109 @@
+import hashlib
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+class LLMCache:
+    """AI yanıtlarını (model, normalize edilmiş istem) özetiyle anahtarlayan kalıcı SQLite önbelleği
+
+    Her kayıt üretildiği istem şablonunun özetini taşır; şablon değişince eski kayıtlar
+    açılışta silinir. Süresi dolan kayıtlar ve en az kullanılanlar (LRU) budanır.
+    """
+
+    def __init__(self, path: str, model: str, template: str,
+                 ttl_seconds: float = 30 * 24 * 3600, max_entries: int = 50000):
+        self.model = model
+        self.template_hash = hashlib.sha256(template.encode("utf-8")).hexdigest()[:16]
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.puts = 0
+        # Eşzamanlı motorda yürütücü iş parçacıkları da erişir
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                model TEXT NOT NULL,
+                template_hash TEXT NOT NULL,
+                response TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                last_used_at REAL NOT NULL
+            )
+        """)
+        self.db.execute("CREATE INDEX IF NOT EXISTS responses_last_used_idx ON responses (last_used_at)")
+        stale = self.db.execute(
+            "DELETE FROM responses WHERE template_hash != ?", (self.template_hash,)
+        ).rowcount
+        self.db.commit()
+        if stale:
+            print(f"🧹 İstem şablonu değiştiği için {stale} önbellek kaydı silindi")
+        self.evict()
+
+    @staticmethod
+    def normalize(prompt: str) -> str:
+        return re.sub(r"\s+", " ", prompt).strip()
+
+    def key(self, prompt: str) -> str:
+        return hashlib.sha256(f"{self.model}\0{self.normalize(prompt)}".encode("utf-8")).hexdigest()
+
+    def get(self, prompt: str) -> Optional[str]:
+        key = self.key(prompt)
+        now = time.time()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT response, created_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None or now - row[1] > self.ttl_seconds:
+                self.misses += 1
+                return None
+            self.db.execute("UPDATE responses SET last_used_at = ? WHERE key = ?", (now, key))
+            self.db.commit()
+            self.hits += 1
+            return row[0]
+
+    def put(self, prompt: str, response: str):
+        now = time.time()
+        with self.lock:
+            self.db.execute("""
+                INSERT OR REPLACE INTO responses (key, model, template_hash, response, created_at, last_used_at)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """, (self.key(prompt), self.model, self.template_hash, response, now, now))
+            self.db.commit()
+            self.puts += 1
+            due = self.puts % 100 == 0
+        if due:
+            self.evict()
+
+    def evict(self):
+        """Süresi dolan kayıtları ve sınırın üstündeki en eski kullanılanları siler"""
+        with self.lock:
+            removed = self.db.execute(
+                "DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,)
+            ).rowcount
+            removed += self.db.execute("""
+                DELETE FROM responses WHERE key IN (
+                    SELECT key FROM responses ORDER BY last_used_at DESC LIMIT -1 OFFSET ?
+                )
+            """, (self.max_entries,)).rowcount
+            self.db.commit()
+            self.evictions += removed
+
+    def stats(self) -> Dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": self.db.execute("SELECT COUNT(*) FROM responses").fetchone()[0]
+            }
+
+    def close(self):
+        self.db.close()
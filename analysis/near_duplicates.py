@@ -0,0 +1,229 @@
+import os
+import re
+import sys
+import hashlib
+import psycopg2
+import psycopg2.extensions
+from psycopg2.extras import execute_values
+
+# MinHash imzası BANDS x ROWS değerden oluşur; iki ilan en az bir bantta tamamen aynıysa aday olur.
+# 20 x 6 ile Jaccard 0.8 olan çiftlerin ~%99'u aday olur, kesin karar imza benzerliğiyle verilir.
+BANDS = 20
+ROWS = 6
+NUM_PERM = BANDS * ROWS
+SHINGLE_SIZE = 3
+# Bundan kısa açıklamalar (ör. yalnızca "Detaylar için başvurun") indekslenmez
+MIN_TOKENS = 40
+THRESHOLD = float(os.getenv("NEAR_DUPLICATE_THRESHOLD", "0.85"))
+
+# Parça özetleri 50 bit; böylece ödünç alınan değerler de BIGINT'e sığar
+_SHINGLE_MASK = (1 << 50) - 1
+# Densifikasyonda ödünç alınan değere eklenen kaydırma; boş bölmeler dolu bölmelerle çakışmasın
+_OFFSET = 1 << 50
+
+def ensure_near_duplicate_schema(connection):
+    """ MinHash imza, LSH kova tablolarını ve job_listings.duplicate_of sütununu oluşturur """
+    with connection.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+        cur.execute("""
+            ALTER TABLE job_listings ADD COLUMN IF NOT EXISTS duplicate_of INTEGER;
+            CREATE INDEX IF NOT EXISTS job_listings_duplicate_of_idx
+                ON job_listings (duplicate_of) WHERE duplicate_of IS NOT NULL;
+            CREATE TABLE IF NOT EXISTS listing_minhash (
+                job_id INTEGER PRIMARY KEY REFERENCES job_listings(id) ON DELETE CASCADE,
+                signature BIGINT[] NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS listing_lsh_buckets (
+                band SMALLINT NOT NULL,
+                bucket BIGINT NOT NULL,
+                job_id INTEGER NOT NULL REFERENCES job_listings(id) ON DELETE CASCADE,
+                PRIMARY KEY (band, bucket, job_id)
+            );
+        """)
+    connection.commit()
+
+def _hash64(data):
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big", signed=True)
+
+def shingles(text):
+    """ Açıklamanın ardışık SHINGLE_SIZE kelimelik parçalarının 64 bit özetleri """
+    tokens = re.findall(r"\w+", (text or "").lower())
+    if len(tokens) < MIN_TOKENS:
+        return set()
+    return {
+        _hash64(" ".join(tokens[i:i + SHINGLE_SIZE]).encode("utf-8")) & _SHINGLE_MASK
+        for i in range(len(tokens) - SHINGLE_SIZE + 1)
+    }
+
+def minhash(text):
+    """ NUM_PERM değerlik MinHash imzası; açıklama çok kısaysa None
+
+    Tek permütasyonlu MinHash: her parça bir kez özetlenir, özetin kalanı bölmeyi, bölümü
+    değeri belirler ve her bölmede en küçük değer tutulur. Boş kalan bölmeler sağdaki ilk dolu
+    bölmeden ödünç alınır (densifikasyon). NUM_PERM ayrı permütasyona göre onlarca kat hızlıdır.
+    """
+    values = shingles(text)
+    if not values:
+        return None
+    signature = [None] * NUM_PERM
+    for value in values:
+        slot, rank = value % NUM_PERM, value // NUM_PERM
+        if signature[slot] is None or rank < signature[slot]:
+            signature[slot] = rank
+    filled = [slot for slot, rank in enumerate(signature) if rank is not None]
+    for slot in range(NUM_PERM):
+        if signature[slot] is None:
+            donor = next((other for other in filled if other > slot), filled[0])
+            signature[slot] = signature[donor] + ((donor - slot) % NUM_PERM) * _OFFSET
+    return signature
+
+def identity_key(title, company):
+    """ Başlık ve şirketin karşılaştırma anahtarı (küçük harf, noktalama ve fazla boşluk atılmış) """
+    return tuple(
+        " ".join(re.findall(r"\w+", (value or "").replace("İ", "i").lower()))
+        for value in (title, company)
+    )
+
+def similarity(first, second):
+    """ İki imzanın eşit konum oranı (Jaccard benzerliğinin tahmini) """
+    return sum(x == y for x, y in zip(first, second)) / NUM_PERM
+
+def band_keys(signature):
+    """ İmzanın (bant, kova) anahtarları """
+    return [
+        (band, _hash64(repr(signature[band * ROWS:(band + 1) * ROWS]).encode("ascii")))
+        for band in range(BANDS)
+    ]
+
+class NearDuplicateIndex:
+    """ Yeni ilanları MinHash/LSH ile önceki ilanlarla karşılaştırıp neredeyse aynı olanları işaretler
+
+    Açıklamalar şirketin ortak metniyle büyük ölçüde örtüşebildiği için yalnızca başlığı ve
+    şirketi de aynı olan ilanlar tekrar sayılır. Tekrar bulunan ilanın duplicate_of sütunu
+    kümenin ilk ilanını (kökü) gösterir; zincir oluşmaz. Analiz aracı kökün analizini kopyalar,
+    panel tekrarları tek ilan olarak sayabilir.
+    """
+
+    def __init__(self, threshold=THRESHOLD):
+        self.threshold = threshold
+
+    def _identities(self, cursor, job_ids):
+        """ İlanların kayıtlı başlık ve şirketinden {job_id: kimlik anahtarı} """
+        with cursor.connection.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+            cur.execute("SELECT id, title, company_name FROM job_listings WHERE id = ANY(%s)", (job_ids,))
+            return {job_id: identity_key(title, company) for job_id, title, company in cur.fetchall()}
+
+    def _candidates(self, cursor, keys):
+        """ Verilen kovalardaki kayıtlı ilanları {job_id: (imza, kök, kimlik anahtarı)} olarak döndürür """
+        if not keys:
+            return {}
+        with cursor.connection.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+            cur.execute("""
+                SELECT DISTINCT m.job_id, m.signature, COALESCE(l.duplicate_of, l.id), l.title, l.company_name
+                FROM listing_lsh_buckets b
+                JOIN listing_minhash m ON m.job_id = b.job_id
+                JOIN job_listings l ON l.id = b.job_id
+                WHERE (b.band, b.bucket) IN (
+                    SELECT * FROM unnest(%s::smallint[], %s::bigint[])
+                )
+            """, ([band for band, _ in keys], [bucket for _, bucket in keys]))
+            return {
+                job_id: (signature, root, identity_key(title, company))
+                for job_id, signature, root, title, company in cur.fetchall()
+            }
+
+    def add_many(self, cursor, entries):
+        """ (job_id, açıklama) kayıtlarını indeksler ve tekrarları işaretler; commit çağırana aittir
+
+        İlanlar job_listings'e aynı işlemde yazılmış olmalıdır; başlık ve şirket oradan okunur.
+        Aynı parti içindeki ilanlar da birbirleriyle karşılaştırılır. {job_id: kök_id} döndürür.
+        """
+        signed = [(job_id, minhash(description)) for job_id, description in entries]
+        signed = [(job_id, signature) for job_id, signature in signed if signature is not None]
+        if not signed:
+            return {}
+
+        identities = self._identities(cursor, [job_id for job_id, _ in signed])
+        keys = {job_id: band_keys(signature) for job_id, signature in signed}
+        known = self._candidates(cursor, list({key for job_keys in keys.values() for key in job_keys}))
+        buckets = {}
+        for job_id, (signature, root, _) in known.items():
+            for key in band_keys(signature):
+                buckets.setdefault(key, []).append(job_id)
+
+        duplicates = {}
+        for job_id, signature in signed:
+            identity = identities.get(job_id)
+            candidates = {
+                other for key in keys[job_id] for other in buckets.get(key, ())
+                if known[other][2] == identity
+            }
+            # En benzer aday seçilir; eşitlikte en eski ilan
+            score, _, best = max(
+                ((similarity(signature, known[other][0]), -other, other) for other in candidates),
+                default=(0.0, 0, None)
+            )
+            if score < self.threshold:
+                best = None
+            root = known[best][1] if best is not None else job_id
+            if best is not None:
+                duplicates[job_id] = root
+            # Sonraki ilanlar bu partidekilerle de karşılaştırılsın
+            known[job_id] = (signature, root, identity)
+            for key in keys[job_id]:
+                buckets.setdefault(key, []).append(job_id)
+
+        execute_values(cursor, """
+            INSERT INTO listing_minhash (job_id, signature) VALUES %s
+            ON CONFLICT (job_id) DO UPDATE SET signature = EXCLUDED.signature
+        """, signed, template="(%s, %s::bigint[])", page_size=len(signed))
+        execute_values(cursor, """
+            INSERT INTO listing_lsh_buckets (band, bucket, job_id) VALUES %s
+            ON CONFLICT DO NOTHING
+        """, [(band, bucket, job_id) for job_id, _ in signed for band, bucket in keys[job_id]],
+            page_size=1000)
+        if duplicates:
+            execute_values(cursor, """
+                UPDATE job_listings l SET duplicate_of = v.root
+                FROM (VALUES %s) AS v (id, root)
+                WHERE l.id = v.id
+            """, list(duplicates.items()), page_size=len(duplicates))
+        return duplicates
+
+def index_existing(connection, page_size=500):
+    """ İmzası olmayan mevcut ilanları id sırasıyla indeksler (ilk kurulumda bir kez çalıştırılır) """
+    from description_archive import attach_full_descriptions
+
+    index = NearDuplicateIndex()
+    last_id, total, found = 0, 0, 0
+    while True:
+        with connection.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+            cur.execute("""
+                SELECT id, description FROM job_listings l
+                WHERE id > %s AND NOT EXISTS (SELECT 1 FROM listing_minhash m WHERE m.job_id = l.id)
+                ORDER BY id LIMIT %s
+            """, (last_id, page_size))
+            jobs = [{"id": job_id, "description": description} for job_id, description in cur.fetchall()]
+        if not jobs:
+            break
+        attach_full_descriptions(connection, jobs)
+        with connection.cursor(cursor_factory=psycopg2.extensions.cursor) as cur:
+            found += len(index.add_many(cur, [(job["id"], job["description"]) for job in jobs]))
+        connection.commit()
+        last_id = jobs[-1]["id"]
+        total += len(jobs)
+        print(f"🧬 {total} ilan indekslendi, {found} neredeyse aynı ilan bulundu")
+    return total
+
+if __name__ == "__main__":
+    # Kullanım: python analysis/near_duplicates.py index
+    from assistant import get_db_connection
+    if sys.argv[1:] != ["index"]:
+        print("Kullanım: python analysis/near_duplicates.py index")
+        sys.exit(1)
+    conn = get_db_connection()
+    if conn:
+        try:
+            ensure_near_duplicate_schema(conn)
+            index_existing(conn)
+        finally:
+            conn.close()
@@ -0,0 +1,241 @@
+import asyncio
+import random
+import sqlite3
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+class RateGovernor:
+    """Aynı makinedeki tüm analiz süreçlerinin paylaştığı istek/token bütçesi ve eşzamanlılık sınırı
+
+    - Dakikadaki istek ve token sayısı için iki token kovası (durum SQLite dosyasında tutulur)
+    - 429 yanıtındaki Retry-After süresi boyunca tüm süreçler bekletilir
+    - Eşzamanlılık AIMD ile ayarlanır: başarılı ve hızlı yanıtlarda yavaşça artar,
+      429'da yarıya iner, gecikme hedefi aşılınca hafifçe azalır
+    """
+
+    def __init__(self, path: str, requests_per_minute: float, tokens_per_minute: float,
+                 min_concurrency: int = 1, max_concurrency: int = 16, latency_target: float = 30.0,
+                 backoff_base: float = 2.0, backoff_cap: float = 60.0):
+        self.path = path
+        self.request_rate = requests_per_minute / 60.0
+        self.token_rate = tokens_per_minute / 60.0
+        self.request_capacity = max(1.0, requests_per_minute / 6.0)
+        self.token_capacity = max(1.0, tokens_per_minute / 6.0)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.latency_target = latency_target
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self.retries = 0
+        self.waited_seconds = 0.0
+        self._limit_cache = (0.0, min_concurrency)
+
+        self.db = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.execute("""
+            CREATE TABLE IF NOT EXISTS governor_state (
+                key TEXT PRIMARY KEY,
+                value REAL NOT NULL
+            )
+        """)
+        now = time.time()
+        with self._transaction() as db:
+            for key, value in (
+                ("request_level", self.request_capacity),
+                ("token_level", self.token_capacity),
+                ("refilled_at", now),
+                ("blocked_until", 0.0),
+                ("concurrency", float(max(min_concurrency, min(4, max_concurrency))))
+            ):
+                db.execute("INSERT OR IGNORE INTO governor_state (key, value) VALUES (?, ?)", (key, value))
+
+    class _Transaction:
+        def __init__(self, governor):
+            self.governor = governor
+
+        def __enter__(self):
+            self.governor.lock.acquire()
+            # IMMEDIATE: okuma-değiştirme-yazma sırasında diğer süreçler beklesin
+            self.governor.db.execute("BEGIN IMMEDIATE")
+            return self.governor.db
+
+        def __exit__(self, exc_type, exc, tb):
+            try:
+                self.governor.db.execute("ROLLBACK" if exc_type else "COMMIT")
+            finally:
+                self.governor.lock.release()
+
+    def _transaction(self):
+        return self._Transaction(self)
+
+    @staticmethod
+    def _read(db) -> Dict[str, float]:
+        return dict(db.execute("SELECT key, value FROM governor_state").fetchall())
+
+    @staticmethod
+    def _write(db, **values):
+        db.executemany("UPDATE governor_state SET value = ? WHERE key = ?",
+                       [(value, key) for key, value in values.items()])
+
+    def reserve(self, tokens: int) -> float:
+        """Bir istek ve tahmini token için bütçe ayırır; 0 dönerse istek gönderilebilir,
+        değilse beklenmesi gereken saniyeyi döndürür"""
+        tokens = min(float(tokens), self.token_capacity)
+        now = time.time()
+        with self._transaction() as db:
+            state = self._read(db)
+            if now < state["blocked_until"]:
+                return state["blocked_until"] - now
+            elapsed = max(0.0, now - state["refilled_at"])
+            request_level = min(self.request_capacity, state["request_level"] + elapsed * self.request_rate)
+            token_level = min(self.token_capacity, state["token_level"] + elapsed * self.token_rate)
+            if request_level >= 1 and token_level >= tokens:
+                self._write(db, request_level=request_level - 1, token_level=token_level - tokens, refilled_at=now)
+                return 0.0
+            self._write(db, request_level=request_level, token_level=token_level, refilled_at=now)
+            return max(
+                (1 - request_level) / self.request_rate if request_level < 1 else 0.0,
+                (tokens - token_level) / self.token_rate if token_level < tokens else 0.0
+            )
+
+    def _count_wait(self, seconds: float):
+        with self.lock:
+            self.waited_seconds += seconds
+
+    def acquire(self, tokens: int):
+        while True:
+            wait = self.reserve(tokens)
+            if wait <= 0:
+                break
+            wait += random.uniform(0, 0.25)
+            self._count_wait(wait)
+            time.sleep(wait)
+        with self.lock:
+            self.requests += 1
+
+    async def acquire_async(self, tokens: int):
+        """acquire'ın asyncio karşılığı; SQLite işlemi olay döngüsünü bloklamasın diye iş parçacığında yapılır"""
+        loop = asyncio.get_running_loop()
+        while True:
+            wait = await loop.run_in_executor(None, self.reserve, tokens)
+            if wait <= 0:
+                break
+            wait += random.uniform(0, 0.25)
+            self._count_wait(wait)
+            await asyncio.sleep(wait)
+        with self.lock:
+            self.requests += 1
+
+    def settle(self, estimated: int, actual: Optional[int]):
+        """Tahmini token ile yanıttaki gerçek kullanım arasındaki farkı kovaya yansıtır"""
+        if not actual or actual == estimated:
+            return
+        with self._transaction() as db:
+            level = self._read(db)["token_level"]
+            self._write(db, token_level=min(self.token_capacity, level - (actual - estimated)))
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+        except (TypeError, ValueError):
+            return None
+
+    def backoff(self, attempt: int) -> float:
+        """Tam jitter'lı üstel geri çekilme süresi"""
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+
+    def on_throttled(self, retry_after: Optional[float], attempt: int) -> float:
+        """429 sonrası: tüm süreçleri bekletir, eşzamanlılığı yarıya indirir; beklenecek süreyi döndürür"""
+        wait = retry_after if retry_after is not None else self.backoff(attempt)
+        with self._transaction() as db:
+            state = self._read(db)
+            self._write(
+                db,
+                blocked_until=max(state["blocked_until"], time.time() + wait),
+                concurrency=max(float(self.min_concurrency), state["concurrency"] / 2)
+            )
+        with self.lock:
+            self.throttled += 1
+            self.retries += 1
+        return wait
+
+    def on_retry(self):
+        with self.lock:
+            self.retries += 1
+
+    def on_success(self, latency: float):
+        with self._transaction() as db:
+            limit = self._read(db)["concurrency"]
+            if latency > self.latency_target:
+                limit *= 0.9
+            else:
+                limit += 1 / max(limit, 1.0)
+            self._write(db, concurrency=min(float(self.max_concurrency), max(float(self.min_concurrency), limit)))
+
+    def _limit_stale(self) -> bool:
+        return time.time() - self._limit_cache[0] > 1.0
+
+    def concurrency_limit(self) -> int:
+        """Paylaşılan AIMD sınırı (dosya okumasını azaltmak için 1 sn önbelleklenir)
+
+        Yalnızca okuma yapılır; WAL kipinde otomatik commit'li SELECT yazma kilidi almaz ve
+        diğer süreçlerin bütçe işlemlerini bekletmez.
+        """
+        checked_at, limit = self._limit_cache
+        if self._limit_stale():
+            with self.lock:
+                row = self.db.execute("SELECT value FROM governor_state WHERE key = 'concurrency'").fetchone()
+            limit = int(row[0])
+            self._limit_cache = (time.time(), limit)
+        return max(self.min_concurrency, limit)
+
+    async def concurrency_limit_async(self) -> int:
+        """Önbellek eskidiyse dosya okuması iş parçacığında yapılır"""
+        if self._limit_stale():
+            return await asyncio.get_running_loop().run_in_executor(None, self.concurrency_limit)
+        return max(self.min_concurrency, self._limit_cache[1])
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return {
+                "requests": self.requests,
+                "throttled": self.throttled,
+                "retries": self.retries,
+                "waited_seconds": round(self.waited_seconds, 1),
+                "concurrency_limit": self._limit_cache[1]
+            }
+
+class ConcurrencyGate:
+    """Uçuştaki istek sayısını yöneticinin o anki AIMD sınırında tutan asyncio kapısı"""
+
+    def __init__(self, governor: RateGovernor):
+        self.governor = governor
+        self.inflight = 0
+        self.condition = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self.condition:
+            while self.inflight >= await self.governor.concurrency_limit_async():
+                try:
+                    # Sınır artmış olabilir; bildirim gelmese de ara ara yeniden bakılır
+                    await asyncio.wait_for(self.condition.wait(), 1.0)
+                except asyncio.TimeoutError:
+                    pass
+            self.inflight += 1
+
+    async def __aexit__(self, *exc):
+        async with self.condition:
+            self.inflight -= 1
+            self.condition.notify_all()
@@ -0,0 +1,172 @@
+import json
+import threading
+from time import monotonic
+from typing import Dict, List, Tuple
+import psycopg2
+from psycopg2.extras import execute_values
+from skill_catalog import CATALOG
+
+INSERT_SQL = """
+    INSERT INTO job_analysis (
+        job_id, hard_skills, soft_skills, location,
+        sector, responsibilities, work_type, scraped_at, title_skills,
+        hard_skill_ids, soft_skill_ids
+    )
+    VALUES %s
+    ON CONFLICT (job_id) DO NOTHING
+"""
+# Boş id dizilerinin tipi belirsiz kalmasın diye açıkça integer[]'e çevrilir
+ROW_TEMPLATE = "(%s, %s, %s, %s, %s, %s, %s, %s, %s, %s::integer[], %s::integer[])"
+# Satır satır yeniden denemede kullanılan tek satırlık karşılığı
+ROW_INSERT_SQL = INSERT_SQL.replace("VALUES %s", f"VALUES {ROW_TEMPLATE}")
+
+def analysis_row(job_id: int, ai_results: Dict, scraped_at, hard_skill_ids: List[int],
+                 soft_skill_ids: List[int]) -> Tuple:
+    """AI sonucunu job_analysis satırına çevirir"""
+    return (
+        job_id,
+        json.dumps(ai_results.get("hard_skills", [])),
+        json.dumps(ai_results.get("soft_skills", [])),
+        ai_results.get("location", "Belirtilmemiş"),
+        ai_results.get("sector", "Belirtilmemiş"),
+        json.dumps(ai_results.get("responsibilities", [])),
+        ai_results.get("work_type", "Belirtilmemiş"),
+        scraped_at,
+        json.dumps(ai_results.get("title_skills", [])),
+        hard_skill_ids,
+        soft_skill_ids
+    )
+
+def analysis_rows(conn, batch: List[Tuple[int, Dict, object]]) -> List[Tuple]:
+    """(ilan, analiz, tarih) kayıtlarını becerileri kanonik id'lere çözülmüş satırlara çevirir"""
+    hard_ids = CATALOG.resolve_many(conn, "hard", [ai_results.get("hard_skills") for _, ai_results, _ in batch])
+    soft_ids = CATALOG.resolve_many(conn, "soft", [ai_results.get("soft_skills") for _, ai_results, _ in batch])
+    return [analysis_row(*entry, hard, soft) for entry, hard, soft in zip(batch, hard_ids, soft_ids)]
+
+def ensure_sink_schema(conn):
+    """Kaydedilemeyen analizlerin tutulduğu tabloyu oluşturur"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS job_analysis_dead_letter (
+                id SERIAL PRIMARY KEY,
+                job_id INTEGER,
+                payload JSONB,
+                error TEXT,
+                failed_at TIMESTAMP DEFAULT NOW()
+            );
+            CREATE INDEX IF NOT EXISTS job_analysis_dead_letter_job_id_idx
+                ON job_analysis_dead_letter (job_id);
+        """)
+    conn.commit()
+
+class AnalysisSink:
+    """Analiz sonuçlarını biriktirip çok satırlı INSERT ile toplu yazar
+
+    Tampon boyuta ya da süreye ulaşınca boşaltılır. Toplu yazım başarısız olursa satırlar
+    savepoint ile tek tek denenir; hatalı satır işlemi geri almak yerine
+    job_analysis_dead_letter tablosuna düşer. Tablo başlangıçta ensure_sink_schema ile
+    kurulur (ensure_analysis_schema çağırır); sink her oluşturulduğunda DDL çalıştırılmaz.
+    """
+
+    def __init__(self, pool, batch_size: int = 50, flush_interval: float = 5.0):
+        self.pool = pool
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.buffer: List[Tuple[int, Dict, object]] = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.last_flush = monotonic()
+        self.written = 0
+        self.dead_lettered = 0
+        self.flushes = 0
+        self.stopped = threading.Event()
+        # Yavaş akışta da sonuçlar flush_interval'dan uzun beklemesin
+        self.timer = threading.Thread(target=self._flush_periodically, daemon=True)
+        self.timer.start()
+
+    def add(self, job_id: int, ai_results: Dict, scraped_at):
+        with self.lock:
+            self.buffer.append((job_id, ai_results, scraped_at))
+            full = len(self.buffer) >= self.batch_size
+        if full:
+            self.flush()
+
+    def _flush_periodically(self):
+        while not self.stopped.wait(self.flush_interval / 2):
+            if monotonic() - self.last_flush >= self.flush_interval:
+                self.flush()
+
+    def flush(self) -> int:
+        """Tampondaki sonuçları yazar, kaydedilen satır sayısını döndürür"""
+        with self.flush_lock:
+            with self.lock:
+                batch, self.buffer = self.buffer, []
+            self.last_flush = monotonic()
+            if not batch:
+                return 0
+
+            try:
+                with self.pool.connection() as conn:
+                    saved = self._write(conn, batch)
+            except psycopg2.Error as e:
+                # Bağlantı düzeyindeki hata: satırlar kaybolmasın diye tampona geri konur
+                print(f"🔴 Analiz toplu kayıt hatası: {str(e)}")
+                with self.lock:
+                    self.buffer = batch + self.buffer
+                return 0
+
+            self.written += saved
+            self.flushes += 1
+            print(f"💾 {saved}/{len(batch)} analiz kaydedildi (toplu)")
+            return saved
+
+    def _write(self, conn, batch) -> int:
+        rows = analysis_rows(conn, batch)
+        try:
+            with conn.cursor() as cur:
+                execute_values(cur, INSERT_SQL, rows, template=ROW_TEMPLATE, page_size=len(rows))
+                # Başka bir süreç aynı ilanı kaydettiyse satır çakışmadan atlanır
+                saved = cur.rowcount
+            conn.commit()
+            return saved
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            raise
+        except psycopg2.Error as e:
+            conn.rollback()
+            print(f"⚠️ Toplu kayıt başarısız, satır satır deneniyor: {str(e)}")
+
+        saved = 0
+        with conn.cursor() as cur:
+            for (job_id, ai_results, _), row in zip(batch, rows):
+                cur.execute("SAVEPOINT analysis_row")
+                try:
+                    cur.execute(ROW_INSERT_SQL, row)
+                    saved += cur.rowcount
+                except (psycopg2.OperationalError, psycopg2.InterfaceError):
+                    raise
+                except psycopg2.Error as e:
+                    cur.execute("ROLLBACK TO SAVEPOINT analysis_row")
+                    self._dead_letter(cur, job_id, ai_results, e)
+                cur.execute("RELEASE SAVEPOINT analysis_row")
+        conn.commit()
+        return saved
+
+    def _dead_letter(self, cur, job_id: int, ai_results: Dict, error: Exception):
+        print(f"🪦 Analiz kaydedilemedi, dead-letter'a yazılıyor (Job ID: {job_id}): {str(error).strip()}")
+        cur.execute(
+            "INSERT INTO job_analysis_dead_letter (job_id, payload, error) VALUES (%s, %s, %s)",
+            (job_id, json.dumps(ai_results, ensure_ascii=False, default=str), str(error))
+        )
+        self.dead_lettered += 1
+
+    def close(self) -> int:
+        """Zamanlayıcıyı durdurur ve kalan sonuçları yazar"""
+        self.stopped.set()
+        self.timer.join()
+        return self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,165 @@
+import json
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+from psycopg2.extras import execute_values
+from description_archive import plain_cursor
+from skill_extractor import SKILL_LEXICON, SOFT_SKILL_LEXICON
+
+# Beceri türü -> kataloğu ilk açılışta dolduran sözlük
+SKILL_LEXICONS = {"hard": SKILL_LEXICON, "soft": SOFT_SKILL_LEXICON}
+
+# "Python programming", "Java dili" gibi yazımlarda atılan genel ekler
+GENERIC_SUFFIX_RE = re.compile(
+    r"\s+(programming( language)?|language|programlama( dili)?|dili|framework|development|geliştirme)$"
+)
+
+def alias_key(name: str) -> str:
+    """Beceri yazımını eşleştirme anahtarına indirger (küçük harf, tek boşluk, genel ekler atılmış)"""
+    key = re.sub(r"\s+", " ", name.replace("İ", "i").lower()).strip(" \t.,;:-")
+    return GENERIC_SUFFIX_RE.sub("", key) or key
+
+def ensure_skill_schema(conn):
+    """Kanonik beceri tablosunu, yazım eşleme tablosunu ve job_analysis'teki id dizilerini oluşturur"""
+    with plain_cursor(conn) as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS skills (
+                id SERIAL PRIMARY KEY,
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL,
+                UNIQUE (kind, name)
+            );
+            CREATE TABLE IF NOT EXISTS skill_aliases (
+                kind TEXT NOT NULL,
+                alias TEXT NOT NULL,
+                skill_id INTEGER NOT NULL REFERENCES skills(id) ON DELETE CASCADE,
+                PRIMARY KEY (kind, alias)
+            );
+            ALTER TABLE job_analysis ADD COLUMN IF NOT EXISTS hard_skill_ids INTEGER[];
+            ALTER TABLE job_analysis ADD COLUMN IF NOT EXISTS soft_skill_ids INTEGER[];
+            CREATE INDEX IF NOT EXISTS job_analysis_hard_skill_ids_idx ON job_analysis USING GIN (hard_skill_ids);
+            CREATE INDEX IF NOT EXISTS job_analysis_soft_skill_ids_idx ON job_analysis USING GIN (soft_skill_ids);
+        """)
+    conn.commit()
+
+class SkillCatalog:
+    """Beceri adlarını yazım anında kanonik beceri id'lerine çözer
+
+    Eşlemeler süreç içinde önbelleklenir; bilinmeyen bir yazım gelirse yeni kanonik
+    beceri ve eşlemesi eklenip hemen commit edilir. Böylece analiz satırının yazımı geri
+    alınsa bile önbellekteki id'ler veritabanında geçerli kalır.
+    """
+
+    def __init__(self):
+        self.ids: Dict[Tuple[str, str], int] = {}
+        self.lock = threading.Lock()
+        self.loaded = False
+
+    def load(self, conn):
+        """Tohum sözlüğünü kaydeder ve mevcut tüm eşlemeleri belleğe alır"""
+        with plain_cursor(conn) as cur:
+            for kind, lexicon in SKILL_LEXICONS.items():
+                execute_values(cur, "INSERT INTO skills (kind, name) VALUES %s ON CONFLICT DO NOTHING",
+                               [(kind, name) for name in lexicon])
+                execute_values(cur, """
+                    INSERT INTO skill_aliases (kind, alias, skill_id)
+                    SELECT v.kind, v.alias, s.id FROM (VALUES %s) AS v (kind, alias, name)
+                    JOIN skills s ON s.kind = v.kind AND s.name = v.name
+                    ON CONFLICT DO NOTHING
+                """, [
+                    (kind, alias_key(spelling), name)
+                    for name, spellings in lexicon.items()
+                    for spelling in dict.fromkeys([name, *spellings])
+                ])
+            conn.commit()
+            cur.execute("SELECT kind, alias, skill_id FROM skill_aliases")
+            rows = cur.fetchall()
+        with self.lock:
+            self.ids.update({(row[0], row[1]): row[2] for row in rows})
+            self.loaded = True
+
+    def _create(self, conn, kind: str, names: Dict[str, str]) -> Dict[str, int]:
+        """Bilinmeyen yazımları kanonik beceri olarak ekler; eşzamanlı süreçler aynı id'yi alır"""
+        with plain_cursor(conn) as cur:
+            created = dict(execute_values(cur, """
+                INSERT INTO skills (kind, name) VALUES %s
+                ON CONFLICT (kind, name) DO UPDATE SET name = EXCLUDED.name
+                RETURNING name, id
+            """, [(kind, name) for name in dict.fromkeys(names.values())], fetch=True))
+            execute_values(cur, """
+                INSERT INTO skill_aliases (kind, alias, skill_id) VALUES %s
+                ON CONFLICT DO NOTHING
+            """, [(kind, key, created[name]) for key, name in names.items()])
+            # Başka bir süreç aynı yazımı farklı bir beceriye bağlamış olabilir; kayıtlı eşleme geçerlidir
+            cur.execute("SELECT alias, skill_id FROM skill_aliases WHERE kind = %s AND alias = ANY(%s)",
+                        (kind, list(names)))
+            resolved = dict(cur.fetchall())
+        conn.commit()
+        return resolved
+
+    def resolve_many(self, conn, kind: str, skill_lists: Iterable[Optional[Iterable[str]]]) -> List[List[int]]:
+        """Her beceri listesini tekrarsız, sırası korunmuş id listesine çevirir"""
+        if not self.loaded:
+            self.load(conn)
+        # Tek metin olarak gelen değer harf harf beceriye dönüşmesin
+        skill_lists = [
+            [skill for skill in skill_list(skills) if isinstance(skill, str) and skill.strip()]
+            for skills in skill_lists
+        ]
+        with self.lock:
+            unknown = {
+                alias_key(skill): skill.strip()
+                for skills in skill_lists for skill in skills
+                if (kind, alias_key(skill)) not in self.ids
+            }
+        if unknown:
+            created = self._create(conn, kind, unknown)
+            with self.lock:
+                self.ids.update({(kind, key): skill_id for key, skill_id in created.items()})
+        with self.lock:
+            return [list(dict.fromkeys(self.ids[(kind, alias_key(skill))] for skill in skills))
+                    for skills in skill_lists]
+
+    def resolve(self, conn, kind: str, skills: Optional[Iterable[str]]) -> List[int]:
+        return self.resolve_many(conn, kind, [skills])[0]
+
+CATALOG = SkillCatalog()
+
+def backfill_skill_ids(conn, page_size: int = 1000) -> int:
+    """id dizisi olmayan eski analizlerin metin becerilerini kanonik id'lere çevirir"""
+    total, last_id = 0, 0
+    while True:
+        with plain_cursor(conn) as cur:
+            cur.execute("""
+                SELECT job_id, hard_skills::text, soft_skills::text FROM job_analysis
+                WHERE job_id > %s AND (hard_skill_ids IS NULL OR soft_skill_ids IS NULL)
+                ORDER BY job_id LIMIT %s
+            """, (last_id, page_size))
+            rows = cur.fetchall()
+        if not rows:
+            break
+        parsed = [[skill_list(hard), skill_list(soft)] for _, hard, soft in rows]
+        hard_ids = CATALOG.resolve_many(conn, "hard", [hard for hard, _ in parsed])
+        soft_ids = CATALOG.resolve_many(conn, "soft", [soft for _, soft in parsed])
+        with plain_cursor(conn) as cur:
+            execute_values(cur, """
+                UPDATE job_analysis a SET hard_skill_ids = v.hard_ids, soft_skill_ids = v.soft_ids
+                FROM (VALUES %s) AS v (job_id, hard_ids, soft_ids)
+                WHERE a.job_id = v.job_id
+            """, [(row[0], hard, soft) for row, hard, soft in zip(rows, hard_ids, soft_ids)],
+                template="(%s, %s::integer[], %s::integer[])", page_size=len(rows))
+        conn.commit()
+        last_id = rows[-1][0]
+        total += len(rows)
+        print(f"🔢 {total} analizin becerileri kanonik id'lere çevrildi")
+    return total
+
+def skill_list(value) -> List[str]:
+    """job_analysis'teki JSON beceri alanını listeye çevirir (tek değer ve bozuk veri tolere edilir)"""
+    try:
+        value = json.loads(value) if isinstance(value, str) else value
+    except ValueError:
+        return [value]
+    if value is None:
+        return []
+    return [str(item) for item in value] if isinstance(value, list) else [str(value)]
@@ -0,0 +1,288 @@
+import re
+import sys
+import json
+from time import perf_counter
+from typing import Dict, Iterable, List, Optional
+
+# Kanonik beceri adı -> metinde geçebilecek yazımları (küçük harf). Yalnızca listedeki yazımlar
+# aranır; "go", "rest", "node" gibi sıradan kelimelerle karışan yazımlar bilerek eklenmemiştir.
+SKILL_LEXICON = {
+    "Python": ["python", "python3"],
+    "Java": ["java"],
+    "JavaScript": ["javascript", "js", "ecmascript", "es6"],
+    "TypeScript": ["typescript"],
+    "C": ["c programming", "ansi c"],
+    "C++": ["c++", "cpp"],
+    "C#": ["c#", "csharp", "c sharp"],
+    "Go": ["golang"],
+    "Rust": ["rust"],
+    "Kotlin": ["kotlin"],
+    "Swift": ["swift"],
+    "PHP": ["php"],
+    "Ruby": ["ruby"],
+    "Scala": ["scala"],
+    "SQL": ["sql", "t-sql", "pl/sql", "tsql"],
+    "PostgreSQL": ["postgresql", "postgres", "psql"],
+    "MySQL": ["mysql", "mariadb"],
+    "MongoDB": ["mongodb", "mongo"],
+    "Redis": ["redis"],
+    "Elasticsearch": ["elasticsearch", "elastic search", "opensearch"],
+    "Oracle": ["oracle db", "oracle database"],
+    "Django": ["django"],
+    "Flask": ["flask"],
+    "FastAPI": ["fastapi"],
+    "Spring": ["spring boot", "springboot", "spring framework"],
+    ".NET": [".net", "dotnet", ".net core", "asp.net"],
+    "Node.js": ["node.js", "nodejs"],
+    "React": ["react", "react.js", "reactjs"],
+    "Angular": ["angular", "angularjs"],
+    "Vue.js": ["vue", "vue.js", "vuejs"],
+    "HTML": ["html", "html5"],
+    "CSS": ["css", "css3", "sass", "scss"],
+    "REST": ["restful", "rest api", "rest apis"],
+    "GraphQL": ["graphql"],
+    "gRPC": ["grpc"],
+    "Microservices": ["microservices", "microservice", "mikroservis"],
+    "AWS": ["aws", "amazon web services"],
+    "Azure": ["azure", "microsoft azure"],
+    "GCP": ["gcp", "google cloud", "google cloud platform"],
+    "Docker": ["docker"],
+    "Kubernetes": ["kubernetes", "k8s"],
+    "Terraform": ["terraform"],
+    "Ansible": ["ansible"],
+    "Jenkins": ["jenkins"],
+    "CI/CD": ["ci/cd", "cicd", "continuous integration", "continuous delivery", "continuous deployment"],
+    "Git": ["git", "github", "gitlab", "bitbucket"],
+    "Linux": ["linux", "unix"],
+    "Kafka": ["kafka", "apache kafka"],
+    "RabbitMQ": ["rabbitmq"],
+    "Spark": ["spark", "apache spark", "pyspark"],
+    "Hadoop": ["hadoop"],
+    "Airflow": ["airflow", "apache airflow"],
+    "Pandas": ["pandas"],
+    "NumPy": ["numpy"],
+    "scikit-learn": ["scikit-learn", "sklearn", "scikit learn"],
+    "TensorFlow": ["tensorflow"],
+    "PyTorch": ["pytorch"],
+    "Machine Learning": ["machine learning", "makine öğrenmesi", "makine öğrenimi", "ml"],
+    "Deep Learning": ["deep learning", "derin öğrenme"],
+    "NLP": ["nlp", "natural language processing", "doğal dil işleme"],
+    "Computer Vision": ["computer vision", "görüntü işleme"],
+    "LLM": ["llm", "llms", "large language models", "generative ai", "genai"],
+    "Power BI": ["power bi", "powerbi"],
+    "Tableau": ["tableau"],
+    "Excel": ["excel", "ms excel", "microsoft excel"],
+    "SAP": ["sap"],
+    "Selenium": ["selenium"],
+    "Jira": ["jira"],
+    "Agile": ["agile", "çevik"],
+    "Scrum": ["scrum"],
+    "Figma": ["figma"],
+    "Android": ["android"],
+    "iOS": ["ios"],
+    "Flutter": ["flutter"],
+    "React Native": ["react native"],
+    "Unity": ["unity3d", "unity engine"],
+    "OOP": ["oop", "object oriented", "object-oriented", "nesne yönelimli"],
+    "Data Structures": ["data structures", "veri yapıları"],
+    "Unit Testing": ["unit testing", "unit test", "unit tests", "birim test"],
+}
+
+SOFT_SKILL_LEXICON = {
+    "İletişim": ["communication", "iletişim"],
+    "Takım çalışması": ["teamwork", "team player", "takım çalışması", "ekip çalışması"],
+    "Problem çözme": ["problem solving", "problem-solving", "problem çözme"],
+    "Analitik düşünme": ["analytical", "analitik"],
+    "Liderlik": ["leadership", "liderlik"],
+    "Zaman yönetimi": ["time management", "zaman yönetimi"],
+    "Uyum sağlama": ["adaptability", "flexible", "uyum"],
+    "Sorumluluk": ["ownership", "sorumluluk sahibi"],
+    "Öğrenmeye açıklık": ["eager to learn", "willingness to learn", "öğrenmeye açık"],
+    "Detay odaklılık": ["attention to detail", "detail-oriented", "detail oriented", "detay odaklı"],
+}
+
+# Sıradan kelime ya da birim olarak da geçen yazımlar ("excel in a team", "react quickly",
+# "swift delivery", "10 ml", "flexible hours", "mevzuata uyum"). Ön geçiş bunlarla LLM'in
+# bulmadığı beceri eklemez, yalnızca LLM'in döndürdüğü adları kanonikleştirir. Yerel ve
+# fallback kipleri ile backfill tam sözlüğü kullanır.
+AMBIGUOUS_SYNONYMS = {
+    "excel", "react", "swift", "ml", "rust", "spark", "flask", "ruby", "scala", "sap",
+    "agile", "selenium", "airflow", "jenkins", "flexible", "uyum",
+}
+
+WORK_TYPES = {"remote": "remote", "uzaktan": "remote", "hybrid": "hybrid", "hibrit": "hybrid",
+              "on-site": "on-site", "ofis": "on-site", "yerinde": "on-site"}
+
+def trie_pattern(words: Iterable[str]) -> str:
+    """Kelimeleri ortak önekleri paylaşan bir trie'ye dizip tek bir regex'e derler
+
+    Düz alternasyon yerine trie biçimi, regex motorunun her konumda yalnızca olası
+    dalları denemesini sağlar; yüzlerce kalıpta bile eşleştirme doğrusal kalır.
+    """
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def build(node) -> str:
+        if list(node) == [""]:
+            return ""
+        ending = "" in node
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if ending else body
+
+    return build(trie)
+
+class SkillExtractor:
+    """Sözlükteki becerileri metinde tek geçişte bulan derlenmiş eşleştirici"""
+
+    def __init__(self, lexicon: Dict[str, List[str]], exclude: Iterable[str] = ()):
+        self.canonical = {}
+        for name, synonyms in lexicon.items():
+            for synonym in synonyms:
+                self.canonical.setdefault(synonym.lower(), name)
+        # LLM çıktısını kanonikleştirirken kanonik adların kendisi de tanınır
+        self.aliases = {**{name.lower(): name for name in lexicon}, **self.canonical}
+        # exclude'daki yazımlar metinde aranmaz ama normalize'da tanınmaya devam eder
+        searched = [synonym for synonym in self.canonical if synonym not in set(exclude)]
+        # Kelime sınırı: önünde/arkasında harf-rakam (ve C++, C#, .NET için +, #) olmamalı
+        self.pattern = re.compile(
+            r"(?<![\w.+#])(" + trie_pattern(searched) + r")(?![\w+#]|\.\w)",
+            re.IGNORECASE
+        )
+
+    def extract(self, text: Optional[str]) -> List[str]:
+        """Metinde geçen becerilerin kanonik adlarını ilk görülme sırasıyla döndürür"""
+        found = {}
+        for match in self.pattern.finditer(text or ""):
+            name = self.canonical.get(match.group(1).lower())
+            if name:
+                found.setdefault(name, None)
+        return list(found)
+
+    def normalize(self, skills: Iterable[str]) -> List[str]:
+        """LLM'in döndürdüğü beceri adlarını sözlükteki kanonik ada çevirir (bilinmeyenler korunur)"""
+        normalized = {}
+        for skill in skills:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            key = skill.strip()
+            normalized.setdefault(self.aliases.get(key.lower(), key), None)
+        return list(normalized)
+
+HARD_SKILLS = SkillExtractor(SKILL_LEXICON)
+SOFT_SKILLS = SkillExtractor(SOFT_SKILL_LEXICON)
+# Ön geçişte LLM'e eklenecek, bağlamdan bağımsız olarak kesin beceri olan eşleşmeler
+PREPASS_HARD_SKILLS = SkillExtractor(SKILL_LEXICON, exclude=AMBIGUOUS_SYNONYMS)
+PREPASS_SOFT_SKILLS = SkillExtractor(SOFT_SKILL_LEXICON, exclude=AMBIGUOUS_SYNONYMS)
+
+def skill_names(value) -> List[str]:
+    """Beceri alanını listeye çevirir; model bazen "Python, Django" gibi tek metin döndürür"""
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in value.split(",") if part.strip()]
+    return list(value) if isinstance(value, list) else [value]
+
+def merge_skills(llm_skills: Iterable[str], local_skills: Iterable[str]) -> List[str]:
+    """LLM becerilerini kanonikleştirir ve metinde kesin geçen ama LLM'in atladığı becerileri ekler"""
+    return HARD_SKILLS.normalize([*skill_names(llm_skills), *local_skills])
+
+def refine_analysis(job: Dict, analysis: Dict) -> Dict:
+    """Ön geçiş: LLM analizindeki becerileri kanonikleştirir ve belirsiz olmayan yerel eşleşmelerle tamamlar"""
+    text = f"{job.get('title', '')}\n{job.get('description', '')}"
+    # Aynı yanıt birden fazla ilana dağıtılabildiği için kopya üzerinde çalışılır
+    analysis = dict(analysis)
+    analysis["hard_skills"] = merge_skills(analysis.get("hard_skills"), PREPASS_HARD_SKILLS.extract(text))
+    analysis["soft_skills"] = SOFT_SKILLS.normalize(
+        [*skill_names(analysis.get("soft_skills")), *PREPASS_SOFT_SKILLS.extract(text)]
+    )
+    return analysis
+
+def listing_work_type(job: Dict) -> Optional[str]:
+    """İlanın remote_type alanından çalışma tipi; tanınmıyorsa None"""
+    remote = (job.get("remote_type") or "").lower()
+    return next((value for key, value in WORK_TYPES.items() if key in remote), None)
+
+def local_analysis(job: Dict) -> Dict:
+    """API'ye gitmeden, yalnızca sözlükle üretilen job_analysis kaydı"""
+    text = f"{job.get('title', '')}\n{job.get('description', '')}"
+    return {
+        "hard_skills": HARD_SKILLS.extract(text),
+        "soft_skills": SOFT_SKILLS.extract(text),
+        "location": job.get("location") or "Belirtilmemiş",
+        "sector": job.get("sector") or "Belirtilmemiş",
+        "responsibilities": [],
+        # Şema "belirtilmemiş" kabul etmediği için tip yoksa en yaygın olan on-site varsayılır
+        "work_type": listing_work_type(job) or "on-site",
+        "title_skills": [job["title"]] if job.get("title") else []
+    }
+
+def ensure_local_skills_schema(conn):
+    """Çevrim dışı doldurmanın sonuçlarını job_analysis'ten ayrı tutan tablo"""
+    with conn.cursor() as cur:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS job_listing_skills (
+                job_id INTEGER PRIMARY KEY REFERENCES job_listings(id) ON DELETE CASCADE,
+                hard_skills JSONB NOT NULL,
+                soft_skills JSONB NOT NULL,
+                extracted_at TIMESTAMP DEFAULT NOW()
+            )
+        """)
+    conn.commit()
+
+def backfill(conn, page_size: int = 1000) -> int:
+    """Tüm job_listings üzerinde sözlük eşleştirmesini çalıştırıp job_listing_skills'e yazar
+
+    job_analysis'e dokunmaz; LLM analizi bekleyen ilanlar yine analiz kuyruğunda kalır.
+    """
+    from psycopg2.extras import execute_values
+    from description_archive import attach_full_descriptions
+
+    ensure_local_skills_schema(conn)
+    last_id, total, started = 0, 0, perf_counter()
+    while True:
+        with conn.cursor() as cur:
+            cur.execute("""
+                SELECT id, title, description FROM job_listings
+                WHERE id > %s ORDER BY id LIMIT %s
+            """, (last_id, page_size))
+            jobs = attach_full_descriptions(conn, [dict(row) for row in cur.fetchall()])
+        if not jobs:
+            break
+        rows = []
+        for job in jobs:
+            text = f"{job['title']}\n{job['description']}"
+            rows.append((job['id'], json.dumps(HARD_SKILLS.extract(text)), json.dumps(SOFT_SKILLS.extract(text))))
+        with conn.cursor() as cur:
+            execute_values(cur, """
+                INSERT INTO job_listing_skills (job_id, hard_skills, soft_skills) VALUES %s
+                ON CONFLICT (job_id) DO UPDATE
+                SET hard_skills = EXCLUDED.hard_skills, soft_skills = EXCLUDED.soft_skills, extracted_at = NOW()
+            """, rows, page_size=len(rows))
+        conn.commit()
+        last_id = jobs[-1]['id']
+        total += len(jobs)
+        print(f"🧩 {total} ilan işlendi ({total / (perf_counter() - started):.0f} ilan/sn)")
+    return total
+
+if __name__ == "__main__":
+    # Kullanım: python analysis/skill_extractor.py backfill | python analysis/skill_extractor.py dosya.txt ...
+    if sys.argv[1:] == ["backfill"]:
+        from assistant import get_db_connection
+        conn = get_db_connection()
+        if conn:
+            try:
+                print(f"✅ {backfill(conn)} ilan için beceriler çıkarıldı")
+            finally:
+                conn.close()
+    else:
+        for path in sys.argv[1:]:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+            start = perf_counter()
+            skills = HARD_SKILLS.extract(text)
+            print(f"📄 {path} ({(perf_counter() - start) * 1000:.2f} ms): {', '.join(skills) or '-'}")
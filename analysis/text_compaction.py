@@ -0,0 +1,176 @@
+import re
+import threading
+from typing import Dict, List, Tuple
+
+try:
+    import tiktoken
+    # Modelin kendi tokenizer'ı yayınlanmadığı için cl100k_base yakın bir tahmin olarak kullanılır
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+# Bulunduğu cümle atılan kalıp metinler (eşit fırsat, gizlilik, başvuru çağrıları vb.)
+BOILERPLATE_PATTERNS = [
+    r"equal (employment )?opportunity", r"eşit (istihdam|fırsat)", r"without regard to",
+    r"race, colou?r, religion", r"veteran status", r"reasonable accommodation",
+    r"privacy (policy|notice)", r"kişisel veriler", r"kvkk",
+    r"apply (now|today)", r"hemen başvur", r"başvurunuzu bekliyoruz",
+    r"follow us on", r"bizi takip edin"
+]
+BOILERPLATE_RE = re.compile("|".join(BOILERPLATE_PATTERNS), re.IGNORECASE)
+
+# Başlık satırı -> bölüm önceliği (küçük olan önce bütçeye alınır)
+SECTION_PATTERNS = [
+    (0, r"requirement|qualification|must have|what you.?ll need|what we.?re looking for|skills|"
+        r"aranan nitelik|gereksinim|nitelikler|yetkinlik|beklentiler"),
+    (0, r"responsibilit|what you.?ll do|your role|the role|duties|"
+        r"sorumluluk|iş tanımı|görev"),
+    (1, r"nice to have|preferred|bonus|tercih sebebi|artı"),
+    (3, r"benefit|perks|what we offer|why join|about (us|the company)|who we are|"
+        r"yan haklar|neler sunuyoruz|hakkımızda|biz kimiz")
+]
+SECTION_RES = [(priority, re.compile(pattern, re.IGNORECASE)) for priority, pattern in SECTION_PATTERNS]
+DEFAULT_PRIORITY = 2
+
+def count_tokens(text: str) -> int:
+    """tiktoken varsa gerçek token sayısı, yoksa karakter tabanlı tahmin"""
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return len(text) // 4 + 1
+
+def truncate_tokens(text: str, budget: int) -> str:
+    if _ENCODING is not None:
+        return _ENCODING.decode(_ENCODING.encode(text, disallowed_special=())[:budget])
+    return text[:budget * 4]
+
+class CompactionStats:
+    """Sıkıştırmada kazanılan token sayılarını süreç boyunca toplar"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.descriptions = 0
+        self.original_tokens = 0
+        self.compacted_tokens = 0
+        self.dropped_paragraphs = 0
+        self.duplicate_sentences = 0
+
+    def record(self, original: int, compacted: int, dropped: int, duplicates: int):
+        with self.lock:
+            self.descriptions += 1
+            self.original_tokens += original
+            self.compacted_tokens += compacted
+            self.dropped_paragraphs += dropped
+            self.duplicate_sentences += duplicates
+
+    def summary(self) -> Dict:
+        with self.lock:
+            saved = self.original_tokens - self.compacted_tokens
+            return {
+                "descriptions": self.descriptions,
+                "original_tokens": self.original_tokens,
+                "compacted_tokens": self.compacted_tokens,
+                "saved_tokens": saved,
+                "saved_ratio": round(saved / self.original_tokens, 3) if self.original_tokens else 0.0,
+                "dropped_paragraphs": self.dropped_paragraphs,
+                "duplicate_sentences": self.duplicate_sentences,
+                "tokenizer": "tiktoken" if _ENCODING is not None else "heuristic"
+            }
+
+STATS = CompactionStats()
+
+def section_priority(line: str):
+    """Satır bir bölüm başlığıysa önceliğini, değilse None döndürür"""
+    if len(line) > 60:
+        return None
+    for priority, pattern in SECTION_RES:
+        if pattern.search(line):
+            return priority
+    return None
+
+def split_paragraphs(text: str) -> List[Tuple[int, str]]:
+    """Metni (öncelik, paragraf) listesine böler; öncelik son görülen başlıktan gelir
+
+    Başlık satırları -1 öncelikle döner; bölümlerinden paragraf seçilmezse atılırlar.
+    """
+    paragraphs = []
+    priority = DEFAULT_PRIORITY
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        heading = section_priority(line)
+        if heading is not None:
+            priority = heading
+            paragraphs.append((-1, line))
+        else:
+            paragraphs.append((priority, line))
+    return paragraphs
+
+def clean_sentences(paragraph: str, seen: set) -> Tuple[str, int, int]:
+    """Paragraftan kalıp cümleleri ve daha önce görülen cümleleri atar
+
+    (kalan metin, tekrar cümle sayısı, kalıp cümle sayısı) döndürür.
+    """
+    sentences = re.split(r"(?<=[.!?])\s+", paragraph)
+    kept, duplicates, boilerplate = [], 0, 0
+    for sentence in sentences:
+        if BOILERPLATE_RE.search(sentence):
+            boilerplate += 1
+            continue
+        key = re.sub(r"\W+", " ", sentence.lower()).strip()
+        if key and key in seen:
+            duplicates += 1
+            continue
+        seen.add(key)
+        kept.append(sentence)
+    return " ".join(kept), duplicates, boilerplate
+
+def compact_description(text: str, token_budget: int) -> str:
+    """Açıklamadan kalıp cümleleri ve tekrar eden cümleleri atar, gereksinim ve sorumluluk
+    bölümlerini öne alarak metni token bütçesine sığdırır (paragraf sırası korunur)
+
+    Bütçeye sığmayan ilk (en öncelikli) paragraf kalan bütçe kadar kırpılarak alınır. Sonuç
+    boş ya da bütçenin çok altında kalırsa metnin başı bütçe kadar kırpılarak kullanılır.
+    """
+    text = text or ""
+    original_tokens = count_tokens(text)
+    seen = set()
+    candidates = []
+    dropped = duplicates = 0
+    for index, (priority, paragraph) in enumerate(split_paragraphs(text)):
+        paragraph, removed, boilerplate = clean_sentences(paragraph, seen)
+        duplicates += removed
+        if paragraph:
+            candidates.append((priority, index, paragraph, count_tokens(paragraph) + 1))
+        elif boilerplate:
+            dropped += 1
+
+    chosen, used, truncated = [], 0, False
+    for priority, index, paragraph, tokens in sorted(candidates):
+        if used + tokens <= token_budget:
+            chosen.append((index, paragraph))
+            used += tokens
+        elif used < token_budget and not truncated:
+            # Sığmayan en öncelikli paragraf kalan bütçe kadarıyla alınır
+            chosen.append((index, truncate_tokens(paragraph, token_budget - used)))
+            used, truncated = token_budget, True
+        else:
+            dropped += 1
+
+    # İçeriği seçilmeyen bölüm başlıkları atılır
+    chosen.sort()
+    headings = {index for priority, index, _, _ in candidates if priority == -1}
+    kept = [
+        paragraph for position, (index, paragraph) in enumerate(chosen)
+        if index not in headings
+        or (position + 1 < len(chosen) and chosen[position + 1][0] not in headings)
+    ]
+    compacted = "\n".join(kept)
+    compacted_tokens = count_tokens(compacted)
+    available = sum(tokens for _, _, _, tokens in candidates)
+    if text.strip() and (not compacted or compacted_tokens < min(available, token_budget) // 4):
+        # Seçim neredeyse her şeyi attıysa ayıklanmamış metin bütçe kadar kullanılır
+        compacted = truncate_tokens(text.strip(), token_budget)
+        compacted_tokens = count_tokens(compacted)
+    STATS.record(original_tokens, compacted_tokens, dropped, duplicates)
+    return compacted
@@ -0,0 +1,129 @@
+import re
+import sys
+import json
+from time import perf_counter
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+
+# Detay panelinin tamamını tek seferde almak için kullanılan JS
+PANE_SNAPSHOT_SCRIPT = """
+const pane = document.querySelector('.jobs-search__job-details--wrapper')
+    || document.querySelector('.scaffold-layout__detail')
+    || document.body;
+return pane.outerHTML;
+"""
+
+# Alan -> sırasıyla denenecek CSS seçicileri (LinkedIn DOM'u değişince sadece burası güncellenir)
+SELECTORS = {
+    "title": [
+        ".job-details-jobs-unified-top-card__job-title",
+        ".jobs-unified-top-card__job-title",
+        "h1"
+    ],
+    "description": [".jobs-description__container"],
+    "company_name": [
+        ".jobs-unified-top-card__company-name",
+        ".job-details-jobs-unified-top-card__company-name",
+        ".artdeco-entity-lockup__subtitle"
+    ],
+    "location": ["div.job-details-jobs-unified-top-card__tertiary-description-container span"],
+    "insights": ["li.job-details-jobs-unified-top-card__job-insight"],
+    "sector": ["div.t-14.mt5"]
+}
+
+# Alan bulunamadığında kaydedilecek varsayılan değerler
+DEFAULTS = {
+    "title": "",
+    "description": "",
+    "company_name": "Şirket bilgisi bulunamadı",
+    "location": "Konum bilgisi bulunamadı",
+    "remote_type": "Bilinmiyor",
+    "sector": "Sektör bilgisi bulunamadı"
+}
+
+REMOTE_KEYWORDS = ["remote", "uzaktan", "hibrit", "hybrid", "ofis", "on-site"]
+
+# Bitişinde satır sonu eklenen blok etiketleri; satır içi etiketler (strong, a, span...) metni bölmez
+BLOCK_TAGS = {
+    "p", "div", "li", "ul", "ol", "section", "article", "header", "footer", "table", "tr",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "dd", "dt"
+}
+
+def _collect_text(node, parts):
+    for child in node.iter(include_text=True):
+        if child.tag == "-text":
+            # innerText gibi: kaynak HTML'deki satır sonu ve girintiler tek boşluk sayılır
+            parts.append(re.sub(r"\s+", " ", child.text(deep=False)))
+        elif child.tag == "br":
+            parts.append("\n")
+        elif child.tag in BLOCK_TAGS:
+            parts.append("\n")
+            _collect_text(child, parts)
+            parts.append("\n")
+        elif child.tag not in ("script", "style"):
+            _collect_text(child, parts)
+
+def node_text(node):
+    """ Düğümün görünen metni; satır sonları yalnızca blok sınırlarında ve <br>'de """
+    parts = []
+    _collect_text(node, parts)
+    lines = (line.strip() for line in "".join(parts).split("\n"))
+    return "\n".join(line for line in lines if line)
+
+def first_text(tree, field):
+    """ Alanın seçicilerini sırayla dener, ilk boş olmayan metni döndürür """
+    for selector in SELECTORS[field]:
+        node = tree.css_first(selector)
+        if node is not None:
+            text = node_text(node)
+            if text:
+                return text
+    return None
+
+def all_texts(tree, field):
+    for selector in SELECTORS[field]:
+        texts = [node_text(node) for node in tree.css(selector)]
+        texts = [text for text in texts if text]
+        if texts:
+            return texts
+    return []
+
+def parse_job_pane(html):
+    """ Detay paneli HTML'inden ham alanları çıkarır, bulunamayan alan None olur """
+    tree = HTMLParser(html)
+
+    location_raw = first_text(tree, "location")
+    sector_raw = first_text(tree, "sector")
+    insights = all_texts(tree, "insights")
+
+    return {
+        "title": first_text(tree, "title"),
+        "description": first_text(tree, "description"),
+        "company_name": first_text(tree, "company_name"),
+        "location": location_raw.split(' · ')[0] if location_raw else None,
+        "remote_type": next(
+            (text for text in insights if any(word in text.lower() for word in REMOTE_KEYWORDS)),
+            None
+        ),
+        "sector": (re.sub(r'\d+[\+]*.*$', '', sector_raw).strip() or None) if sector_raw else None
+    }
+
+def build_job_data(fields, card_title=None):
+    """ Ham alanlara varsayılanları uygular; başlık panelde yoksa kart başlığı kullanılır """
+    job_data = {field: value if value else DEFAULTS[field] for field, value in fields.items()}
+    if not fields.get("title") and card_title:
+        job_data["title"] = card_title
+    return job_data
+
+def missing_fields(fields):
+    return [field for field, value in fields.items() if not value]
+
+# Kaydedilmiş HTML dosyaları üzerinde tarayıcısız çıkarma ve süre ölçümü
+if __name__ == "__main__":
+    for path in sys.argv[1:]:
+        with open(path, encoding="utf-8") as f:
+            html = f.read()
+        start = perf_counter()
+        fields = parse_job_pane(html)
+        elapsed_ms = (perf_counter() - start) * 1000
+        print(f"📄 {path} ({elapsed_ms:.2f} ms) eksik alanlar: {missing_fields(fields) or '-'}")
+        print(json.dumps(build_job_data(fields), ensure_ascii=False, indent=2))
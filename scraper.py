@@ -1,20 +1,34 @@
 from datetime import datetime
 import os
 import re
+import hashlib
 import warnings
 import json
 import logging
-from time import sleep
+import argparse
+import queue
+import threading
+from time import monotonic
+import multiprocessing
+import multiprocessing.util
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlencode
 from selenium import webdriver
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.by import By
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.action_chains import ActionChains
+from selenium.common.exceptions import TimeoutException
 from webdriver_manager.chrome import ChromeDriverManager
 from dotenv import load_dotenv
 import psycopg2
+from psycopg2.extras import execute_values
+from scraper_waits import WAITS, list_settled, job_details_loaded
+from job_extractor import PANE_SNAPSHOT_SCRIPT, parse_job_pane, build_job_data, missing_fields
+from scraper_metrics import METRICS
+from analysis.description_archive import DescriptionArchive, ensure_archive_schema, PREVIEW_LENGTH
+from analysis.near_duplicates import NearDuplicateIndex, ensure_near_duplicate_schema
 
 warnings.filterwarnings("ignore")
 load_dotenv()
@@ -26,6 +40,54 @@ DB_NAME = os.getenv("DB_NAME")
 DB_USER = os.getenv("DB_USER")
 DB_PASSWORD = os.getenv("DB_PASSWORD")
 
+# Toplu yazma ayarı: kaç ilan biriktiğinde veritabanına yazılacağı
+BATCH_SIZE = int(os.getenv("SCRAPER_BATCH_SIZE", "50"))
+
+# İlan alanlarının çıkarılma yöntemi: "snapshot" (tek HTML alımı) veya "live" (alan başına WebDriver çağrısı)
+EXTRACTION_MODE = os.getenv("SCRAPER_EXTRACTION_MODE", "snapshot")
+
+# Snapshot modunda detay panelinin ham HTML'i de sıkıştırılmış arşive yazılsın mı
+ARCHIVE_HTML = os.getenv("SCRAPER_ARCHIVE_HTML", "0") == "1"
+
+# Paralel çalışmada her tarayıcı işçisinin ayrı profil klasörünün açılacağı dizin
+PROFILE_ROOT = os.getenv("SCRAPER_PROFILE_ROOT", "chrome_profiles")
+DEFAULT_PROFILE = r"C:\Users\Emrey\AppData\Local\Google\Chrome\User Data\Default"
+
+# LinkedIn arama sonuçlarında sayfa başına ilan sayısı
+RESULTS_PER_PAGE = 25
+
+# Alt süreçte çalışan tarayıcı işçisinin numarası (profil klasörü için)
+WORKER_SLOT = None
+
+# Alt süreçte shard'lar arasında yeniden kullanılan tarayıcı
+WORKER_BROWSER = None
+
+# Tarayıcı profili: başsız mod ve kaç sayfadan sonra tarayıcının yenileneceği
+HEADLESS = os.getenv("SCRAPER_HEADLESS", "1") == "1"
+RECYCLE_AFTER_PAGES = int(os.getenv("SCRAPER_RECYCLE_AFTER_PAGES", "20"))
+
+# CDP ile engellenen istekler: görseller, medya, fontlar ve izleyiciler
+BLOCKED_URL_PATTERNS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+    "*.mp4", "*.webm", "*.mp3",
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    "*media.licdn.com*",
+    "*doubleclick.net*", "*google-analytics.com*", "*googletagmanager.com*",
+    "*px.ads.linkedin.com*", "*snap.licdn.com*"
+]
+
+# Tarayıcı ile veritabanı arasındaki kuyrukların kapasitesi (dolunca tarayıcı bekler)
+PIPELINE_QUEUE_SIZE = int(os.getenv("SCRAPER_PIPELINE_QUEUE_SIZE", "200"))
+
+# Kaldığı yerden devam için ilerleme dosyası
+STATE_FILE = os.getenv("SCRAPER_STATE_FILE", "scrape_state.json")
+
+# Artımlı modda art arda kaç kayıtlı ilan görülünce sayfalamanın durdurulacağı
+STOP_AFTER_KNOWN = int(os.getenv("SCRAPER_STOP_AFTER_KNOWN", "10"))
+
+# Bu süreçte çözülmüş chromedriver yolu (her başlatmada yeniden indirme/kontrol yapılmaz)
+_chromedriver_path = None
+
 # Log dosyasını başlat
 logging.basicConfig(filename='job_scraping.log', level=logging.INFO)
 
@@ -46,37 +108,106 @@ def connect_db():
         logging.error(f"Veritabanına bağlanırken hata oluştu: {e}")
         return None
 
-# Veritabanına iş ilanı ekleme fonksiyonu
-# Veritabanına iş ilanı ekleme fonksiyonu (GÜNCELLENMİŞ)
-def insert_job_to_db(job_data, cursor, connection):
-    try:
-        # Veri uzunluk kontrolü
-        processed_data = {
-            'title': job_data.get('title', '')[:255],
-            'description': job_data.get('description', '')[:2000],
-            'company_name': job_data.get('company_name', '')[:255],
-            'location': job_data.get('location', '')[:255],
-            'sector': job_data.get('sector', '')[:255],
-            'remote_type': job_data.get('remote_type', '')[:100]
-        }
+# Tekrar eden ilanları ayırt etmek için gerekli şema eklerini oluşturur
+def ensure_schema(connection):
+    with connection.cursor() as cursor:
+        cursor.execute("""
+            ALTER TABLE job_listings ADD COLUMN IF NOT EXISTS fingerprint TEXT;
+            ALTER TABLE job_listings ADD COLUMN IF NOT EXISTS search_query TEXT;
+            CREATE UNIQUE INDEX IF NOT EXISTS job_listings_fingerprint_key
+                ON job_listings (fingerprint);
+            CREATE INDEX IF NOT EXISTS job_listings_search_query_idx
+                ON job_listings (search_query);
+        """)
+    connection.commit()
+    ensure_archive_schema(connection)
+    ensure_near_duplicate_schema(connection)
+
+# Arama sorgusunu veritabanında saklanacak tek bir anahtara çevirir
+def search_query_key(keyword, location):
+    return f"{keyword.strip().lower()}|{location.strip().lower()}"
+
+# İlanın kalıcı parmak izi: LinkedIn ilan id'si, yoksa başlık/şirket/konum özeti
+def job_fingerprint(linkedin_id=None, title="", company_name="", location=""):
+    if linkedin_id:
+        return f"li:{linkedin_id}"
+    normalized = "|".join(" ".join(part.lower().split()) for part in (title, company_name, location))
+    return "sha1:" + hashlib.sha1(normalized.encode("utf-8")).hexdigest()
+
+# Kart tıklanmadan önce, liste öğesinden parmak izini çıkarır
+def card_fingerprint(card, linkedin_id=None):
+    if linkedin_id:
+        return job_fingerprint(linkedin_id)
+    lines = [line.strip() for line in card.text.split('\n') if line.strip()]
+    if not lines:
+        # Kart henüz çizilmediyse güvenilir bir parmak izi üretilemez
+        return None
+    lines += ["", ""]
+    return job_fingerprint(None, lines[0], lines[1], lines[2])
+
+# Bu arama için daha önce kaydedilmiş ilanların parmak izlerini yükler
+def load_seen_fingerprints(connection, search_query):
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT fingerprint FROM job_listings WHERE search_query = %s AND fingerprint IS NOT NULL",
+            (search_query,)
+        )
+        seen = {row[0] for row in cursor.fetchall()}
+    logging.info(f"{search_query} için {len(seen)} kayıtlı ilan yüklendi.")
+    return seen
 
+# Sayfadan gelen metinlerdeki görünmez karakterleri ve fazla boşlukları temizler
+def normalize_job(job_data):
+    normalized = dict(job_data)
+    for field in ("title", "company_name", "location", "sector", "remote_type"):
+        value = normalized.get(field)
+        if isinstance(value, str):
+            value = value.replace("\u00a0", " ").replace("\u200b", "")
+            normalized[field] = " ".join(value.split())
+    description = normalized.get("description")
+    if isinstance(description, str):
+        description = description.replace("\r\n", "\n").replace("\u00a0", " ").replace("\u200b", "")
+        lines = [" ".join(line.split()) for line in description.split("\n")]
+        description = re.sub(r"\n{3,}", "\n\n", "\n".join(lines)).strip()
+        normalized["description"] = description
+    return normalized
+
+# İlan verisini veritabanı sütun uzunluklarına göre kırpar
+def prepare_job_row(job_data):
+    return (
+        job_data.get('title', '')[:255],
+        job_data.get('description', '')[:PREVIEW_LENGTH],
+        job_data.get('company_name', '')[:255],
+        job_data.get('location', '')[:255],
+        job_data.get('sector', '')[:255],
+        job_data.get('remote_type', '')[:100],
+        job_data.get('fingerprint'),
+        job_data.get('search_query')
+    )
+
+# Veritabanına iş ilanı ekleme fonksiyonu (tek kayıt)
+@METRICS.timed("insert_job_to_db")
+def insert_job_to_db(job_data, cursor, connection, archive=None, near_duplicates=None):
+    try:
         cursor.execute("""
             INSERT INTO job_listings 
-            (title, description, company_name, location, sector, remote_type, scraped_at)
-            VALUES (%s, %s, %s, %s, %s, %s, NOW())
+            (title, description, company_name, location, sector, remote_type,
+             fingerprint, search_query, scraped_at)
+            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, NOW())
+            ON CONFLICT (fingerprint) DO NOTHING
             RETURNING id;
-        """, (
-            processed_data['title'],
-            processed_data['description'],
-            processed_data['company_name'],
-            processed_data['location'],
-            processed_data['sector'],
-            processed_data['remote_type']
-        ))
+        """, prepare_job_row(job_data))
         
-        job_id = cursor.fetchone()[0]
+        row = cursor.fetchone()
+        if row is not None and archive:
+            archive.store_many(cursor, [(row[0], job_data.get('description', ''), job_data.get('raw_html'))])
+        if row is not None and near_duplicates:
+            near_duplicates.add_many(cursor, [(row[0], job_data.get('description', ''))])
         connection.commit()
-        logging.info(f"Kayıt başarılı! ID: {job_id} - Scraped at: {datetime.now()}")
+        if row is None:
+            logging.info(f"İlan zaten kayıtlı, atlandı: {job_data.get('fingerprint')}")
+            return False
+        logging.info(f"Kayıt başarılı! ID: {row[0]} - Scraped at: {datetime.now()}")
         return True
         
     except psycopg2.Error as e:
@@ -87,197 +218,906 @@ def insert_job_to_db(job_data, cursor, connection):
         connection.rollback()
         logging.error(f"Beklenmeyen Hata: {str(e)}")
         return False
+
+class ScrapeCheckpoint:
+    """ Sorgu bazında tamamlanan sayfaları ve hatalı ilanları yerel bir JSON dosyasında tutar """
+
+    MAX_FAILED = 500
+
+    def __init__(self, path=STATE_FILE):
+        self.path = path
+        self.state = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.state = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                logging.error(f"İlerleme dosyası okunamadı, sıfırdan başlanıyor: {e}")
+
+    def query_state(self, search_query):
+        return self.state.setdefault(search_query, {
+            "completed_pages": [], "last_page": None, "page": None, "index": None, "failed": [],
+            "high_water": None
+        })
+
+    def reset(self, search_query):
+        """ Sayfa ilerlemesini sıfırlar; artımlı mod için en yeni ilan işareti korunur """
+        high_water = self.high_water(search_query)
+        self.state.pop(search_query, None)
+        if high_water:
+            self.query_state(search_query)["high_water"] = high_water
+        self.save()
+
+    def high_water(self, search_query):
+        """ Son başarılı çalıştırmada görülen en yeni ilanın parmak izi """
+        return self.state.get(search_query, {}).get("high_water")
+
+    def next_page(self, search_query, start_page=1, end_page=None):
+        """ Aralıktaki ilk tamamlanmamış sayfayı döndürür, hepsi bittiyse None """
+        state = self.state.get(search_query)
+        if not state:
+            return start_page
+        completed = set(state["completed_pages"])
+        page = start_page
+        while page in completed:
+            page += 1
+        if state["last_page"] and page > state["last_page"]:
+            return None
+        if end_page and page > end_page:
+            return None
+        return page
+
+    def page_completed(self, search_query, page, index, failed=(), last_page=False, high_water=None):
+        """ Sayfanın ilanları veritabanına yazıldıktan sonra çağrılır """
+        state = self.query_state(search_query)
+        # En yeni ilan işareti yalnızca çalıştırma sonuna kadar başarıyla gidildiyse ilerletilir
+        if last_page and high_water:
+            state["high_water"] = high_water
+        if page not in state["completed_pages"]:
+            state["completed_pages"].append(page)
+        state["page"], state["index"] = page, index
+        if last_page:
+            state["last_page"] = page
+        state["failed"] = (state["failed"] + [{"page": page, "index": i} for i in failed])[-self.MAX_FAILED:]
+        state["updated_at"] = datetime.now().isoformat()
+        self.save()
+
+    def save(self):
+        # Yarım yazılmış dosya kalmasın diye önce geçici dosyaya yaz
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.path)
+
+class JobWriter:
+    """ İlanları bellekte biriktirir ve çok satırlı INSERT ile toplu halde yazar
+
+    job_listings'e açıklamanın yalnızca önizlemesi yazılır; tam metin aynı işlemde
+    sıkıştırılmış arşive (job_descriptions) gider ve MinHash indeksine eklenir; önceki bir
+    ilanın küçük değişikliklerle yeniden yayınıysa duplicate_of ile o ilana bağlanır.
+    """
+
+    INSERT_SQL = """
+        INSERT INTO job_listings
+        (title, description, company_name, location, sector, remote_type,
+         fingerprint, search_query, scraped_at)
+        VALUES %s
+        ON CONFLICT (fingerprint) DO NOTHING
+        RETURNING id, fingerprint
+    """
+    ROW_TEMPLATE = "(%s, %s, %s, %s, %s, %s, %s, %s, NOW())"
+
+    def __init__(self, connection, batch_size=BATCH_SIZE, checkpoint=None):
+        self.connection = connection
+        self.batch_size = batch_size
+        self.checkpoint = checkpoint
+        self.archive = DescriptionArchive(connection)
+        self.near_duplicates = NearDuplicateIndex()
+        self.buffer = []
+        self.written = 0
+
+    def add(self, job_data):
+        """ İlanı tampona ekler, tampon dolduysa veritabanına yazar """
+        self.buffer.append(job_data)
+        if len(self.buffer) >= self.batch_size:
+            self.flush()
+
+    @METRICS.timed("db_flush")
+    def flush(self):
+        """ Tampondaki tüm ilanları tek sorgu ve tek commit ile yazar """
+        if not self.buffer:
+            return 0
+
+        batch, self.buffer = self.buffer, []
+        try:
+            with self.connection.cursor() as cursor:
+                returned = execute_values(
+                    cursor,
+                    self.INSERT_SQL,
+                    [prepare_job_row(job_data) for job_data in batch],
+                    template=self.ROW_TEMPLATE,
+                    page_size=len(batch),
+                    fetch=True
+                )
+                inserted = len(returned)
+
+                # Yeni eklenen ilanların tam açıklamalarını aynı işlemde arşive ve tekrar indeksine yaz
+                ids = {fingerprint: job_id for job_id, fingerprint in returned}
+                new_jobs = [
+                    (ids[job_data['fingerprint']], job_data)
+                    for job_data in batch if job_data.get('fingerprint') in ids
+                ]
+                self.archive.store_many(cursor, [
+                    (job_id, job_data.get('description', ''), job_data.get('raw_html'))
+                    for job_id, job_data in new_jobs
+                ])
+                reposts = self.near_duplicates.add_many(cursor, [
+                    (job_id, job_data.get('description', '')) for job_id, job_data in new_jobs
+                ])
+            self.connection.commit()
+            self.written += inserted
+            METRICS.count("db_inserted", inserted)
+            METRICS.count("db_duplicates", len(batch) - inserted)
+            METRICS.count("db_near_duplicates", len(reposts))
+            logging.info(
+                f"Toplu kayıt başarılı! {inserted} yeni ilan, "
+                f"{len(batch) - inserted} tekrar, {len(reposts)} yeniden yayın - Scraped at: {datetime.now()}"
+            )
+            return inserted
+
+        except psycopg2.Error as e:
+            # Toplu yazma başarısızsa hatalı kaydı ayıklamak için tek tek dene
+            self.connection.rollback()
+            logging.error(f"Toplu kayıt hatası, tek tek yazılıyor: {e.pgerror}")
+            with self.connection.cursor() as cursor:
+                saved = sum(insert_job_to_db(job_data, cursor, self.connection, self.archive, self.near_duplicates)
+                            for job_data in batch)
+            self.written += saved
+            return saved
+
+    def page_completed(self, search_query, page, index, failed=(), last_page=False, high_water=None):
+        """ Sayfa sonunda tamponu yazar, ardından ilerlemeyi kaydeder """
+        self.flush()
+        if self.checkpoint:
+            self.checkpoint.page_completed(search_query, page, index, failed, last_page, high_water)
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        # Hata olsa bile tampondaki ilanlar kaybolmasın
+        self.close()
+        return False
     
-# WebDriver başlatma fonksiyonu
-def start_driver():
-    """ Kullanıcı profiliyle Chrome WebDriver başlatır """
-    profile_path = r"user-data-dir=C:\Users\Emrey\AppData\Local\Google\Chrome\User Data\Default"
+class ScrapePipeline:
+    """ Tarayıcıyı veritabanından ayıran üretici/tüketici hattı
+
+    Tarayıcı döngüsü ham ilanları sınırlı bir kuyruğa bırakır; bir iş parçacığı alanları
+    normalize eder, bir diğeri JobWriter ile toplu halde yazar. Kuyruk dolarsa tarayıcı
+    bekler (geri basınç) ve bu bekleme süresi istatistiklerde görünür.
+    """
+
+    _STOP = object()
+    _FLUSH = object()
+
+    def __init__(self, job_writer, queue_size=PIPELINE_QUEUE_SIZE):
+        self.job_writer = job_writer
+        self.normalize_queue = queue.Queue(maxsize=queue_size)
+        self.write_queue = queue.Queue(maxsize=queue_size)
+        self.blocked_seconds = 0.0
+        self.blocked_puts = 0
+        self.normalized = 0
+        self.errors = 0
+        self.threads = [
+            threading.Thread(target=self._normalize_loop, name="scrape-normalizer", daemon=True),
+            threading.Thread(target=self._write_loop, name="scrape-writer", daemon=True)
+        ]
+        for thread in self.threads:
+            thread.start()
+
+    @property
+    def written(self):
+        return self.job_writer.written
+
+    def _put(self, item):
+        # Kuyruk doluysa bekleme süresini geri basınç olarak say
+        try:
+            self.normalize_queue.put_nowait(item)
+        except queue.Full:
+            start = monotonic()
+            self.normalize_queue.put(item)
+            self.blocked_seconds += monotonic() - start
+            self.blocked_puts += 1
+
+    def _normalize_loop(self):
+        while True:
+            item = self.normalize_queue.get()
+            try:
+                if isinstance(item, dict):
+                    try:
+                        item = normalize_job(item)
+                        self.normalized += 1
+                    except Exception as e:
+                        self.errors += 1
+                        logging.error(f"Normalize hatası: {e}")
+                        continue
+                # İşaretler (sayfa sonu, flush, durdur) sırayı bozmadan yazıcıya iletilir
+                self.write_queue.put(item)
+            finally:
+                self.normalize_queue.task_done()
+            if item is self._STOP:
+                return
+
+    def _write_loop(self):
+        while True:
+            item = self.write_queue.get()
+            try:
+                if item is self._STOP:
+                    self.job_writer.close()
+                    return
+                if item is self._FLUSH:
+                    self.job_writer.flush()
+                elif isinstance(item, tuple):
+                    self.job_writer.page_completed(*item)
+                else:
+                    self.job_writer.add(item)
+            except Exception as e:
+                self.errors += 1
+                logging.error(f"Yazma hatası: {e}")
+            finally:
+                self.write_queue.task_done()
 
+    def add(self, job_data):
+        self._put(job_data)
+
+    def flush(self):
+        """ Kuyruklardaki her şey veritabanına yazılana kadar bekler """
+        self._put(self._FLUSH)
+        self.normalize_queue.join()
+        self.write_queue.join()
+
+    def page_completed(self, search_query, page, index, failed=(), last_page=False, high_water=None):
+        # Sayfa işareti ilanların arkasından gider; ilerleme kaydı yazmadan sonra yapılır
+        self._put((search_query, page, index, tuple(failed), last_page, high_water))
+        stats = self.stats()
+        print(f"📦 Kuyruk: normalize {stats['normalize_depth']}, yazma {stats['write_depth']}, "
+              f"geri basınç {stats['blocked_seconds']:.1f}s")
+        logging.info(f"Hat istatistikleri: {stats}")
+
+    def stats(self):
+        return {
+            "normalize_depth": self.normalize_queue.qsize(),
+            "write_depth": self.write_queue.qsize(),
+            "blocked_puts": self.blocked_puts,
+            "blocked_seconds": round(self.blocked_seconds, 3),
+            "normalized": self.normalized,
+            "written": self.job_writer.written,
+            "errors": self.errors
+        }
+
+    def close(self):
+        """ Kalan kayıtları yazar ve iş parçacıklarını durdurur """
+        self._put(self._STOP)
+        for thread in self.threads:
+            thread.join()
+
+# chromedriver yolunu bir kez çözer: önce CHROMEDRIVER_PATH, yoksa webdriver_manager
+def chromedriver_path():
+    global _chromedriver_path
+    if _chromedriver_path is None:
+        _chromedriver_path = os.getenv("CHROMEDRIVER_PATH") or ChromeDriverManager().install()
+    return _chromedriver_path
+
+# WebDriver başlatma fonksiyonu
+def start_driver(profile_dir=DEFAULT_PROFILE, headless=HEADLESS):
+    """ Kullanıcı profiliyle, gereksiz kaynakları yüklemeyen hafif bir Chrome WebDriver başlatır """
     options = Options()
-    options.add_argument(profile_path)
-    options.add_argument("--start-maximized")
-    options.add_experimental_option("detach", True)
+    options.add_argument(f"user-data-dir={profile_dir}")
+    if headless:
+        options.add_argument("--headless=new")
+        options.add_argument("--window-size=1920,1080")
+    else:
+        options.add_argument("--start-maximized")
+        options.add_experimental_option("detach", True)
     options.add_argument("--disable-webrtc")
     options.add_argument("--disable-popup-blocking")
     options.add_argument("--disable-extensions")
     options.add_argument("--disable-notifications")
     options.add_argument("--disable-infobars")
+    options.add_argument("--mute-audio")
+    options.add_argument("--disable-background-networking")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_experimental_option("prefs", {
+        "profile.managed_default_content_settings.images": 2,
+        "profile.managed_default_content_settings.media_stream": 2
+    })
+
+    driver = webdriver.Chrome(service=webdriver.chrome.service.Service(chromedriver_path()), options=options)
 
-    driver = webdriver.Chrome(service=webdriver.chrome.service.Service(ChromeDriverManager().install()), options=options)
+    # Görsel, medya, font ve izleyici isteklerini ağ katmanında engelle
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URL_PATTERNS})
     return driver
 
+class ManagedDriver:
+    """ Tarayıcıyı yeniden kullanır; belleği sınırlı tutmak için N sayfada bir kapatıp yenisini açar """
+
+    def __init__(self, profile_dir=DEFAULT_PROFILE, recycle_after=RECYCLE_AFTER_PAGES):
+        self.profile_dir = profile_dir
+        self.recycle_after = recycle_after
+        self.driver = None
+        self.pages = 0
+
+    def get(self):
+        """ Açık tarayıcıyı döndürür, yoksa başlatıp LinkedIn'e giriş yapar """
+        if self.driver is None:
+            self.driver = start_driver(self.profile_dir)
+            self.pages = 0
+            login_to_linkedin(self.driver)
+        return self.driver
+
+    def page_done(self):
+        """ Sayfa sayacını artırır; sınıra ulaşıldıysa tarayıcıyı yenileyip aynı URL'e döner """
+        self.pages += 1
+        if self.recycle_after and self.pages >= self.recycle_after:
+            url = self.driver.current_url
+            print(f"♻️ {self.pages} sayfa sonrası tarayıcı yenileniyor...")
+            self.quit()
+            self.get().get(url)
+        return self.driver
+
+    def quit(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception as e:
+                logging.error(f"Tarayıcı kapatılamadı: {e}")
+            self.driver = None
+
 # LinkedIn'e giriş yapma fonksiyonu
+@METRICS.timed("login")
 def login_to_linkedin(driver):
     """ LinkedIn'e giriş yapar (eğer oturum açık değilse) """
     driver.get("https://www.linkedin.com")
     
-    try:
-        WebDriverWait(driver, 10).until(EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='session_key']")))
-
-        email = driver.find_element(By.CSS_SELECTOR, "input[name='session_key']")
-        email.send_keys(os.environ.get("EMAIL"))
+    # Giriş formu ya da oturum açık sayfanın arama kutusu, hangisi önce gelirse
+    WAITS.until(driver, "login_page", EC.any_of(
+        EC.presence_of_element_located((By.CSS_SELECTOR, "input[name='session_key']")),
+        EC.presence_of_element_located((By.CSS_SELECTOR, "input[placeholder='Arama yap']"))
+    ))
 
-        password = driver.find_element(By.CSS_SELECTOR, "input[name='session_password']")
-        password.send_keys(os.environ.get("PASSWORD"))
-        password.send_keys(Keys.RETURN)
-        sleep(3)
-    except:
+    email_inputs = driver.find_elements(By.CSS_SELECTOR, "input[name='session_key']")
+    if not email_inputs:
         print("Zaten giriş yapılmış.")
-    
-sleep(3)
+        return
+
+    email_inputs[0].send_keys(os.environ.get("EMAIL"))
+
+    password = driver.find_element(By.CSS_SELECTOR, "input[name='session_password']")
+    password.send_keys(os.environ.get("PASSWORD"))
+    password.send_keys(Keys.RETURN)
+    try:
+        WAITS.until(driver, "login_submit", EC.staleness_of(password))
+    except TimeoutException:
+        print("⚠️ Giriş sonrası sayfa yenilenmedi, devam ediliyor.")
 
 # İş ilanlarını arama fonksiyonu
+@METRICS.timed("search")
 def search_jobs(driver, keyword="Python Developer", location="London"):
     """ İş ilanlarını aratır ve sonuçları döndürür """
-    search_box = WebDriverWait(driver, 10).until(
+    search_box = WAITS.until(driver, "search_box",
         EC.presence_of_element_located((By.CSS_SELECTOR, "input[placeholder='Arama yap']"))
     )
     search_box.click()
     search_box.send_keys(keyword)
     search_box.send_keys(Keys.RETURN)
 
-    button = WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.XPATH, "//button[text()='İş İlanları']"))
+    button = WAITS.until(driver, "jobs_tab",
+        EC.element_to_be_clickable((By.XPATH, "//button[text()='İş İlanları']"))
     )
     button.click()
-    sleep(2)
 
-    location_box = WebDriverWait(driver, 10).until(
+    location_box = WAITS.until(driver, "location_box",
         EC.element_to_be_clickable((By.CSS_SELECTOR, "input[aria-label='Şehir, eyalet veya posta kodu']"))
     )
     location_box.click()
     location_box.send_keys(Keys.CONTROL + "a")
     location_box.send_keys(Keys.BACKSPACE)
     location_box.send_keys(location)
-    sleep(2)
+    WAITS.until(driver, "location_typed", EC.text_to_be_present_in_element_value(
+        (By.CSS_SELECTOR, "input[aria-label='Şehir, eyalet veya posta kodu']"), location
+    ))
     location_box.send_keys(Keys.RETURN)
-    sleep(2)
 
-def scrape_jobs():
-    """ LinkedIn'den tüm sayfalardaki iş ilanlarını çeker ve veritabanına kaydeder """
-    driver = start_driver()
-    login_to_linkedin(driver)
-    search_jobs(driver)
+# Eski yöntem: her alan için ayrı WebDriver çağrısı
+def extract_job_live(driver, job):
+    """ İlan alanlarını tek tek WebDriver sorgularıyla okur """
+    # Başlık ve açıklama bilgileri
+    title = job.text.strip().split('\n')[0]
+    description_element = WebDriverWait(driver, 5).until(
+        EC.presence_of_element_located((By.CLASS_NAME, "jobs-description__container"))
+    )
+    description = description_element.text.strip()
 
-    sleep(3)
-    jobs = []
-    page_number = 1
-    job_global_index = 1
+    # Şirket bilgisi - GÜNCEL VE GÜVENİLİR YÖNTEM
+    try:
+        company_element = WebDriverWait(driver, 5).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, ".jobs-unified-top-card__company-name"))
+        )
+        company_name = company_element.text.strip()
+    except:
+        try:
+            company_element = driver.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__subtitle")
+            company_name = company_element.text.strip()
+        except:
+            company_name = "Şirket bilgisi bulunamadı"
+            METRICS.selector_miss("company_name")
+
+    try:
+        location_element = driver.find_element(By.CSS_SELECTOR, "div.job-details-jobs-unified-top-card__tertiary-description-container span")
+        location_raw = location_element.text.strip()
+        location = location_raw.split(' · ')[0]
+    except Exception:
+        location = "Konum bilgisi bulunamadı"
+        METRICS.selector_miss("location")
+
+    try:
+        insights_elements = driver.find_elements(By.CSS_SELECTOR, "li.job-details-jobs-unified-top-card__job-insight")
+        remote_type = next(
+            (el.text.strip() for el in insights_elements if any(word in el.text.lower() for word in ["remote", "uzaktan", "hibrit", "hybrid", "ofis", "on-site"])),
+            "Bilinmiyor"
+        )
+    except Exception:
+        remote_type = "Bilinmiyor"
+        METRICS.selector_miss("remote_type")
+
+    try:
+        sector_element = WebDriverWait(driver, 10).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, "div.t-14.mt5"))
+        )
+        sector_raw = sector_element.text.strip()
+        sector = re.sub(r'\d+[\+]*.*$', '', sector_raw).strip() or "Sektör bilgisi bulunamadı"
+    except Exception:
+        sector = "Sektör bilgisi bulunamadı"
+        METRICS.selector_miss("sector")
+
+    return {
+        "title": title,
+        "description": description,
+        "company_name": company_name,
+        "location": location,
+        "sector": sector,
+        "remote_type": remote_type
+    }
+
+# Varsayılan yöntem: detay panelinin HTML'ini tek çağrıda alıp yerelde ayrıştırır
+def extract_job_snapshot(driver, job):
+    """ Detay panelinin outerHTML'ini tek seferde alır, alanları job_extractor ile ayrıştırır """
+    html = driver.execute_script(PANE_SNAPSHOT_SCRIPT)
+    fields = parse_job_pane(html)
+    missing = missing_fields(fields)
+    if missing:
+        logging.info(f"Bulunamayan alanlar: {', '.join(missing)}")
+        for field in missing:
+            METRICS.selector_miss(field)
+
+    # Başlık panelde yoksa kart metnine düş (yalnızca bu durumda ek çağrı yapılır)
+    card_title = None if fields["title"] else job.text.strip().split('\n')[0]
+    job_data = build_job_data(fields, card_title)
+    if ARCHIVE_HTML:
+        job_data["raw_html"] = html
+    return job_data
+
+def scrape_jobs(keyword="Python Developer", location="London", resume=False, incremental=False,
+                stop_after_known=STOP_AFTER_KNOWN):
+    """ LinkedIn'den tüm sayfalardaki iş ilanlarını çeker ve veritabanına kaydeder """
+    search_query = search_query_key(keyword, location)
+    checkpoint = ScrapeCheckpoint()
+    high_water = checkpoint.high_water(search_query)
+    start_page = 1
+    if resume:
+        start_page = checkpoint.next_page(search_query)
+        if start_page is None:
+            print("✅ Bu arama önceki çalıştırmada tamamlanmış, devam edilecek sayfa yok.")
+            return
+        print(f"⏩ Kaldığı yerden devam ediliyor: Sayfa {start_page}")
+    else:
+        checkpoint.reset(search_query)
 
     connection = connect_db()
     if not connection:
         print("Veritabanı bağlantısı kurulamadı.")
         return
 
-    cursor = connection.cursor()
+    # Daha önce görülen ilanlar tıklanmadan atlanır
+    ensure_schema(connection)
+    seen = load_seen_fingerprints(connection, search_query)
+    print(f"🧾 Bu arama için {len(seen)} kayıtlı ilan bulundu.")
+
+    browser = ManagedDriver()
+    if start_page > 1:
+        browser.get().get(search_url(keyword, location, start_page))
+    else:
+        search_jobs(browser.get(), keyword, location)
+
+    writer = ScrapePipeline(JobWriter(connection, checkpoint=checkpoint))
+
+    try:
+        scrape_pages(browser, writer, seen, search_query, start_page,
+                     stop_after_known=stop_after_known if incremental else None, high_water=high_water)
+    finally:
+        writer.close()
+        connection.close()
+        browser.quit()
+
+    print(f"🎉 Tüm ilanlar başarıyla çekildi, {writer.written} ilan veritabanına kaydedildi.")
+    print(f"📊 Hat istatistikleri: {writer.stats()}")
+    export_metrics()
+    print(f"⏱️ Dakikada {METRICS.listings_per_minute():.1f} ilan, özet: scraper_summary.json")
+
+# Arama sonuç sayfasının doğrudan URL'i (sayfa aralığı ile çalışan işçiler için)
+def search_url(keyword, location, page=1):
+    params = {"keywords": keyword, "location": location}
+    if page > 1:
+        params["start"] = (page - 1) * RESULTS_PER_PAGE
+    return "https://www.linkedin.com/jobs/search/?" + urlencode(params)
+
+# Metrikleri Prometheus textfile ve JSON özet olarak yazar (işçiler kendi dosyalarına)
+def export_metrics():
+    name = "scraper" if WORKER_SLOT is None else f"scraper_worker-{WORKER_SLOT}"
+    try:
+        METRICS.export(name)
+    except OSError as e:
+        logging.error(f"Metrikler yazılamadı: {e}")
+
+def scrape_card(driver, job, seen, search_query, previous_pane_text, fingerprint=None):
+    """ Tek bir ilan kartını tıklayıp verisini çıkarır; kayıtlı ilanlarda job_data None döner """
+    # Kayıtlı ilanlar için tıklama/bekleme/çıkarma adımlarını atla
+    linkedin_id = job.get_attribute("data-occludable-job-id")
+    fingerprint = fingerprint or card_fingerprint(job, linkedin_id)
+    if fingerprint and fingerprint in seen:
+        return None, previous_pane_text
+
+    # İlanı tıklanabilir hale getir
+    with METRICS.timer("click"):
+        driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", job)
+        job.click()
+
+    # Detay paneli bu ilana geçene kadar bekle
+    try:
+        with METRICS.timer("wait_details"):
+            previous_pane_text = WAITS.until(driver, "job_details", job_details_loaded(linkedin_id, previous_pane_text))
+    except TimeoutException:
+        # Panel hâlâ önceki ilanı gösteriyor olabilir; kart hatalı sayılıp yeniden denenir
+        METRICS.count("wait_details_timeouts")
+        logging.warning(f"Detay paneli zaman aşımı ({fingerprint}), ilan yeniden denenecek.")
+        raise
+
+    with METRICS.timer("extract"):
+        if EXTRACTION_MODE == "live":
+            job_data = extract_job_live(driver, job)
+        else:
+            job_data = extract_job_snapshot(driver, job)
+    # Kart metni okunamadıysa parmak izi çıkarılan alanlardan üretilir
+    job_data["fingerprint"] = fingerprint or job_fingerprint(
+        None, job_data["title"], job_data["company_name"], job_data["location"]
+    )
+    job_data["search_query"] = search_query
+    return job_data, previous_pane_text
+
+def scrape_pages(browser, writer, seen, search_query, start_page=1, end_page=None,
+                 stop_after_known=None, high_water=None):
+    """ Arama sonuçlarını sayfa sayfa gezer ve yeni ilanları yazıcıya aktarır
+
+    stop_after_known verilirse (artımlı mod), art arda o kadar kayıtlı ilan görüldüğünde
+    sayfalama durur; önceki çalıştırmanın en yeni ilanı (high_water) da kayıtlı sayılır.
+    """
+    driver = browser.get()
+    page_number = start_page
+    job_global_index = 1
+    skipped = 0
+    consecutive_known = 0
+    caught_up = False
+    newest_fingerprint = None
+    previous_pane_text = ""
+    job_locator = (By.CSS_SELECTOR, "li.scaffold-layout__list-item")
 
     while True:
         print(f"\n📄 Sayfa {page_number} işleniyor...")
-        sleep(2)
 
-        job_listings = WebDriverWait(driver, 10).until(
-            EC.presence_of_all_elements_located((By.CSS_SELECTOR, "li.scaffold-layout__list-item"))
-        )
+        # Liste DOM'u oturana kadar bekle
+        with METRICS.timer("list_wait"):
+            job_listings = WAITS.until(driver, "list_settled", list_settled(job_locator))
 
         print(f"🔍 Bu sayfada {len(job_listings)} ilan bulundu.")
         logging.info(f"Sayfa {page_number}: {len(job_listings)} ilan bulundu.")
 
-        for index, job in enumerate(job_listings):
-            try:
-                # İlanı tıklanabilir hale getir
-                driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", job)
-                ActionChains(driver).move_to_element(job).perform()
-                sleep(1)
-                job.click()
-                sleep(2)
-
-                # Başlık ve açıklama bilgileri
-                title = job.text.strip().split('\n')[0]
-                description_element = WebDriverWait(driver, 5).until(
-                    EC.presence_of_element_located((By.CLASS_NAME, "jobs-description__container"))
-                )
-                description = description_element.text.strip()
+        failed = []
+        for attempt in range(2):
+            # İkinci turda yalnızca hata veren kartlar, DOM'dan yeniden alınarak denenir
+            if attempt == 1:
+                if not failed:
+                    break
+                print(f"🔁 {len(failed)} hatalı ilan yeniden deneniyor...")
+                job_listings = driver.find_elements(*job_locator)
+                indexes, failed = failed, []
+            else:
+                indexes = range(len(job_listings))
 
-                # Şirket bilgisi - GÜNCEL VE GÜVENİLİR YÖNTEM
+            for index in indexes:
                 try:
-                    company_element = WebDriverWait(driver, 5).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, ".jobs-unified-top-card__company-name"))
-                    )
-                    company_name = company_element.text.strip()
-                except:
-                    try:
-                        company_element = driver.find_element(By.CSS_SELECTOR, ".artdeco-entity-lockup__subtitle")
-                        company_name = company_element.text.strip()
-                    except:
-                        company_name = "Şirket bilgisi bulunamadı"
+                    job = job_listings[index]
+                    fingerprint = card_fingerprint(job, job.get_attribute("data-occludable-job-id"))
+                    if page_number == 1 and newest_fingerprint is None:
+                        newest_fingerprint = fingerprint
 
-                try:
-                    location_element = driver.find_element(By.CSS_SELECTOR, "div.job-details-jobs-unified-top-card__tertiary-description-container span")
-                    location_raw = location_element.text.strip()
-                    location = location_raw.split(' · ')[0]
-                except Exception:
-                    location = "Konum bilgisi bulunamadı"
+                    # Artımlı mod: sıralama en yeniden eskiye, art arda bilinen ilanlara ulaşınca dur.
+                    # Önceki çalıştırmanın ilk kartı (high_water) sabitlenmiş/öne çıkarılmış olabileceği
+                    # için tek başına durdurmaz, yalnızca bilinen ilan olarak sayılır.
+                    if stop_after_known and fingerprint and (fingerprint == high_water or fingerprint in seen):
+                        consecutive_known += 1
+                        if consecutive_known >= stop_after_known:
+                            print(f"🛑 Bilinen ilanlara ulaşıldı ({consecutive_known} ardışık), sayfalama durduruluyor.")
+                            caught_up = True
+                            break
+                    else:
+                        consecutive_known = 0
 
-                try:
-                    insights_elements = driver.find_elements(By.CSS_SELECTOR, "li.job-details-jobs-unified-top-card__job-insight")
-                    remote_type = next(
-                        (el.text.strip() for el in insights_elements if any(word in el.text.lower() for word in ["remote", "uzaktan", "hibrit", "hybrid", "ofis", "on-site"])),
-                        "Bilinmiyor"
+                    job_data, previous_pane_text = scrape_card(
+                        driver, job, seen, search_query, previous_pane_text, fingerprint
                     )
-                except Exception:
-                    remote_type = "Bilinmiyor"
+                    if job_data is None:
+                        skipped += 1
+                        METRICS.count("cards_skipped")
+                        continue
 
-                try:
-                    sector_element = WebDriverWait(driver, 10).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "div.t-14.mt5"))
-                    )
-                    sector_raw = sector_element.text.strip()
-                    sector = re.sub(r'\d+[\+]*.*$', '', sector_raw).strip() or "Sektör bilgisi bulunamadı"
-                except Exception:
-                    sector = "Sektör bilgisi bulunamadı"
-
-                job_data = {
-                    "title": title,
-                    "description": description,
-                    "company_name": company_name,
-                    "location": location,
-                    "sector": sector,
-                    "remote_type": remote_type
-                }
-
-                print(f"✅ {job_global_index}. ilan (Sayfa {page_number}, İlan {index + 1}) alındı.")
-                insert_job_to_db(job_data, cursor, connection)
-                job_global_index += 1
+                    print(f"✅ {job_global_index}. ilan (Sayfa {page_number}, İlan {index + 1}) alındı.")
+                    writer.add(job_data)
+                    METRICS.count("listings")
+                    if job_data["fingerprint"]:
+                        seen.add(job_data["fingerprint"])
+                    job_global_index += 1
 
-            except Exception as e:
-                print(f"❌ Hata (İlan {index + 1}): {e}")
-                logging.error(f"Hata: {e}")
-                continue
+                except Exception as e:
+                    print(f"❌ Hata (İlan {index + 1}): {e}")
+                    logging.error(f"Hata: {e}")
+                    METRICS.count("card_failures")
+                    failed.append(index)
+                    continue
+
+        if skipped:
+            print(f"⏭️ Şimdiye kadar {skipped} kayıtlı ilan atlandı.")
+
+        last_page = False
+        next_button = None
+        if caught_up:
+            last_page = True
+        elif end_page and page_number >= end_page:
+            print(f"Sayfa aralığının sonuna ulaşıldı ({end_page}).")
+        else:
+            try:
+                next_button = driver.find_element(
+                    By.CSS_SELECTOR,
+                    "button.artdeco-button.jobs-search-pagination__button--next[aria-label='Sonraki sayfayı görüntüle']"
+                )
+                if not next_button.is_enabled():
+                    print("Son sayfaya ulaşıldı.")
+                    next_button, last_page = None, True
+            except Exception:
+                print("Sonraki sayfa butonu bulunamadı veya devre dışı. İşlem tamamlandı.")
+                last_page = True
 
-        # Sonraki sayfaya geçmeyi dene
-       # Sonraki sayfaya geçmeyi dene
+        # Sayfa bitti: tampondaki ilanları tek commit ile yaz ve ilerlemeyi kaydet
+        writer.page_completed(search_query, page_number, len(job_listings), failed, last_page,
+                              newest_fingerprint if last_page else None)
+        METRICS.count("pages")
+        export_metrics()
+
+        if next_button is None:
+            break
+
+        # Sonraki sayfaya geç
         try:
-            next_button = driver.find_element(
-                By.CSS_SELECTOR,
-                "button.artdeco-button.jobs-search-pagination__button--next[aria-label='Sonraki sayfayı görüntüle']"
-            )
-            if next_button.is_enabled():
+            with METRICS.timer("page_change"):
                 driver.execute_script("arguments[0].scrollIntoView();", next_button)
                 next_button.click()
                 page_number += 1
-                sleep(3)
-            else:
-                print("Son sayfaya ulaşıldı.")
-                break
-        except Exception:
-            print("Sonraki sayfa butonu bulunamadı veya devre dışı. İşlem tamamlandı.")
+                # Eski sayfanın kartları DOM'dan düşene kadar bekle
+                WAITS.until(driver, "page_change", EC.staleness_of(job_listings[0]))
+            driver = browser.page_done()
+        except Exception as e:
+            print(f"Sonraki sayfaya geçilemedi: {e}")
+            logging.error(f"Sayfa geçiş hatası: {e}")
             break
 
+class QueueWriter:
+    """ Alt süreçteki ilanları ana süreçteki ortak yazıcıya kuyruk üzerinden iletir """
 
-    connection.commit()
-    cursor.close()
-    connection.close()
-    print("🎉 Tüm ilanlar başarıyla çekildi ve veritabanına kaydedildi.")
+    def __init__(self, record_queue):
+        self.record_queue = record_queue
+        self.written = 0
+
+    def add(self, job_data):
+        self.record_queue.put(job_data)
+        self.written += 1
+
+    def flush(self):
+        pass
+
+    def page_completed(self, search_query, page, index, failed=(), last_page=False, high_water=None):
+        # İlerleme, ilanlar ana süreçte yazıldıktan sonra kaydedilsin diye kuyruktan gider
+        self.record_queue.put({
+            "_page_completed": True, "search_query": search_query, "page": page,
+            "index": index, "failed": list(failed), "last_page": last_page, "high_water": high_water
+        })
+
+    def close(self):
+        pass
+
+# Shard: tek bir (anahtar kelime, konum) araması, isteğe bağlı olarak bir sayfa aralığı
+def make_shard(keyword, location, start_page=1, end_page=None):
+    return {"keyword": keyword, "location": location, "start_page": start_page, "end_page": end_page}
+
+def init_worker(slot_queue):
+    """ Her işçi sürecine sabit bir numara ve kendi profil klasörüyle bir tarayıcı verir """
+    global WORKER_SLOT, WORKER_BROWSER
+    WORKER_SLOT = slot_queue.get()
+    METRICS.labels["worker"] = WORKER_SLOT
+    profile_dir = os.path.abspath(os.path.join(PROFILE_ROOT, f"worker-{WORKER_SLOT}"))
+    WORKER_BROWSER = ManagedDriver(profile_dir)
+    # Süreç kapanırken tarayıcıyı da kapat
+    multiprocessing.util.Finalize(None, WORKER_BROWSER.quit, exitpriority=10)
+
+def scrape_shard(shard, record_queue, seen):
+    """ İşçi süreçte kendi tarayıcısıyla bir shard'ı tarar, ilanları kuyruğa yazar """
+    search_query = search_query_key(shard["keyword"], shard["location"])
+    writer = QueueWriter(record_queue)
+    try:
+        driver = WORKER_BROWSER.get()
+        if shard["start_page"] > 1 or shard["end_page"]:
+            driver.get(search_url(shard["keyword"], shard["location"], shard["start_page"]))
+        else:
+            search_jobs(driver, shard["keyword"], shard["location"])
+        scrape_pages(WORKER_BROWSER, writer, seen, search_query, shard["start_page"], shard["end_page"],
+                     shard.get("stop_after_known"), shard.get("high_water"))
+    except Exception:
+        # Hatalı durumdaki tarayıcı bir sonraki shard'a taşınmasın
+        WORKER_BROWSER.quit()
+        raise
+    finally:
+        record_queue.put(None)
+    return writer.written
+
+def run_shards(shards, workers, resume=False, incremental=False, stop_after_known=STOP_AFTER_KNOWN):
+    """ Shard'ları bir tarayıcı işçi havuzunda paralel çalıştırır, tüm ilanları tek yazıcıdan geçirir """
+    checkpoint = ScrapeCheckpoint()
+    pending_shards = []
+    for shard in shards:
+        search_query = search_query_key(shard["keyword"], shard["location"])
+        if incremental:
+            shard = dict(shard, stop_after_known=stop_after_known, high_water=checkpoint.high_water(search_query))
+        if not resume:
+            checkpoint.reset(search_query)
+            pending_shards.append(shard)
+            continue
+        # Tamamlanmış sayfalar atlanır, shard ilk eksik sayfadan başlar
+        start_page = checkpoint.next_page(search_query, shard["start_page"], shard["end_page"])
+        if start_page is None:
+            print(f"✅ Shard zaten tamamlanmış: {shard['keyword']} / {shard['location']}")
+            continue
+        pending_shards.append(dict(shard, start_page=start_page))
+    shards = pending_shards
+    if not shards:
+        return
+
+    connection = connect_db()
+    if not connection:
+        print("Veritabanı bağlantısı kurulamadı.")
+        return
+
+    ensure_schema(connection)
+    # chromedriver bir kez çözülür, işçiler ortam değişkeninden okur
+    os.environ["CHROMEDRIVER_PATH"] = chromedriver_path()
+    seen_by_query = {}
+    for shard in shards:
+        search_query = search_query_key(shard["keyword"], shard["location"])
+        if search_query not in seen_by_query:
+            seen_by_query[search_query] = load_seen_fingerprints(connection, search_query)
+
+    manager = multiprocessing.Manager()
+    record_queue = manager.Queue(maxsize=BATCH_SIZE * workers * 4)
+    slot_queue = manager.Queue()
+    for slot in range(workers):
+        slot_queue.put(slot)
+
+    writer = ScrapePipeline(JobWriter(connection, checkpoint=checkpoint))
+    written_fingerprints = set()
+    duplicates = 0
+    pending = len(shards)
+
+    print(f"🚀 {len(shards)} shard, {workers} tarayıcı işçisiyle başlatılıyor...")
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=init_worker, initargs=(slot_queue,)) as pool:
+            futures = [
+                pool.submit(scrape_shard, shard, record_queue,
+                            seen_by_query[search_query_key(shard["keyword"], shard["location"])])
+                for shard in shards
+            ]
+
+            # Tek yazıcı: shard'lar arasında tekrar eden ilanlar burada elenir
+            while pending or not record_queue.empty():
+                try:
+                    job_data = record_queue.get(timeout=1)
+                except queue.Empty:
+                    # Boşta kalınan sürede tamponu yaz; çöken işçi bitiş işareti bırakmamış olabilir
+                    writer.flush()
+                    if all(future.done() for future in futures):
+                        break
+                    continue
+                if job_data is None:
+                    pending -= 1
+                    continue
+                if job_data.get("_page_completed"):
+                    writer.page_completed(job_data["search_query"], job_data["page"], job_data["index"],
+                                          job_data["failed"], job_data["last_page"], job_data["high_water"])
+                    continue
+                fingerprint = job_data.get("fingerprint")
+                if fingerprint and fingerprint in written_fingerprints:
+                    duplicates += 1
+                    continue
+                if fingerprint:
+                    written_fingerprints.add(fingerprint)
+                writer.add(job_data)
+
+            for shard, future in zip(shards, futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    print(f"❌ Shard hatası ({shard['keyword']} / {shard['location']}): {e}")
+                    logging.error(f"Shard hatası {shard}: {e}")
+    finally:
+        writer.close()
+        connection.close()
+        manager.shutdown()
+
+    print(f"🎉 Tüm shard'lar tamamlandı, {writer.written} ilan kaydedildi, {duplicates} tekrar elendi.")
+    METRICS.count("shard_duplicates", duplicates)
+    export_metrics()
+
+def parse_shard(value):
+    """ "anahtar kelime|konum" veya "anahtar kelime|konum|1-5" biçimindeki shard tanımını çözer """
+    parts = [part.strip() for part in value.split("|")]
+    if len(parts) not in (2, 3):
+        raise argparse.ArgumentTypeError(f"Geçersiz shard: {value}")
+    if len(parts) == 2:
+        return make_shard(parts[0], parts[1])
+    start_page, _, end_page = parts[2].partition("-")
+    return make_shard(parts[0], parts[1], int(start_page), int(end_page or start_page))
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="LinkedIn iş ilanı kazıyıcı")
+    parser.add_argument("--shard", action="append", type=parse_shard, default=[],
+                        help='"anahtar kelime|konum[|başlangıç-bitiş sayfası]", birden çok kez verilebilir')
+    parser.add_argument("--workers", type=int, default=int(os.getenv("SCRAPER_WORKERS", "1")),
+                        help="Paralel tarayıcı işçisi sayısı")
+    parser.add_argument("--resume", action="store_true",
+                        help="Önceki çalıştırmanın son tamamlanan sayfasından devam et")
+    parser.add_argument("--incremental", action="store_true",
+                        help="Yalnızca son çalıştırmadan bu yana eklenen ilanları tara")
+    parser.add_argument("--stop-after-known", type=int, default=STOP_AFTER_KNOWN,
+                        help="Artımlı modda art arda kaç kayıtlı ilan görülünce durulacağı")
+    return parser.parse_args()
 
 if __name__ == "__main__":
-    scrape_jobs()
+    args = parse_args()
+    if len(args.shard) > 1 or args.workers > 1 or (args.shard and args.shard[0]["end_page"]):
+        run_shards(args.shard or [make_shard("Python Developer", "London")], args.workers,
+                   args.resume, args.incremental, args.stop_after_known)
+    elif args.shard:
+        scrape_jobs(args.shard[0]["keyword"], args.shard[0]["location"], args.resume,
+                    args.incremental, args.stop_after_known)
+    else:
+        scrape_jobs(resume=args.resume, incremental=args.incremental, stop_after_known=args.stop_after_known)
@@ -0,0 +1,376 @@
+""" Canlı LinkedIn'e bağlanmadan kazıyıcıyı ölçen tekrar oynatma (replay) düzeneği
+
+Kayıtlı ya da sentetik arama sonucu ve ilan detay sayfalarını sahte bir WebDriver üzerinden
+sunar, scrape_pages döngüsünü sayfalama dahil uçtan uca çalıştırır ve şunları raporlar:
+saniyedeki ilan, ilan başına WebDriver çağrısı ve ilan başına veritabanı yazması.
+
+Kullanım:
+    python scraper_bench.py --listings 5000
+    python scraper_bench.py --recordings recordings/ --mode live
+    python scraper_bench.py --listings 1000 --real-db
+"""
+import argparse
+import contextlib
+import glob
+import html
+import io
+import json
+import os
+import random
+from time import perf_counter
+from selectolax.lexbor import LexborHTMLParser as HTMLParser
+from selenium.common.exceptions import NoSuchElementException, StaleElementReferenceException
+from selenium.webdriver.common.by import By
+
+import scraper
+from job_extractor import PANE_SNAPSHOT_SCRIPT
+from scraper_metrics import METRICS
+from scraper_waits import WAITS, DETAILS_READY_SCRIPT
+
+NEXT_BUTTON_LABEL = "Sonraki sayfayı görüntüle"
+
+TITLES = ["Python Developer", "Senior Python Engineer", "Backend Developer", "Data Engineer",
+          "Django Developer", "Machine Learning Engineer", "Software Engineer", "DevOps Engineer"]
+COMPANIES = ["Acme Ltd", "Globex", "Initech", "Umbrella Corp", "Hooli", "Stark Industries", "Wayne Tech"]
+LOCATIONS = ["London, England, United Kingdom", "Manchester, England, United Kingdom",
+             "Cambridge, England, United Kingdom", "Leeds, England, United Kingdom"]
+SECTORS = ["Yazılım Geliştirme", "BT Hizmetleri ve BT Danışmanlığı", "Finansal Hizmetler", "Sağlık"]
+REMOTE_TYPES = ["Uzaktan", "Hibrit", "Ofiste"]
+SKILLS = ["Python", "Django", "FastAPI", "PostgreSQL", "AWS", "Docker", "Kubernetes", "Redis",
+          "Kafka", "React", "Terraform", "Airflow", "Spark", "SQL", "Git", "CI/CD"]
+
+# --- Sahte veritabanı -------------------------------------------------------------------------
+
+class FakeCursor:
+    """ execute_values ile uyumlu, yazma sayılarını tutan sahte imleç """
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.rowcount = 0
+        self._mogrified = []
+        self._returned = []
+
+    def mogrify(self, template, args):
+        self._mogrified.append(tuple(args))
+        return repr(tuple(args)).encode("utf-8")
+
+    def execute(self, sql, params=None):
+        sql = sql.decode("utf-8") if isinstance(sql, bytes) else sql
+        self.connection.executes += 1
+        if sql.lstrip().upper().startswith("SELECT"):
+            self._returned = []
+        else:
+            rows = self._mogrified or [tuple(params or ())]
+            self.rowcount = len(rows)
+            start = self.connection.rows
+            self.connection.rows += self.rowcount
+            # JobWriter'ın RETURNING id, fingerprint sonucu (fingerprint satırın 7. sütunu)
+            self._returned = [(start + i + 1, row[6] if len(row) > 6 else None) for i, row in enumerate(rows)]
+        self._mogrified = []
+
+    def fetchone(self):
+        return self._returned[0] if self._returned else None
+
+    def fetchall(self):
+        return self._returned
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+class FakeConnection:
+    encoding = "UTF8"
+
+    def __init__(self):
+        self.executes = 0
+        self.commits = 0
+        self.rows = 0
+
+    def cursor(self, **kwargs):
+        return FakeCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+# --- Kayıtlı / sentetik ilan korpusu ------------------------------------------------------------
+
+def card_html(job):
+    return (
+        f'<li class="scaffold-layout__list-item" data-occludable-job-id="{job["id"]}">'
+        f'<div class="job-card-container">{html.escape(job["title"])}<br>'
+        f'{html.escape(job["company_name"])}<br>{html.escape(job["location"])}</div></li>'
+    )
+
+def pane_html(job):
+    paragraphs = "".join(f"<p>{html.escape(p)}</p>" for p in job["description"].split("\n\n"))
+    return f"""
+<div class="jobs-search__job-details--wrapper">
+  <h1 class="job-details-jobs-unified-top-card__job-title"><a href="/jobs/view/{job["id"]}/">{html.escape(job["title"])}</a></h1>
+  <div class="job-details-jobs-unified-top-card__company-name">{html.escape(job["company_name"])}</div>
+  <div class="job-details-jobs-unified-top-card__tertiary-description-container">
+    <span>{html.escape(job["location"])} · 2 gün önce · 87 başvuru</span>
+  </div>
+  <ul>
+    <li class="job-details-jobs-unified-top-card__job-insight">Tam zamanlı</li>
+    <li class="job-details-jobs-unified-top-card__job-insight">{html.escape(job["remote_type"])}</li>
+  </ul>
+  <div class="jobs-description__container">{paragraphs}</div>
+  <div class="t-14 mt5">{html.escape(job["sector"])} 501-1.000 çalışan</div>
+</div>"""
+
+def synthetic_corpus(listings, per_page=scraper.RESULTS_PER_PAGE, seed=42):
+    """ Sayfalara bölünmüş, tekrarlanabilir sentetik ilan listesi üretir """
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(listings):
+        skills = rng.sample(SKILLS, 6)
+        description = "\n\n".join([
+            f"We are looking for a {rng.choice(TITLES)} to join our growing team.",
+            "Responsibilities: " + " ".join(f"Build and maintain services using {skill}." for skill in skills[:3]),
+            "Requirements: " + ", ".join(skills) + f". At least {rng.randint(2, 8)} years of experience.",
+            "We are an equal opportunity employer and value diversity at our company."
+        ] + ["Lorem ipsum dolor sit amet. " * rng.randint(5, 40)])
+        job = {
+            "id": str(4000000000 + i),
+            "title": rng.choice(TITLES),
+            "company_name": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "sector": rng.choice(SECTORS),
+            "remote_type": rng.choice(REMOTE_TYPES),
+            "description": description
+        }
+        job["card_html"], job["pane_html"] = card_html(job), pane_html(job)
+        jobs.append(job)
+    return [jobs[i:i + per_page] for i in range(0, len(jobs), per_page)]
+
+def recorded_corpus(directory):
+    """ page-*.html (arama sonuçları) ve job-<id>.html (detay paneli) dosyalarını yükler """
+    pages = []
+    for path in sorted(glob.glob(os.path.join(directory, "page-*.html"))):
+        with open(path, encoding="utf-8") as f:
+            tree = HTMLParser(f.read())
+        jobs = []
+        for node in tree.css("li.scaffold-layout__list-item"):
+            job_id = node.attributes.get("data-occludable-job-id")
+            pane_path = os.path.join(directory, f"job-{job_id}.html")
+            if not job_id or not os.path.exists(pane_path):
+                continue
+            with open(pane_path, encoding="utf-8") as f:
+                jobs.append({"id": job_id, "card_html": node.html, "pane_html": f.read()})
+        pages.append(jobs)
+    return pages
+
+# --- Sahte WebDriver -------------------------------------------------------------------------
+
+class FakeElement:
+    def __init__(self, driver, node, generation):
+        self.driver = driver
+        self.node = node
+        self.generation = generation
+
+    def _check(self):
+        self.driver.calls += 1
+        if self.generation != self.driver.generation:
+            raise StaleElementReferenceException("Sayfa değişti")
+
+    @property
+    def text(self):
+        self._check()
+        return self.node.text(separator="\n", strip=True)
+
+    def get_attribute(self, name):
+        self._check()
+        return self.node.attributes.get(name)
+
+    def is_enabled(self):
+        self._check()
+        return "disabled" not in self.node.attributes
+
+    def click(self):
+        self._check()
+        if self.node.attributes.get("aria-label") == NEXT_BUTTON_LABEL:
+            self.driver.next_page()
+        elif self.node.attributes.get("data-occludable-job-id"):
+            self.driver.open_job(self.node.attributes["data-occludable-job-id"])
+
+    def find_element(self, by, value):
+        return self.driver.find_element(by, value)
+
+    def find_elements(self, by, value):
+        return self.driver.find_elements(by, value)
+
+class FakeDriver:
+    """ Korpusu LinkedIn arama sonuç sayfası gibi sunan, her çağrıyı sayan WebDriver taklidi """
+
+    def __init__(self, pages):
+        self.pages = pages
+        self.page_index = 0
+        self.current_job = None
+        self.generation = 0
+        self.calls = 0
+        self._tree = None
+
+    @property
+    def current_url(self):
+        self.calls += 1
+        url = f"https://www.linkedin.com/jobs/search/?keywords=bench&start={self.page_index * scraper.RESULTS_PER_PAGE}"
+        if self.current_job:
+            url += f"&currentJobId={self.current_job['id']}"
+        return url
+
+    def get(self, url):
+        self.calls += 1
+
+    def quit(self):
+        pass
+
+    def document(self):
+        if self._tree is None:
+            jobs = self.pages[self.page_index]
+            last = self.page_index == len(self.pages) - 1
+            disabled = " disabled" if last else ""
+            body = (
+                '<ul class="scaffold-layout__list">' + "".join(job["card_html"] for job in jobs) + "</ul>"
+                + (self.current_job["pane_html"] if self.current_job else "")
+                + f'<button class="artdeco-button jobs-search-pagination__button--next" '
+                  f'aria-label="{NEXT_BUTTON_LABEL}"{disabled}>Sonraki</button>'
+            )
+            self._tree = HTMLParser(f"<html><body>{body}</body></html>")
+        return self._tree
+
+    def open_job(self, job_id):
+        self.current_job = next(job for job in self.pages[self.page_index] if job["id"] == job_id)
+        self._tree = None
+
+    def next_page(self):
+        if self.page_index < len(self.pages) - 1:
+            self.page_index += 1
+            self.current_job = None
+            self.generation += 1
+            self._tree = None
+
+    def _css(self, by, value):
+        if by == By.CLASS_NAME:
+            return "." + value
+        if by == By.CSS_SELECTOR:
+            return value
+        raise NotImplementedError(f"Replay sürücüsü {by} seçicisini desteklemiyor")
+
+    def find_elements(self, by, value):
+        self.calls += 1
+        return [FakeElement(self, node, self.generation) for node in self.document().css(self._css(by, value))]
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(value)
+        return elements[0]
+
+    def execute_script(self, script, *args):
+        self.calls += 1
+        if script == PANE_SNAPSHOT_SCRIPT:
+            return self.current_job["pane_html"] if self.current_job else "<body></body>"
+        if script == DETAILS_READY_SCRIPT:
+            job_id, previous = args
+            if job_id and (not self.current_job or self.current_job["id"] != job_id):
+                return None
+            pane = self.document().css_first(".jobs-description__container")
+            text = pane.text(separator="\n", strip=True) if pane else ""
+            shown = job_id and self.document().css_first(f'a[href*="/jobs/view/{job_id}/"]') is not None
+            return text if text and (text != previous or shown) else None
+        return None
+
+class ReplayBrowser:
+    """ scrape_pages'in beklediği ManagedDriver arayüzü """
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def get(self):
+        return self.driver
+
+    def page_done(self):
+        return self.driver
+
+    def quit(self):
+        pass
+
+# --- Ölçüm ------------------------------------------------------------------------------------
+
+def run_benchmark(pages, mode="snapshot", real_db=False, batch_size=scraper.BATCH_SIZE, verbose=False):
+    scraper.EXTRACTION_MODE = mode
+    # Tekrar oynatmada ağ gecikmesi yok; koşullar hemen sağlanır
+    WAITS.poll_frequency = 0.01
+    scraper.export_metrics = lambda: None
+
+    connection = scraper.connect_db() if real_db else FakeConnection()
+    if real_db:
+        scraper.ensure_schema(connection)
+    driver = FakeDriver(pages)
+    writer = scraper.ScrapePipeline(scraper.JobWriter(connection, batch_size=batch_size))
+    listings = sum(len(page) for page in pages)
+
+    quiet = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    start = perf_counter()
+    with quiet:
+        try:
+            scraper.scrape_pages(ReplayBrowser(driver), writer, set(), "bench|replay")
+        finally:
+            writer.close()
+    elapsed = perf_counter() - start
+
+    extracted = METRICS.counters.get("listings", 0)
+    result = {
+        "mode": mode,
+        "pages": len(pages),
+        "listings": listings,
+        "extracted": extracted,
+        "seconds": round(elapsed, 3),
+        "listings_per_sec": round(extracted / elapsed, 1) if elapsed else 0.0,
+        "webdriver_calls_per_listing": round(driver.calls / max(extracted, 1), 2),
+        "pipeline": writer.stats()
+    }
+    if real_db:
+        result["db_written"] = writer.written
+        connection.close()
+    else:
+        result["db_executes_per_listing"] = round(connection.executes / max(extracted, 1), 4)
+        result["db_commits_per_listing"] = round(connection.commits / max(extracted, 1), 4)
+    result["phases"] = METRICS.summary()["phases"]
+    return result
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Kazıyıcı için çevrimdışı tekrar oynatma ve ölçüm")
+    parser.add_argument("--listings", type=int, default=5000, help="Sentetik korpustaki ilan sayısı")
+    parser.add_argument("--recordings", help="page-*.html ve job-<id>.html dosyalarını içeren dizin")
+    parser.add_argument("--mode", choices=["snapshot", "live"], default="snapshot")
+    parser.add_argument("--batch-size", type=int, default=scraper.BATCH_SIZE)
+    parser.add_argument("--real-db", action="store_true", help="Sahte bağlantı yerine .env'deki veritabanına yaz")
+    parser.add_argument("--output", help="Sonucu JSON olarak bu dosyaya da yaz")
+    parser.add_argument("--verbose", action="store_true", help="Kazıyıcı çıktısını gizleme")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    pages = recorded_corpus(args.recordings) if args.recordings else synthetic_corpus(args.listings)
+    print(f"🎬 {sum(len(page) for page in pages)} ilan, {len(pages)} sayfa tekrar oynatılıyor ({args.mode})...")
+    result = run_benchmark(pages, args.mode, args.real_db, args.batch_size, args.verbose)
+    print(f"⚡ {result['listings_per_sec']} ilan/sn, "
+          f"ilan başına {result['webdriver_calls_per_listing']} WebDriver çağrısı")
+    if "db_executes_per_listing" in result:
+        print(f"💾 İlan başına {result['db_executes_per_listing']} sorgu, {result['db_commits_per_listing']} commit")
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
@@ -0,0 +1,150 @@
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from functools import wraps
+from time import monotonic
+import json
+import os
+import threading
+
+# Metrik dosyalarının yazılacağı dizin (Prometheus node_exporter textfile collector dizini olabilir)
+METRICS_DIR = os.getenv("SCRAPER_METRICS_DIR", ".")
+
+QUANTILES = (0.5, 0.95, 0.99)
+
+class ScrapeMetrics:
+    """ Kazıyıcının sıcak yolundaki aşama sürelerini ve hata sayaçlarını toplar
+
+    Sonuçlar Prometheus textfile formatında ve JSON çalışma özeti olarak dışa aktarılır.
+    """
+
+    def __init__(self, labels=None):
+        self.labels = dict(labels or {})
+        self.samples = defaultdict(list)
+        self.counters = defaultdict(int)
+        self.selector_failures = defaultdict(int)
+        self.started_at = datetime.now()
+        self.started = monotonic()
+        # Yazıcı iş parçacığı da metrik kaydettiği için
+        self.lock = threading.Lock()
+
+    def observe(self, phase, seconds):
+        with self.lock:
+            self.samples[phase].append(seconds)
+
+    def count(self, name, amount=1):
+        with self.lock:
+            self.counters[name] += amount
+
+    def selector_miss(self, field):
+        with self.lock:
+            self.selector_failures[field] += 1
+
+    def snapshot(self):
+        with self.lock:
+            samples = {phase: list(values) for phase, values in self.samples.items()}
+            return samples, dict(self.counters), dict(self.selector_failures)
+
+    @contextmanager
+    def timer(self, phase):
+        """ Bloğun süresini aşama histogramına ekler, hata olursa aşamanın hata sayacını artırır """
+        start = monotonic()
+        try:
+            yield
+        except Exception:
+            self.count(f"{phase}_errors")
+            raise
+        finally:
+            self.observe(phase, monotonic() - start)
+
+    def timed(self, phase):
+        """ Fonksiyonun tamamını ölçen dekoratör """
+        def decorator(func):
+            @wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(phase):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def quantile(values, q):
+        ordered = sorted(values)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def listings_per_minute(self):
+        elapsed = monotonic() - self.started
+        return self.counters.get("listings", 0) / elapsed * 60 if elapsed > 0 else 0.0
+
+    def summary(self):
+        """ Aşama başına p50/p95/p99, sayaçlar ve dakikadaki ilan sayısı """
+        samples, counters, selector_failures = self.snapshot()
+        phases = {}
+        for phase, values in samples.items():
+            if not values:
+                continue
+            phases[phase] = {
+                "count": len(values),
+                "sum": round(sum(values), 4),
+                "max": round(max(values), 4),
+                **{f"p{int(q * 100)}": round(self.quantile(values, q), 4) for q in QUANTILES}
+            }
+        return {
+            "labels": self.labels,
+            "started_at": self.started_at.isoformat(),
+            "elapsed_seconds": round(monotonic() - self.started, 2),
+            "listings_per_minute": round(self.listings_per_minute(), 2),
+            "phases": phases,
+            "counters": counters,
+            "selector_failures": selector_failures
+        }
+
+    def _label_text(self, **extra):
+        labels = {**self.labels, **extra}
+        if not labels:
+            return ""
+        return "{" + ",".join(f'{key}="{value}"' for key, value in labels.items()) + "}"
+
+    def prometheus_text(self):
+        samples, counters, selector_failures = self.snapshot()
+        lines = [
+            "# HELP scraper_phase_seconds Kazıyıcı aşama süreleri",
+            "# TYPE scraper_phase_seconds summary"
+        ]
+        for phase, values in samples.items():
+            if not values:
+                continue
+            for q in QUANTILES:
+                lines.append(f"scraper_phase_seconds{self._label_text(phase=phase, quantile=q)} {self.quantile(values, q):.6f}")
+            lines.append(f"scraper_phase_seconds_sum{self._label_text(phase=phase)} {sum(values):.6f}")
+            lines.append(f"scraper_phase_seconds_count{self._label_text(phase=phase)} {len(values)}")
+
+        lines += ["# HELP scraper_events_total Kazıyıcı olay sayaçları", "# TYPE scraper_events_total counter"]
+        for name, value in counters.items():
+            lines.append(f"scraper_events_total{self._label_text(event=name)} {value}")
+
+        lines += ["# HELP scraper_selector_failures_total Bulunamayan alan sayısı (seçici bazında)",
+                  "# TYPE scraper_selector_failures_total counter"]
+        for field, value in selector_failures.items():
+            lines.append(f"scraper_selector_failures_total{self._label_text(field=field)} {value}")
+
+        lines += ["# HELP scraper_listings_per_minute Dakikada kaydedilen ilan",
+                  "# TYPE scraper_listings_per_minute gauge",
+                  f"scraper_listings_per_minute{self._label_text()} {self.listings_per_minute():.3f}"]
+        return "\n".join(lines) + "\n"
+
+    def export(self, name="scraper", directory=METRICS_DIR):
+        """ <name>.prom ve <name>_summary.json dosyalarını atomik olarak yazar """
+        os.makedirs(directory, exist_ok=True)
+        outputs = {
+            os.path.join(directory, f"{name}.prom"): self.prometheus_text(),
+            os.path.join(directory, f"{name}_summary.json"): json.dumps(self.summary(), ensure_ascii=False, indent=2)
+        }
+        for path, content in outputs.items():
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(content)
+            os.replace(tmp_path, path)
+
+# Süreç genelinde paylaşılan metrikler
+METRICS = ScrapeMetrics()
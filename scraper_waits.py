@@ -0,0 +1,96 @@
+from collections import defaultdict, deque
+from time import monotonic
+import logging
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import StaleElementReferenceException
+
+# Tıklanan ilanın detay panelinde açıldığını tek bir JS çağrısıyla kontrol eder,
+# hazırsa panel metnini döndürür. URL hemen değiştiği için tek başına yeterli değildir:
+# panel metni öncekinden farklı olmalı ya da paneldeki başlık bağlantısı bu ilanı göstermelidir.
+DETAILS_READY_SCRIPT = """
+const jobId = arguments[0];
+const previous = arguments[1];
+if (jobId && !window.location.href.includes('currentJobId=' + jobId)) return null;
+const pane = document.querySelector('.jobs-description__container');
+if (!pane) return null;
+const text = pane.innerText.trim();
+if (text.length === 0) return null;
+const shown = jobId && document.querySelector(
+    '.jobs-search__job-details--wrapper a[href*="/jobs/view/' + jobId + '/"], ' +
+    '.scaffold-layout__detail a[href*="/jobs/view/' + jobId + '/"]'
+);
+return text !== previous || shown ? text : null;
+"""
+
+class AdaptiveWait:
+    """ Sabit sleep() yerine koşul bekleyen ve zaman aşımını gözlenen gecikmelerden öğrenen katman """
+
+    def __init__(self, default_timeout=10, min_timeout=2, max_timeout=30,
+                 poll_frequency=0.1, window=50, factor=3):
+        self.default_timeout = default_timeout
+        self.min_timeout = min_timeout
+        self.max_timeout = max_timeout
+        self.poll_frequency = poll_frequency
+        self.factor = factor
+        self.samples = defaultdict(lambda: deque(maxlen=window))
+
+    def timeout(self, name):
+        """ Koşul için p95 gecikmenin katı kadar zaman aşımı döndürür """
+        samples = self.samples[name]
+        if len(samples) < 5:
+            return self.default_timeout
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+        return min(max(p95 * self.factor, self.min_timeout), self.max_timeout)
+
+    def until(self, driver, name, condition, timeout=None):
+        """ Koşul sağlanana kadar bekler ve geçen süreyi kaydeder """
+        start = monotonic()
+        wait = WebDriverWait(
+            driver,
+            timeout or self.timeout(name),
+            poll_frequency=self.poll_frequency,
+            ignored_exceptions=(StaleElementReferenceException,)
+        )
+        result = wait.until(condition)
+        elapsed = monotonic() - start
+        self.samples[name].append(elapsed)
+        logging.debug(f"Bekleme '{name}': {elapsed:.2f}s")
+        return result
+
+class list_settled:
+    """ Liste öğelerinin sayısı art arda yoklamalarda değişmeyince öğeleri döndürür """
+
+    def __init__(self, locator, stable_polls=2):
+        self.locator = locator
+        self.stable_polls = stable_polls
+        self.last_count = -1
+        self.stable = 0
+
+    def __call__(self, driver):
+        items = driver.find_elements(*self.locator)
+        if items and len(items) == self.last_count:
+            self.stable += 1
+            if self.stable >= self.stable_polls:
+                return items
+        else:
+            self.stable = 0
+        self.last_count = len(items)
+        return False
+
+class job_details_loaded:
+    """ Detay paneli tıklanan ilana geçtiğinde panel metnini döndürür
+
+    Metnin bir önceki beklemenin döndürdüğünden farklı olması beklenir; ilan id'si varsa
+    paneldeki başlık bağlantısının bu ilanı göstermesi de yeterlidir (aynı metinli tekrar ilanlar).
+    """
+
+    def __init__(self, linkedin_id=None, previous_text=""):
+        self.linkedin_id = linkedin_id
+        self.previous_text = previous_text
+
+    def __call__(self, driver):
+        return driver.execute_script(DETAILS_READY_SCRIPT, self.linkedin_id, self.previous_text) or False
+
+# Tüm tarayıcı akışının paylaştığı bekleme katmanı
+WAITS = AdaptiveWait()